@@ -8,3 +8,5 @@ create table if not exists roles (
   created_at timestamptz not null default now(),
   updated_at timestamptz not null default now()
 );
+
+create index if not exists roles_updated_at_idx on roles(updated_at);
@@ -11,3 +11,4 @@ create table if not exists users (
 );
 
 create index if not exists users_role_id_idx on users(role_id);
+create index if not exists users_updated_at_idx on users(updated_at);
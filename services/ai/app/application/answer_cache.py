@@ -0,0 +1,164 @@
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+import threading
+import time
+from typing import Generic, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class AnswerCacheStats:
+    hits: int
+    semantic_hits: int
+    misses: int
+    entries: int
+
+
+@dataclass(frozen=True)
+class _Entry(Generic[T]):
+    top_k: int
+    scope: Hashable
+    generation: int
+    vector: np.ndarray
+    value: T
+    expires_at: float
+
+
+class KnowledgeGeneration:
+    def __init__(self) -> None:
+        self._value = 0
+        self._lock = threading.Lock()
+
+    @property
+    def current(self) -> int:
+        with self._lock:
+            return self._value
+
+    def bump(self) -> int:
+        with self._lock:
+            self._value += 1
+            return self._value
+
+
+class AnswerCache(Generic[T]):
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float = 300.0,
+        similarity_threshold: float = 0.95,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.clock = clock
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, int, Hashable], _Entry[T]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        question: str,
+        top_k: int,
+        generation: int,
+        scope: Hashable = None,
+    ) -> T | None:
+        key = (normalize_question(question), top_k, scope)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not self._is_live(entry, generation):
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def get_similar(
+        self,
+        embedding: list[float],
+        top_k: int,
+        generation: int,
+        scope: Hashable = None,
+    ) -> T | None:
+        vector = _unit(embedding)
+        with self._lock:
+            self._purge(generation)
+            candidates = [
+                (key, entry)
+                for key, entry in self._entries.items()
+                if entry.top_k == top_k
+                and entry.scope == scope
+                and entry.vector.shape == vector.shape
+            ]
+            if candidates:
+                scores = np.stack([entry.vector for _, entry in candidates]) @ vector
+                best = int(np.argmax(scores))
+                if scores[best] >= self.similarity_threshold:
+                    key, entry = candidates[best]
+                    self._entries.move_to_end(key)
+                    self.semantic_hits += 1
+                    return entry.value
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        question: str,
+        embedding: list[float],
+        top_k: int,
+        generation: int,
+        value: T,
+        scope: Hashable = None,
+    ) -> None:
+        key = (normalize_question(question), top_k, scope)
+        entry = _Entry(
+            top_k=top_k,
+            scope=scope,
+            generation=generation,
+            vector=_unit(embedding),
+            value=value,
+            expires_at=self.clock() + self.ttl_seconds,
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> AnswerCacheStats:
+        with self._lock:
+            return AnswerCacheStats(
+                hits=self.hits,
+                semantic_hits=self.semantic_hits,
+                misses=self.misses,
+                entries=len(self._entries),
+            )
+
+    def _is_live(self, entry: _Entry[T], generation: int) -> bool:
+        return entry.generation == generation and entry.expires_at > self.clock()
+
+    def _purge(self, generation: int) -> None:
+        stale = [
+            key
+            for key, entry in self._entries.items()
+            if not self._is_live(entry, generation)
+        ]
+        for key in stale:
+            del self._entries[key]
+
+
+def normalize_question(question: str) -> str:
+    return " ".join(question.casefold().split())
+
+
+def _unit(embedding: list[float]) -> np.ndarray:
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
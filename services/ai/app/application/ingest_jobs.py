@@ -0,0 +1,190 @@
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from enum import Enum
+import logging
+import threading
+import uuid
+
+from .use_cases.ingest_embeddings import IngestProgress, IngestResult
+from ..domain.source import SourceType
+
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+@dataclass(frozen=True)
+class IngestJobRequest:
+    sources: list[SourceType]
+    access_token: str | None
+    max_items: int | None = None
+    full: bool = False
+    reconcile: bool = False
+    actor_id: str | None = None
+    actor_role: str | None = None
+    token_expires_at: datetime | None = None
+
+
+@dataclass(frozen=True)
+class SourceProgress:
+    fetched: int = 0
+    embedded: int = 0
+    upserted: int = 0
+    started_at: datetime | None = None
+    updated_at: datetime | None = None
+
+
+@dataclass(frozen=True)
+class IngestJob:
+    job_id: str
+    sources: list[SourceType]
+    status: JobStatus
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    progress: dict[str, SourceProgress] = field(default_factory=dict)
+    result: IngestResult | None = None
+    error: str | None = None
+
+
+IngestJobRunner = Callable[[IngestJobRequest, IngestProgress], IngestResult]
+_JobKey = frozenset[SourceType]
+
+
+class IngestJobManager:
+    def __init__(
+        self,
+        runner: IngestJobRunner,
+        max_concurrent_jobs: int = 1,
+        max_retained_jobs: int = 100,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ) -> None:
+        self.runner = runner
+        self.max_retained_jobs = max(1, max_retained_jobs)
+        self.clock = clock
+        self.executor = ThreadPoolExecutor(
+            max_workers=max(1, max_concurrent_jobs), thread_name_prefix="ingest-job"
+        )
+        self.logger = logging.getLogger(__name__)
+        self._jobs: OrderedDict[str, IngestJob] = OrderedDict()
+        self._pending: dict[_JobKey, tuple[str, IngestJobRequest]] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, request: IngestJobRequest) -> IngestJob:
+        key = frozenset(request.sources)
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending:
+                pending_id, queued = pending
+                self._pending[key] = (pending_id, _merge(queued, request))
+                return self._jobs[pending_id]
+            job = IngestJob(
+                job_id=uuid.uuid4().hex,
+                sources=list(dict.fromkeys(request.sources)),
+                status=JobStatus.queued,
+                created_at=self.clock(),
+            )
+            self._jobs[job.job_id] = job
+            self._pending[key] = (job.job_id, request)
+            self._evict()
+        self.executor.submit(self._run, job.job_id, key)
+        return job
+
+    def get(self, job_id: str) -> IngestJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self, cancel_pending: bool = False) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=cancel_pending)
+
+    def _run(self, job_id: str, key: _JobKey) -> None:
+        started_at = self.clock()
+        with self._lock:
+            _, request = self._pending.pop(key)
+            self._update(job_id, status=JobStatus.running, started_at=started_at)
+
+        def progress(source: SourceType, stage: str, count: int) -> None:
+            now = self.clock()
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if not job:
+                    return
+                current = job.progress.get(source.value) or SourceProgress(
+                    started_at=now
+                )
+                updated = SourceProgress(
+                    fetched=current.fetched + (count if stage == "fetched" else 0),
+                    embedded=current.embedded + (count if stage == "embedded" else 0),
+                    upserted=current.upserted + (count if stage == "upserted" else 0),
+                    started_at=current.started_at,
+                    updated_at=now,
+                )
+                self._update(job_id, progress={**job.progress, source.value: updated})
+
+        try:
+            expires_at = request.token_expires_at
+            if expires_at and expires_at <= started_at:
+                raise RuntimeError("Access token expired before the ingest job started")
+            result = self.runner(request, progress)
+        except Exception as exc:
+            self.logger.warning("Ingest job %s failed", job_id, exc_info=exc)
+            with self._lock:
+                self._update(
+                    job_id,
+                    status=JobStatus.failed,
+                    finished_at=self.clock(),
+                    error=str(exc),
+                )
+            return
+
+        with self._lock:
+            self._update(
+                job_id,
+                status=JobStatus.succeeded,
+                finished_at=self.clock(),
+                result=result,
+            )
+
+    def _update(self, job_id: str, **changes) -> None:
+        job = self._jobs.get(job_id)
+        if job:
+            self._jobs[job_id] = replace(job, **changes)
+
+    def _evict(self) -> None:
+        finished = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.status in (JobStatus.succeeded, JobStatus.failed)
+        ]
+        while len(self._jobs) > self.max_retained_jobs and finished:
+            del self._jobs[finished.pop(0)]
+
+
+def _merge(queued: IngestJobRequest, request: IngestJobRequest) -> IngestJobRequest:
+    owner = request if _expires_later(request, queued) else queued
+    return replace(
+        owner,
+        sources=queued.sources,
+        max_items=(
+            None
+            if queued.max_items is None or request.max_items is None
+            else max(queued.max_items, request.max_items)
+        ),
+        full=queued.full or request.full,
+        reconcile=queued.reconcile or request.reconcile,
+    )
+
+
+def _expires_later(candidate: IngestJobRequest, current: IngestJobRequest) -> bool:
+    if current.token_expires_at is None:
+        return False
+    return (
+        candidate.token_expires_at is None
+        or candidate.token_expires_at > current.token_expires_at
+    )
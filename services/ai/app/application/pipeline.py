@@ -0,0 +1,230 @@
+from collections.abc import Callable, Iterable, Sized
+from dataclasses import dataclass
+import queue
+import threading
+import time
+from typing import Any
+
+_POLL_SECONDS = 0.05
+_DONE = object()
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    handler: Callable[[Any], Any]
+    concurrency: int = 1
+
+
+@dataclass(frozen=True)
+class StageMetrics:
+    name: str
+    chunks: int
+    items: int
+    busy_seconds: float
+    max_queue_depth: int
+
+    @property
+    def items_per_second(self) -> float:
+        if not self.busy_seconds:
+            return 0.0
+        return self.items / self.busy_seconds
+
+
+class _StageCounter:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.chunks = 0
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+        self._lock = threading.Lock()
+
+    def record(self, payload: Any, seconds: float) -> None:
+        with self._lock:
+            self.chunks += 1
+            self.items += len(payload) if isinstance(payload, Sized) else 1
+            self.busy_seconds += seconds
+
+    def observe_depth(self, depth: int) -> None:
+        with self._lock:
+            self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def snapshot(self) -> StageMetrics:
+        with self._lock:
+            return StageMetrics(
+                name=self.name,
+                chunks=self.chunks,
+                items=self.items,
+                busy_seconds=self.busy_seconds,
+                max_queue_depth=self.max_queue_depth,
+            )
+
+
+class Pipeline:
+    def __init__(self, stages: list[Stage], queue_size: int) -> None:
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+
+    def run(
+        self, source: Iterable[Any], sink: Callable[[Any], None]
+    ) -> list[StageMetrics]:
+        stop = threading.Event()
+        errors: list[BaseException] = []
+        errors_lock = threading.Lock()
+        inboxes = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        output: queue.Queue = queue.Queue()
+        fetch_counter = _StageCounter("fetch")
+        counters = [_StageCounter(stage.name) for stage in self.stages]
+        commit_counter = _StageCounter("commit")
+        concurrency = [max(1, stage.concurrency) for stage in self.stages]
+        remaining = list(concurrency)
+        remaining_lock = threading.Lock()
+        in_flight = threading.Semaphore(
+            self.queue_size * (len(self.stages) + 1) + sum(concurrency)
+        )
+
+        def fail(exc: BaseException) -> None:
+            with errors_lock:
+                errors.append(exc)
+            stop.set()
+
+        def put(target: queue.Queue, item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(source_queue: queue.Queue) -> Any:
+            while not stop.is_set():
+                try:
+                    return source_queue.get(timeout=_POLL_SECONDS)
+                except queue.Empty:
+                    continue
+            return _DONE
+
+        def finish(index: int) -> None:
+            if index < len(self.stages):
+                for _ in range(concurrency[index]):
+                    put(inboxes[index], _DONE)
+            else:
+                output.put(_DONE)
+
+        def forward(index: int, item: Any) -> bool:
+            if index < len(self.stages):
+                sent = put(inboxes[index], item)
+                counters[index].observe_depth(inboxes[index].qsize())
+                return sent
+            output.put(item)
+            commit_counter.observe_depth(output.qsize())
+            return True
+
+        def fetch() -> None:
+            iterator = iter(source)
+            sequence = 0
+            try:
+                while not stop.is_set():
+                    while not in_flight.acquire(timeout=_POLL_SECONDS):
+                        if stop.is_set():
+                            return
+                    started = time.perf_counter()
+                    try:
+                        payload = next(iterator)
+                    except StopIteration:
+                        in_flight.release()
+                        break
+                    fetch_counter.record(payload, time.perf_counter() - started)
+                    if not forward(0, (sequence, payload)):
+                        return
+                    sequence += 1
+            except BaseException as exc:
+                fail(exc)
+                return
+            finally:
+                close = getattr(iterator, "close", None)
+                if close:
+                    close()
+            finish(0)
+
+        def work(index: int) -> None:
+            stage = self.stages[index]
+            while True:
+                item = get(inboxes[index])
+                if item is _DONE:
+                    break
+                sequence, payload = item
+                started = time.perf_counter()
+                try:
+                    result = stage.handler(payload)
+                except BaseException as exc:
+                    fail(exc)
+                    return
+                counters[index].record(payload, time.perf_counter() - started)
+                if not forward(index + 1, (sequence, result)):
+                    return
+            with remaining_lock:
+                remaining[index] -= 1
+                last = remaining[index] == 0
+            if last:
+                finish(index + 1)
+
+        threads = [threading.Thread(target=fetch, name="pipeline-fetch", daemon=True)]
+        for index, stage in enumerate(self.stages):
+            for worker in range(concurrency[index]):
+                threads.append(
+                    threading.Thread(
+                        target=work,
+                        args=(index,),
+                        name=f"pipeline-{stage.name}-{worker}",
+                        daemon=True,
+                    )
+                )
+        for thread in threads:
+            thread.start()
+
+        pending: dict[int, Any] = {}
+        next_sequence = 0
+
+        def commit_ready() -> bool:
+            nonlocal next_sequence
+            while next_sequence in pending:
+                payload = pending.pop(next_sequence)
+                started = time.perf_counter()
+                try:
+                    sink(payload)
+                except BaseException as exc:
+                    fail(exc)
+                    return False
+                commit_counter.record(payload, time.perf_counter() - started)
+                in_flight.release()
+                next_sequence += 1
+            return True
+
+        committing = True
+        while committing and not stop.is_set():
+            item = get(output)
+            if item is _DONE:
+                break
+            sequence, payload = item
+            pending[sequence] = payload
+            committing = commit_ready()
+
+        for thread in threads:
+            thread.join()
+        if errors:
+            if committing:
+                while not output.empty():
+                    item = output.get_nowait()
+                    if item is not _DONE:
+                        pending[item[0]] = item[1]
+                commit_ready()
+            raise errors[0]
+
+        return [
+            fetch_counter.snapshot(),
+            *(counter.snapshot() for counter in counters),
+            commit_counter.snapshot(),
+        ]
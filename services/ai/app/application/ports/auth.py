@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from datetime import datetime
 from typing import Protocol
 
 
@@ -19,6 +20,7 @@ class AccessTokenClaims:
     role_abilities: RoleAbilitiesClaims | None
     scope: str | None
     client_id: str | None
+    expires_at: datetime | None = None
 
 
 class AccessTokenVerifier(Protocol):
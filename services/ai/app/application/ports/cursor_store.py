@@ -1,10 +1,18 @@
-from datetime import datetime
+from collections.abc import Iterable
 from typing import Protocol
 
-from ...domain.source import SourceType
+from ...domain.source import SourceCursor, SourceType
 
 
 class CursorStore(Protocol):
-    def get_cursor(self, source: SourceType) -> datetime | None: ...
+    def get_cursor(self, source: SourceType) -> SourceCursor | None: ...
 
-    def set_cursor(self, source: SourceType, cursor: datetime) -> None: ...
+    def get_cursors(
+        self, sources: Iterable[SourceType]
+    ) -> dict[SourceType, SourceCursor]: ...
+
+    def set_cursor(self, source: SourceType, cursor: SourceCursor) -> None: ...
+
+    def advance_cursors(
+        self, cursors: dict[SourceType, SourceCursor]
+    ) -> dict[SourceType, SourceCursor]: ...
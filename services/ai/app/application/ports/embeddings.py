@@ -1,9 +1,32 @@
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
 from typing import Protocol
 
 
+@dataclass(frozen=True)
+class ChatUsage:
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+
+
+@dataclass(frozen=True)
+class ChatChunk:
+    text: str = ""
+    usage: ChatUsage | None = None
+
+
 class EmbeddingClient(Protocol):
     def embed_texts(self, inputs: list[str]) -> list[list[float]]: ...
 
 
-class ChatClient(Protocol):
-    def generate(self, system_prompt: str, user_prompt: str) -> str: ...
+class AsyncEmbeddingClient(Protocol):
+    async def embed_texts(self, inputs: list[str]) -> list[list[float]]: ...
+
+
+class AsyncChatClient(Protocol):
+    async def generate(self, system_prompt: str, user_prompt: str) -> str: ...
+
+    def stream(
+        self, system_prompt: str, user_prompt: str
+    ) -> AsyncIterator[ChatChunk]: ...
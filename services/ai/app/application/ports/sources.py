@@ -1,7 +1,10 @@
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Protocol
 
+from ...domain.source import SourceCursor
+
 
 @dataclass(frozen=True)
 class UserRecord:
@@ -53,16 +56,31 @@ class RoleInfo:
 
 
 class UserGateway(Protocol):
-    def list_users(self, access_token: str | None) -> list[UserRecord]: ...
+    def list_users(
+        self, access_token: str | None, updated_after: datetime | None = None
+    ) -> list[UserRecord]: ...
 
 
 class RoleGateway(Protocol):
-    def list_roles(self, access_token: str | None) -> list[RoleRecord]: ...
+    def list_roles(
+        self, access_token: str | None, updated_after: datetime | None = None
+    ) -> list[RoleRecord]: ...
 
     def get_role(self, role_ref: str, access_token: str | None) -> RoleInfo | None: ...
 
 
+class UserLookup(Protocol):
+    def find_user(self, user_id: str) -> UserRecord | None: ...
+
+
+class RoleLookup(Protocol):
+    def find_role(self, role_id: str) -> RoleRecord | None: ...
+
+
 class AuditGateway(Protocol):
-    def list_logs(
-        self, access_token: str | None, occurred_after: datetime | None
-    ) -> list[AuditRecord]: ...
+    def iter_log_pages(
+        self,
+        access_token: str | None,
+        after: SourceCursor | None,
+        max_items: int | None = None,
+    ) -> Iterator[list[AuditRecord]]: ...
@@ -1,3 +1,4 @@
+from collections.abc import Iterator
 from dataclasses import dataclass
 from typing import Protocol
 
@@ -12,9 +13,37 @@ class RetrievedDocument:
     distance: float | None
 
 
+@dataclass(frozen=True)
+class DocumentFilter:
+    sources: tuple[str, ...] = ()
+    fields: tuple[tuple[str, str], ...] = ()
+
+
 class VectorStore(Protocol):
     def upsert(
         self, documents: list[EmbeddingDocument], embeddings: list[list[float]]
     ) -> None: ...
 
-    def query(self, embedding: list[float], top_k: int) -> list[RetrievedDocument]: ...
+    def query(
+        self,
+        embedding: list[float],
+        top_k: int,
+        where: DocumentFilter | None = None,
+    ) -> list[RetrievedDocument]: ...
+
+    def get_fingerprints(self, doc_ids: list[str]) -> dict[str, str]: ...
+
+    def delete(self, doc_ids: list[str]) -> None: ...
+
+    def iter_doc_ids(
+        self, source: str, fields: tuple[tuple[str, str], ...] = ()
+    ) -> Iterator[list[str]]: ...
+
+
+class AsyncVectorStore(Protocol):
+    async def query(
+        self,
+        embedding: list[float],
+        top_k: int,
+        where: DocumentFilter | None = None,
+    ) -> list[RetrievedDocument]: ...
@@ -0,0 +1,96 @@
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+import threading
+
+from .answer_cache import normalize_question
+from .ports.embeddings import AsyncEmbeddingClient
+
+_Key = tuple[str, str]
+
+
+@dataclass(frozen=True)
+class QueryEmbeddingCacheStats:
+    hits: int
+    misses: int
+    entries: int
+    bytes_used: int
+
+
+class AsyncQueryEmbeddingCache(AsyncEmbeddingClient):
+    def __init__(
+        self, inner: AsyncEmbeddingClient, model: str, max_bytes: int
+    ) -> None:
+        self.inner = inner
+        self.model = model
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes_used = 0
+        self._entries: OrderedDict[_Key, array] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def embed_texts(self, inputs: list[str]) -> list[list[float]]:
+        keys, found, missing = self._lookup(inputs)
+        fresh = await self.inner.embed_texts(list(missing.values())) if missing else []
+        return self._resolve(keys, found, missing, fresh)
+
+    def stats(self) -> QueryEmbeddingCacheStats:
+        with self._lock:
+            return QueryEmbeddingCacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                entries=len(self._entries),
+                bytes_used=self.bytes_used,
+            )
+
+    def _lookup(
+        self, inputs: list[str]
+    ) -> tuple[list[_Key], dict[_Key, array], dict[_Key, str]]:
+        keys = [(self.model, normalize_question(text)) for text in inputs]
+        unique: dict[_Key, str] = {}
+        for key, text in zip(keys, inputs):
+            unique.setdefault(key, text)
+
+        found: dict[_Key, array] = {}
+        with self._lock:
+            for key in unique:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = vector
+            self.hits += len(found)
+            self.misses += len(unique) - len(found)
+        missing = {key: text for key, text in unique.items() if key not in found}
+        return keys, found, missing
+
+    def _resolve(
+        self,
+        keys: list[_Key],
+        found: dict[_Key, array],
+        missing: dict[_Key, str],
+        fresh: list[list[float]],
+    ) -> list[list[float]]:
+        computed = {key: array("f", vector) for key, vector in zip(missing, fresh)}
+        self._store(computed)
+        found.update(computed)
+        return [found[key].tolist() for key in keys]
+
+    def _store(self, vectors: dict[_Key, array]) -> None:
+        with self._lock:
+            for key, vector in vectors.items():
+                size = _entry_bytes(key, vector)
+                if size > self.max_bytes:
+                    continue
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self.bytes_used -= _entry_bytes(key, previous)
+                self._entries[key] = vector
+                self.bytes_used += size
+            while self.bytes_used > self.max_bytes and self._entries:
+                key, vector = self._entries.popitem(last=False)
+                self.bytes_used -= _entry_bytes(key, vector)
+
+
+def _entry_bytes(key: _Key, vector: array) -> int:
+    return len(key[1].encode("utf-8")) + vector.itemsize * len(vector)
@@ -0,0 +1,78 @@
+import re
+
+from ..domain.source import SourceType
+from .ports.vector_store import DocumentFilter
+
+_WORD = re.compile(r"[a-z_]+")
+_KEYWORDS = {
+    SourceType.users: frozenset(
+        {
+            "user",
+            "users",
+            "email",
+            "emails",
+            "member",
+            "members",
+            "person",
+            "people",
+            "account",
+            "accounts",
+            "employee",
+            "employees",
+            "named",
+            "who",
+        }
+    ),
+    SourceType.roles: frozenset(
+        {
+            "role",
+            "roles",
+            "permission",
+            "permissions",
+            "ability",
+            "abilities",
+            "privilege",
+            "privileges",
+            "access",
+            "allowed",
+            "admin",
+            "admins",
+        }
+    ),
+    SourceType.audit: frozenset(
+        {
+            "audit",
+            "audits",
+            "log",
+            "logs",
+            "logged",
+            "action",
+            "actions",
+            "event",
+            "events",
+            "activity",
+            "history",
+            "happened",
+            "changed",
+            "modified",
+            "deleted",
+            "removed",
+            "created",
+            "updated",
+            "login",
+            "logins",
+            "resource",
+            "resources",
+        }
+    ),
+}
+
+
+def route_question(question: str) -> DocumentFilter | None:
+    words = set(_WORD.findall(question.casefold()))
+    matched = tuple(
+        source.value for source in SourceType if words & _KEYWORDS[source]
+    )
+    if not matched or len(matched) == len(SourceType):
+        return None
+    return DocumentFilter(sources=matched)
@@ -0,0 +1,112 @@
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass
+import logging
+import threading
+import time
+
+from .ports.sources import RoleAbilities, RoleGateway, RoleInfo
+
+
+@dataclass(frozen=True)
+class _RoleIndex:
+    by_id: dict[str, RoleInfo]
+    by_name: dict[str, RoleInfo]
+    loaded_at: float
+
+
+class RoleAbilitiesCache:
+    def __init__(
+        self,
+        roles: RoleGateway,
+        ttl_seconds: float = 60.0,
+        stale_seconds: float = 300.0,
+        miss_refetch_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+        spawn: Callable[[Callable[[], None]], None] | None = None,
+    ) -> None:
+        self.roles = roles
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.miss_refetch_seconds = miss_refetch_seconds
+        self.clock = clock
+        self.spawn = spawn or _spawn_daemon
+        self.logger = logging.getLogger(__name__)
+        self._index: _RoleIndex | None = None
+        self._loading: Future | None = None
+        self._lock = threading.Lock()
+
+    def get_role(self, role_ref: str, access_token: str | None) -> RoleInfo | None:
+        with self._lock:
+            index = self._index
+        age = self.clock() - index.loaded_at if index else None
+        if index is None or age >= self.ttl_seconds + self.stale_seconds:
+            index = self._load(access_token, background=False).result()
+        elif age >= self.ttl_seconds:
+            self._load(access_token, background=True)
+        role = _lookup(index, role_ref)
+        if role is None and self.clock() - index.loaded_at >= self.miss_refetch_seconds:
+            index = self._load(access_token, background=False).result()
+            role = _lookup(index, role_ref)
+        return role
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._index = None
+            self._loading = None
+
+    def _load(self, access_token: str | None, background: bool) -> Future:
+        with self._lock:
+            if self._loading:
+                return self._loading
+            future: Future = Future()
+            self._loading = future
+
+        def fill() -> None:
+            try:
+                index = self._fetch(access_token)
+            except Exception as exc:
+                with self._lock:
+                    if self._loading is future:
+                        self._loading = None
+                if background:
+                    self.logger.warning("Role cache refresh failed", exc_info=exc)
+                future.set_exception(exc)
+                return
+            with self._lock:
+                if self._loading is future:
+                    self._index = index
+                    self._loading = None
+            future.set_result(index)
+
+        if background:
+            self.spawn(fill)
+        else:
+            fill()
+        return future
+
+    def _fetch(self, access_token: str | None) -> _RoleIndex:
+        by_id: dict[str, RoleInfo] = {}
+        by_name: dict[str, RoleInfo] = {}
+        for role in self.roles.list_roles(access_token):
+            info = RoleInfo(
+                role_id=role.role_id,
+                name=role.name,
+                abilities=RoleAbilities(
+                    can_view=role.can_view,
+                    can_create=role.can_create,
+                    can_update=role.can_update,
+                    can_delete=role.can_delete,
+                ),
+            )
+            by_id[role.role_id] = info
+            by_name[role.name.lower()] = info
+        return _RoleIndex(by_id=by_id, by_name=by_name, loaded_at=self.clock())
+
+
+def _lookup(index: _RoleIndex, role_ref: str) -> RoleInfo | None:
+    return index.by_id.get(role_ref) or index.by_name.get(role_ref.lower())
+
+
+def _spawn_daemon(target: Callable[[], None]) -> None:
+    threading.Thread(target=target, name="role-cache-refresh", daemon=True).start()
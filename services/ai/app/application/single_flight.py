@@ -0,0 +1,51 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class SingleFlightStats:
+    leaders: int
+    followers: int
+    in_flight: int
+
+    @property
+    def coalesced_ratio(self) -> float:
+        total = self.leaders + self.followers
+        return self.followers / total if total else 0.0
+
+
+class SingleFlight(Generic[K, T]):
+    def __init__(self) -> None:
+        self.leaders = 0
+        self.followers = 0
+        self._calls: dict[K, asyncio.Future[T]] = {}
+
+    async def run(self, key: K, work: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        call = self._calls.get(key)
+        shared = call is not None
+        if call is None:
+            call = asyncio.ensure_future(work())
+            self._calls[key] = call
+            call.add_done_callback(lambda done: self._forget(key, done))
+            self.leaders += 1
+        else:
+            self.followers += 1
+        return await asyncio.shield(call), shared
+
+    def stats(self) -> SingleFlightStats:
+        return SingleFlightStats(
+            leaders=self.leaders,
+            followers=self.followers,
+            in_flight=len(self._calls),
+        )
+
+    def _forget(self, key: K, call: asyncio.Future[T]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.cancelled():
+            call.exception()
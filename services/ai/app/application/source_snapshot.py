@@ -0,0 +1,60 @@
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from datetime import datetime
+import threading
+from typing import TypeVar
+
+from .ports.sources import RoleGateway, RoleInfo, RoleRecord, UserGateway, UserRecord
+
+T = TypeVar("T")
+
+
+class SourceSnapshot(UserGateway, RoleGateway):
+    def __init__(self, users: UserGateway, roles: RoleGateway) -> None:
+        self.users = users
+        self.roles = roles
+        self._results: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def list_users(
+        self, access_token: str | None, updated_after: datetime | None = None
+    ) -> list[UserRecord]:
+        return self._memoize(
+            ("users", access_token, updated_after),
+            lambda: self.users.list_users(access_token, updated_after),
+        )
+
+    def list_roles(
+        self, access_token: str | None, updated_after: datetime | None = None
+    ) -> list[RoleRecord]:
+        roles = self._memoize(
+            ("roles", access_token),
+            lambda: self.roles.list_roles(access_token),
+        )
+        if updated_after is None:
+            return roles
+        return [role for role in roles if _changed_after(role, updated_after)]
+
+    def get_role(self, role_ref: str, access_token: str | None) -> RoleInfo | None:
+        return self.roles.get_role(role_ref, access_token)
+
+    def _memoize(self, key: Hashable, load: Callable[[], list[T]]) -> list[T]:
+        with self._lock:
+            future = self._results.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._results[key] = future
+        if owner:
+            try:
+                future.set_result(tuple(load()))
+            except Exception as exc:
+                with self._lock:
+                    self._results.pop(key, None)
+                future.set_exception(exc)
+        return list(future.result())
+
+
+def _changed_after(role: RoleRecord, updated_after: datetime) -> bool:
+    changed = role.updated_at or role.created_at
+    return changed is None or changed > updated_after
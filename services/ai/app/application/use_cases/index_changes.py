@@ -0,0 +1,141 @@
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+import logging
+
+from ..ports.embeddings import EmbeddingClient
+from ..ports.event_bus import EventBus
+from ..ports.sources import AuditRecord, RoleLookup, UserLookup
+from ..ports.vector_store import VectorStore
+from ...domain.document import EmbeddingDocument
+from ...domain.source import SourceType
+from .ingest_embeddings import diff_documents, render_audit, render_role, render_user
+
+_AI_ACTIONS = frozenset({"AiQueried", "AiIngested", "AiIndexUpdated"})
+
+
+@dataclass(frozen=True)
+class EntityChange:
+    source: SourceType
+    entity_id: str
+    deleted: bool = False
+    audit: AuditRecord | None = None
+
+    @property
+    def doc_id(self) -> str:
+        return f"{self.source.value}:{self.entity_id}"
+
+
+@dataclass(frozen=True)
+class IndexChangesResult:
+    upserted: dict[str, int] = field(default_factory=dict)
+    unchanged: dict[str, int] = field(default_factory=dict)
+    deleted: dict[str, int] = field(default_factory=dict)
+
+
+class IndexChangesUseCase:
+    def __init__(
+        self,
+        users: UserLookup,
+        roles: RoleLookup,
+        embeddings: EmbeddingClient,
+        vector_store: VectorStore,
+        event_bus: EventBus | None = None,
+    ) -> None:
+        self.users = users
+        self.roles = roles
+        self.embeddings = embeddings
+        self.vector_store = vector_store
+        self.event_bus = event_bus
+        self.logger = logging.getLogger(__name__)
+
+    def execute(self, changes: list[EntityChange]) -> IndexChangesResult:
+        latest = {change.doc_id: change for change in changes}
+        for change in list(latest.values()):
+            if change.source == SourceType.roles:
+                for user_id in self._users_with_role(change.entity_id):
+                    member = EntityChange(SourceType.users, user_id)
+                    latest.setdefault(member.doc_id, member)
+        role_names: dict[str, str | None] = {}
+        documents: list[EmbeddingDocument] = []
+        removed: list[EntityChange] = []
+        for change in latest.values():
+            if change.source == SourceType.audit and not change.audit:
+                continue
+            document = None if change.deleted else self._render(change, role_names)
+            if document:
+                documents.append(document)
+            else:
+                removed.append(change)
+
+        changed, _ = diff_documents(self.vector_store, documents)
+        if changed:
+            embeddings = self.embeddings.embed_texts([doc.content for doc in changed])
+            self.vector_store.upsert(changed, embeddings)
+        if removed:
+            self.vector_store.delete([change.doc_id for change in removed])
+
+        changed_ids = {doc.doc_id for doc in changed}
+        result = IndexChangesResult(
+            upserted=_count(doc.metadata["source"] for doc in changed),
+            unchanged=_count(
+                doc.metadata["source"]
+                for doc in documents
+                if doc.doc_id not in changed_ids
+            ),
+            deleted=_count(change.source.value for change in removed),
+        )
+        quiet = {
+            change.doc_id
+            for change in latest.values()
+            if change.audit and change.audit.action in _AI_ACTIONS
+        }
+        touched = [doc.doc_id for doc in changed] + [c.doc_id for c in removed]
+        if self.event_bus and any(doc_id not in quiet for doc_id in touched):
+            self.event_bus.publish(
+                "AiIndexUpdated",
+                {"upserted": result.upserted, "deleted": result.deleted},
+            )
+        self.logger.info(
+            "Indexed %s changes: upserted=%s unchanged=%s deleted=%s",
+            len(latest),
+            result.upserted,
+            result.unchanged,
+            result.deleted,
+        )
+        return result
+
+    def _render(
+        self, change: EntityChange, role_names: dict[str, str | None]
+    ) -> EmbeddingDocument | None:
+        if change.source == SourceType.users:
+            user = self.users.find_user(change.entity_id)
+            if not user:
+                return None
+            role_name = user.role_name
+            if not role_name and user.role_id:
+                if user.role_id not in role_names:
+                    role = self.roles.find_role(user.role_id)
+                    role_names[user.role_id] = role.name if role else None
+                role_name = role_names[user.role_id]
+            return render_user(user, role_name)
+        if change.source == SourceType.roles:
+            role = self.roles.find_role(change.entity_id)
+            role_names[change.entity_id] = role.name if role else None
+            return render_role(role) if role else None
+        return render_audit(change.audit)
+
+    def _users_with_role(self, role_id: str) -> list[str]:
+        return [
+            doc_id.split(":", 1)[1]
+            for page in self.vector_store.iter_doc_ids(
+                SourceType.users.value, (("role_id", role_id),)
+            )
+            for doc_id in page
+        ]
+
+
+def _count(sources: Iterable[object]) -> dict[str, int]:
+    counts: dict[str, int] = {}
+    for source in sources:
+        counts[str(source)] = counts.get(str(source), 0) + 1
+    return counts
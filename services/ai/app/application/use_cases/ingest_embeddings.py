@@ -1,19 +1,75 @@
-from dataclasses import dataclass
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
+import logging
+from typing import Any
 
+from ..answer_cache import KnowledgeGeneration
 from ..ports.cursor_store import CursorStore
 from ..ports.embeddings import EmbeddingClient
 from ..ports.event_bus import EventBus
-from ..ports.sources import AuditGateway, RoleGateway, UserGateway
+from ..pipeline import Pipeline, Stage, StageMetrics
+from ..ports.sources import (
+    AuditGateway,
+    AuditRecord,
+    RoleGateway,
+    RoleRecord,
+    UserGateway,
+    UserRecord,
+)
 from ..ports.vector_store import VectorStore
-from ...domain.document import EmbeddingDocument
-from ...domain.source import SourceType
+from ..source_snapshot import SourceSnapshot
+from ...domain.document import FINGERPRINT_KEY, EmbeddingDocument
+from ...domain.source import SourceCursor, SourceType
+
+IngestProgress = Callable[[SourceType, str, int], None]
+
+_MIN_TIMESTAMP = datetime.min.replace(tzinfo=timezone.utc)
 
 
 @dataclass(frozen=True)
 class IngestResult:
     ingested: dict[str, int]
     cursors: dict[str, str | None]
+    embedded: dict[str, int] = field(default_factory=dict)
+    unchanged: dict[str, int] = field(default_factory=dict)
+    skipped: dict[str, int] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+    pipeline: dict[str, list[StageMetrics]] = field(default_factory=dict)
+    deleted: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class IngestPipelineConfig:
+    chunk_size: int = 256
+    queue_size: int = 4
+    render_concurrency: int = 1
+    embed_concurrency: int = 1
+    upsert_concurrency: int = 1
+
+
+@dataclass(frozen=True)
+class UpsertStats:
+    embedded: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+
+    def __add__(self, other: "UpsertStats") -> "UpsertStats":
+        return UpsertStats(
+            embedded=self.embedded + other.embedded,
+            unchanged=self.unchanged + other.unchanged,
+            skipped=self.skipped + other.skipped,
+        )
+
+
+@dataclass(frozen=True)
+class SourceIngestResult:
+    ingested: int
+    cursor: str | None
+    stats: UpsertStats = field(default_factory=UpsertStats)
+    metrics: list[StageMetrics] = field(default_factory=list)
+    deleted: int = 0
 
 
 class IngestEmbeddingsUseCase:
@@ -26,6 +82,9 @@ class IngestEmbeddingsUseCase:
         vector_store: VectorStore,
         cursor_store: CursorStore,
         event_bus: EventBus,
+        concurrency: int = 1,
+        pipeline: IngestPipelineConfig | None = None,
+        generation: KnowledgeGeneration | None = None,
     ) -> None:
         self.users = users
         self.roles = roles
@@ -34,33 +93,78 @@ class IngestEmbeddingsUseCase:
         self.vector_store = vector_store
         self.cursor_store = cursor_store
         self.event_bus = event_bus
+        self.concurrency = max(1, concurrency)
+        self.pipeline = pipeline or IngestPipelineConfig()
+        self.generation = generation
+        self.logger = logging.getLogger(__name__)
 
     def execute(
         self,
         sources: list[SourceType],
         access_token: str | None,
         max_items: int | None = None,
+        full: bool = False,
         actor_id: str | None = None,
         actor_role: str | None = None,
+        progress: IngestProgress | None = None,
+        reconcile: bool = False,
     ) -> IngestResult:
         ingested: dict[str, int] = {}
         cursors: dict[str, str | None] = {}
+        embedded: dict[str, int] = {}
+        unchanged: dict[str, int] = {}
+        skipped: dict[str, int] = {}
+        errors: dict[str, str] = {}
+        pipeline: dict[str, list[StageMetrics]] = {}
+        deleted: dict[str, int] = {}
 
-        for source in sources:
-            if source == SourceType.users:
-                ingested[source.value], cursors[source.value] = self._ingest_users(
-                    access_token, max_items
-                )
-            elif source == SourceType.roles:
-                ingested[source.value], cursors[source.value] = self._ingest_roles(
-                    access_token, max_items
-                )
-            elif source == SourceType.audit:
-                ingested[source.value], cursors[source.value] = self._ingest_audit(
-                    access_token, max_items
-                )
+        options = _IngestOptions(
+            access_token=access_token,
+            snapshot=SourceSnapshot(self.users, self.roles),
+            cursors=self.cursor_store.get_cursors(sources),
+            max_items=max_items,
+            full=full,
+            reconcile=reconcile,
+            progress=progress,
+        )
+        outcomes = self._run_ingestors(sources, options)
+        for source, outcome in outcomes.items():
+            if isinstance(outcome, Exception):
+                errors[source.value] = str(outcome)
+                continue
+            ingested[source.value] = outcome.ingested
+            cursors[source.value] = outcome.cursor
+            embedded[source.value] = outcome.stats.embedded
+            unchanged[source.value] = outcome.stats.unchanged
+            skipped[source.value] = outcome.stats.skipped
+            pipeline[source.value] = outcome.metrics
+            if reconcile and source != SourceType.audit:
+                deleted[source.value] = outcome.deleted
+            self.logger.info(
+                "Ingested %s: %s",
+                source.value,
+                ", ".join(
+                    f"{stage.name}={stage.items}@{stage.items_per_second:.1f}/s"
+                    f" depth={stage.max_queue_depth}"
+                    for stage in outcome.metrics
+                ),
+            )
+
+        if outcomes and len(errors) == len(outcomes):
+            raise next(iter(outcomes.values()))
+        if self.generation:
+            self.generation.bump()
 
-        result = IngestResult(ingested=ingested, cursors=cursors)
+        result = IngestResult(
+            ingested=ingested,
+            cursors=cursors,
+            embedded=embedded,
+            unchanged=unchanged,
+            skipped=skipped,
+            errors=errors,
+            pipeline=pipeline,
+            deleted=deleted,
+        )
         self.event_bus.publish(
             "AiIngested",
             {
@@ -68,138 +172,452 @@ class IngestEmbeddingsUseCase:
                 "actorRole": actor_role,
                 "sources": [source.value for source in sources],
                 "maxItems": max_items,
+                "full": full,
+                "reconcile": reconcile,
                 "ingested": ingested,
+                "embedded": embedded,
+                "deleted": deleted,
+                "errors": errors,
             },
         )
         return result
 
-    def _ingest_users(
-        self, access_token: str | None, max_items: int | None
-    ) -> tuple[int, str | None]:
-        users = self.users.list_users(access_token)
-        if max_items:
-            users = users[:max_items]
+    def _run_ingestors(
+        self,
+        sources: list[SourceType],
+        options: "_IngestOptions",
+    ) -> dict[SourceType, SourceIngestResult | Exception]:
+        ingestors = {
+            SourceType.users: self._ingest_users,
+            SourceType.roles: self._ingest_roles,
+            SourceType.audit: self._ingest_audit,
+        }
+
+        def run(source: SourceType) -> SourceIngestResult | Exception:
+            try:
+                return ingestors[source](options)
+            except Exception as exc:
+                self.logger.warning("Ingestion failed for %s", source.value, exc_info=exc)
+                return exc
+
+        unique = list(dict.fromkeys(sources))
+        workers = min(self.concurrency, len(unique))
+        if workers <= 1:
+            return {source: run(source) for source in unique}
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="ingest"
+        ) as executor:
+            return dict(zip(unique, executor.map(run, unique)))
+
+    def _ingest_users(self, options: "_IngestOptions") -> SourceIngestResult:
+        updated_after = self._updated_after(SourceType.users, options)
+        listed = options.snapshot.list_users(options.access_token, updated_after)
+        ordered = sorted(
+            listed, key=lambda user: (_sort_key(_user_timestamp(user)), user.user_id)
+        )
+        users = ordered[: options.max_items] if options.max_items else ordered
+        partial = len(users) < len(listed)
 
         role_map = {
-            role.role_id: role.name for role in self.roles.list_roles(access_token)
+            role.role_id: role.name
+            for role in options.snapshot.list_roles(options.access_token)
         }
 
-        documents = []
-        for user in users:
-            role_name = user.role_name or role_map.get(user.role_id)
-            role_display = role_name or user.role_id
-            documents.append(
-                EmbeddingDocument(
-                    doc_id=f"users:{user.user_id}",
-                    content=(
-                        f"User {user.user_id}: name={user.name}, email={user.email}, "
-                        f"role_id={user.role_id}, role_name={role_display}"
-                    ),
-                    metadata={
-                        "source": "users",
-                        "user_id": user.user_id,
-                        "role_id": user.role_id,
-                        "role_name": role_name,
-                    },
-                )
-            )
+        def render(chunk: list[UserRecord]) -> list[EmbeddingDocument]:
+            return [
+                render_user(user, user.role_name or role_map.get(user.role_id))
+                for user in chunk
+            ]
 
-        cursor = self._resolve_cursor(
+        outcome = self._run_ordered(
             SourceType.users,
-            [user.updated_at or user.created_at for user in users],
-            len(users),
+            users,
+            _user_timestamp,
+            render,
+            options,
+            checkpoints=not (options.full and partial),
+            bound=_first_excluded(ordered, len(users), _user_timestamp),
         )
+        if updated_after is not None:
+            outcome = self._refresh_role_members(
+                listed, updated_after, render, options, outcome
+            )
+        deleted = 0
+        if options.reconcile:
+            live = listed if updated_after is None else None
+            if live is None:
+                live = options.snapshot.list_users(options.access_token)
+            deleted = self._reconcile(
+                SourceType.users, {f"users:{user.user_id}" for user in live}
+            )
+        return replace(outcome, deleted=deleted)
 
-        self._upsert_documents(documents)
-        return len(documents), cursor
-
-    def _ingest_roles(
-        self, access_token: str | None, max_items: int | None
-    ) -> tuple[int, str | None]:
-        roles = self.roles.list_roles(access_token)
-        if max_items:
-            roles = roles[:max_items]
-
-        documents = [
-            EmbeddingDocument(
-                doc_id=f"roles:{role.role_id}",
-                content=(
-                    f"Role {role.name} ({role.role_id}): "
-                    f"view={role.can_view}, create={role.can_create}, "
-                    f"update={role.can_update}, delete={role.can_delete}"
-                ),
-                metadata={
-                    "source": "roles",
-                    "role_id": role.role_id,
-                    "name": role.name,
-                },
+    def _refresh_role_members(
+        self,
+        listed: list[UserRecord],
+        updated_after: datetime,
+        render: Callable[[list[UserRecord]], list[EmbeddingDocument]],
+        options: "_IngestOptions",
+        outcome: SourceIngestResult,
+    ) -> SourceIngestResult:
+        changed_roles = {
+            role.role_id
+            for role in options.snapshot.list_roles(
+                options.access_token, updated_after
             )
-            for role in roles
+        }
+        if not changed_roles:
+            return outcome
+        listed_ids = {user.user_id for user in listed}
+        members = [
+            user
+            for user in options.snapshot.list_users(options.access_token)
+            if user.role_id in changed_roles and user.user_id not in listed_ids
         ]
+        if not members:
+            return outcome
+        refreshed = self._run_pipeline(
+            SourceType.users,
+            _chunked(members, self.pipeline.chunk_size),
+            render,
+            progress=options.progress,
+        )
+        return replace(
+            outcome,
+            ingested=outcome.ingested + refreshed.ingested,
+            stats=outcome.stats + refreshed.stats,
+            metrics=outcome.metrics + refreshed.metrics,
+        )
+
+    def _ingest_roles(self, options: "_IngestOptions") -> SourceIngestResult:
+        updated_after = self._updated_after(SourceType.roles, options)
+        listed = options.snapshot.list_roles(options.access_token, updated_after)
+        ordered = sorted(
+            listed, key=lambda role: (_sort_key(_role_timestamp(role)), role.role_id)
+        )
+        roles = ordered[: options.max_items] if options.max_items else ordered
+        partial = len(roles) < len(listed)
 
-        cursor = self._resolve_cursor(
+        def render(chunk: list[RoleRecord]) -> list[EmbeddingDocument]:
+            return [render_role(role) for role in chunk]
+
+        outcome = self._run_ordered(
             SourceType.roles,
-            [role.updated_at or role.created_at for role in roles],
-            len(roles),
+            roles,
+            _role_timestamp,
+            render,
+            options,
+            checkpoints=not (options.full and partial),
+            bound=_first_excluded(ordered, len(roles), _role_timestamp),
         )
+        deleted = 0
+        if options.reconcile:
+            live = listed if updated_after is None else None
+            if live is None:
+                live = options.snapshot.list_roles(options.access_token)
+            deleted = self._reconcile(
+                SourceType.roles, {f"roles:{role.role_id}" for role in live}
+            )
+        return replace(outcome, deleted=deleted)
 
-        self._upsert_documents(documents)
-        return len(documents), cursor
+    def _ingest_audit(self, options: "_IngestOptions") -> SourceIngestResult:
+        stored_cursor = options.cursors.get(SourceType.audit)
+        after = None if options.full else stored_cursor
+        cursors: list[str | None] = [_cursor_value(stored_cursor)]
 
-    def _ingest_audit(
-        self, access_token: str | None, max_items: int | None
-    ) -> tuple[int, str | None]:
-        last_cursor = self.cursor_store.get_cursor(SourceType.audit)
-        logs = self.audit.list_logs(access_token, last_cursor)
-        if max_items:
-            logs = logs[:max_items]
+        def render(chunk: list[AuditRecord]) -> list[EmbeddingDocument]:
+            return [render_audit(log) for log in chunk]
 
-        documents = [
-            EmbeddingDocument(
-                doc_id=f"audit:{log.audit_id}",
-                content=(
-                    f"Audit {log.audit_id}: action={log.action}, resource={log.resource}, "
-                    f"actor_id={log.actor_id}, role={log.actor_role}, "
-                    f"occurred_at={log.occurred_at}"
-                ),
-                metadata={
-                    "source": "audit",
-                    "audit_id": log.audit_id,
-                    "action": log.action,
-                    "resource": log.resource,
-                },
+        def checkpoint(chunk: list[AuditRecord]) -> None:
+            cursors.append(
+                self._resolve_cursor(
+                    SourceType.audit,
+                    [
+                        SourceCursor(log.occurred_at, log.audit_id)
+                        for log in chunk
+                        if log.occurred_at
+                    ],
+                    len(chunk),
+                    stored_cursor,
+                )
             )
-            for log in logs
-        ]
 
-        cursor = self._resolve_cursor(
+        outcome = self._run_pipeline(
             SourceType.audit,
-            [log.occurred_at for log in logs],
-            len(logs),
+            self.audit.iter_log_pages(options.access_token, after, options.max_items),
+            render,
+            checkpoint,
+            options.progress,
         )
+        return replace(outcome, cursor=cursors[-1])
 
-        self._upsert_documents(documents)
-        return len(documents), cursor
+    def _run_ordered(
+        self,
+        source: SourceType,
+        records: list[Any],
+        timestamp: Callable[[Any], datetime | None],
+        render: Callable[[list[Any]], list[EmbeddingDocument]],
+        options: "_IngestOptions",
+        checkpoints: bool,
+        bound: datetime | None = None,
+    ) -> SourceIngestResult:
+        stored_cursor = options.cursors.get(source)
+        cursors: list[str | None] = [_cursor_value(stored_cursor)]
+        chunks = list(_chunked(records, self.pipeline.chunk_size))
+        bounds = iter(
+            [_sort_key(timestamp(chunk[0])) for chunk in chunks[1:]] + [bound]
+        )
+
+        def checkpoint(chunk: list[Any]) -> None:
+            bound = next(bounds)
+            stamps = [timestamp(record) for record in chunk]
+            if bound is not None:
+                stamps = [ts for ts in stamps if ts and ts < bound]
+                if not stamps:
+                    return
+            positions = [SourceCursor(ts) for ts in stamps if ts]
+            cursors.append(
+                self._resolve_cursor(source, positions, len(chunk), stored_cursor)
+            )
+
+        outcome = self._run_pipeline(
+            source,
+            chunks,
+            render,
+            checkpoint if checkpoints else None,
+            options.progress,
+        )
+        return replace(outcome, cursor=cursors[-1])
+
+    def _run_pipeline(
+        self,
+        source: SourceType,
+        chunks: Iterable[list[Any]],
+        render: Callable[[list[Any]], list[EmbeddingDocument]],
+        checkpoint: Callable[[list[Any]], None] | None = None,
+        progress: IngestProgress | None = None,
+    ) -> SourceIngestResult:
+        totals = {"ingested": 0, "stats": UpsertStats()}
+
+        def report(stage: str, count: int) -> None:
+            if progress:
+                progress(source, stage, count)
+
+        def diff(records: list[Any]) -> _Batch:
+            report("fetched", len(records))
+            documents = render(records)
+            changed, stats = self._diff_documents(documents)
+            return _Batch(
+                records=records,
+                documents=changed,
+                ingested=len(documents),
+                stats=stats,
+            )
+
+        def embed(batch: _Batch) -> _Batch:
+            if batch.documents:
+                batch.embeddings = self.embeddings.embed_texts(
+                    [doc.content for doc in batch.documents]
+                )
+            report("embedded", len(batch.documents))
+            return batch
+
+        def upsert(batch: _Batch) -> _Batch:
+            if batch.documents:
+                self.vector_store.upsert(batch.documents, batch.embeddings)
+            report("upserted", len(batch.documents))
+            return batch
+
+        def commit(batch: _Batch) -> None:
+            if checkpoint:
+                checkpoint(batch.records)
+            totals["ingested"] += batch.ingested
+            totals["stats"] += batch.stats
+
+        config = self.pipeline
+        metrics = Pipeline(
+            [
+                Stage("render", diff, config.render_concurrency),
+                Stage("embed", embed, config.embed_concurrency),
+                Stage("upsert", upsert, config.upsert_concurrency),
+            ],
+            queue_size=config.queue_size,
+        ).run(chunks, commit)
+
+        return SourceIngestResult(
+            ingested=totals["ingested"],
+            cursor=None,
+            stats=totals["stats"],
+            metrics=metrics,
+        )
+
+    def _updated_after(
+        self, source: SourceType, options: "_IngestOptions"
+    ) -> datetime | None:
+        cursor = None if options.full else options.cursors.get(source)
+        return cursor.timestamp if cursor else None
+
+    def _reconcile(self, source: SourceType, live_ids: set[str]) -> int:
+        stale: list[str] = []
+        for page in self.vector_store.iter_doc_ids(source.value):
+            stale.extend(set(page) - live_ids)
+        if stale:
+            self.vector_store.delete(stale)
+            self.logger.info("Removed %s stale %s documents", len(stale), source.value)
+        return len(stale)
 
     def _resolve_cursor(
-        self, source: SourceType, timestamps: list[datetime | None], item_count: int
+        self,
+        source: SourceType,
+        positions: list[SourceCursor],
+        item_count: int,
+        current: SourceCursor | None = None,
     ) -> str | None:
-        latest = max((ts for ts in timestamps if ts), default=None)
+        latest = max(positions, default=None)
+        if not latest and item_count > 0:
+            latest = SourceCursor(datetime.now(timezone.utc))
         if latest:
-            self.cursor_store.set_cursor(source, latest)
-            return latest.isoformat()
-
-        if item_count > 0:
-            fallback = datetime.now(timezone.utc)
-            self.cursor_store.set_cursor(source, fallback)
-            return fallback.isoformat()
-
-        current = self.cursor_store.get_cursor(source)
-        return current.isoformat() if current else None
-
-    def _upsert_documents(self, documents: list[EmbeddingDocument]) -> None:
-        if not documents:
-            return
-        contents = [doc.content for doc in documents]
-        embeddings = self.embeddings.embed_texts(contents)
-        self.vector_store.upsert(documents, embeddings)
+            stored = self.cursor_store.advance_cursors({source: latest})
+            return _cursor_value(stored.get(source, latest))
+        return _cursor_value(current)
+
+    def _diff_documents(
+        self, documents: list[EmbeddingDocument]
+    ) -> tuple[list[EmbeddingDocument], UpsertStats]:
+        return diff_documents(self.vector_store, documents)
+
+
+def render_user(user: UserRecord, role_name: str | None) -> EmbeddingDocument:
+    role_display = role_name or user.role_id
+    return EmbeddingDocument(
+        doc_id=f"users:{user.user_id}",
+        content=(
+            f"User {user.user_id}: name={user.name}, email={user.email}, "
+            f"role_id={user.role_id}, role_name={role_display}"
+        ),
+        metadata={
+            "source": "users",
+            "user_id": user.user_id,
+            "role_id": user.role_id,
+            "role_name": role_name,
+        },
+    )
+
+
+def render_role(role: RoleRecord) -> EmbeddingDocument:
+    return EmbeddingDocument(
+        doc_id=f"roles:{role.role_id}",
+        content=(
+            f"Role {role.name} ({role.role_id}): "
+            f"view={role.can_view}, create={role.can_create}, "
+            f"update={role.can_update}, delete={role.can_delete}"
+        ),
+        metadata={
+            "source": "roles",
+            "role_id": role.role_id,
+            "name": role.name,
+        },
+    )
+
+
+def render_audit(log: AuditRecord) -> EmbeddingDocument:
+    return EmbeddingDocument(
+        doc_id=f"audit:{log.audit_id}",
+        content=(
+            f"Audit {log.audit_id}: action={log.action}, resource={log.resource}, "
+            f"actor_id={log.actor_id}, role={log.actor_role}, "
+            f"occurred_at={log.occurred_at}"
+        ),
+        metadata={
+            "source": "audit",
+            "audit_id": log.audit_id,
+            "action": log.action,
+            "resource": log.resource,
+            "user_id": log.actor_id,
+            "actor_role": log.actor_role,
+        },
+    )
+
+
+def diff_documents(
+    vector_store: VectorStore, documents: list[EmbeddingDocument]
+) -> tuple[list[EmbeddingDocument], UpsertStats]:
+    if not documents:
+        return [], UpsertStats()
+
+    unique: dict[str, EmbeddingDocument] = {}
+    for doc in documents:
+        unique[doc.doc_id] = doc
+    skipped = len(documents) - len(unique)
+
+    stored = vector_store.get_fingerprints(list(unique))
+    changed: list[EmbeddingDocument] = []
+    for doc in unique.values():
+        fingerprint = doc.fingerprint()
+        if stored.get(doc.doc_id) == fingerprint:
+            continue
+        changed.append(
+            EmbeddingDocument(
+                doc_id=doc.doc_id,
+                content=doc.content,
+                metadata={**doc.metadata, FINGERPRINT_KEY: fingerprint},
+            )
+        )
+
+    return changed, UpsertStats(
+        embedded=len(changed),
+        unchanged=len(unique) - len(changed),
+        skipped=skipped,
+    )
+
+
+@dataclass(frozen=True)
+class _IngestOptions:
+    access_token: str | None
+    snapshot: SourceSnapshot
+    cursors: dict[SourceType, SourceCursor] = field(default_factory=dict)
+    max_items: int | None = None
+    full: bool = False
+    reconcile: bool = False
+    progress: IngestProgress | None = None
+
+
+@dataclass
+class _Batch:
+    records: list[Any]
+    documents: list[EmbeddingDocument]
+    ingested: int
+    stats: UpsertStats
+    embeddings: list[list[float]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+def _user_timestamp(user: UserRecord) -> datetime | None:
+    return user.updated_at or user.created_at
+
+
+def _role_timestamp(role: RoleRecord) -> datetime | None:
+    return role.updated_at or role.created_at
+
+
+def _cursor_value(cursor: SourceCursor | None) -> str | None:
+    return cursor.timestamp.isoformat() if cursor else None
+
+
+def _first_excluded(
+    ordered: list[Any], kept: int, timestamp: Callable[[Any], datetime | None]
+) -> datetime | None:
+    if kept >= len(ordered):
+        return None
+    return _sort_key(timestamp(ordered[kept]))
+
+
+def _sort_key(timestamp: datetime | None) -> datetime:
+    return timestamp or _MIN_TIMESTAMP
+
+
+def _chunked(items: list[Any], size: int) -> Iterator[list[Any]]:
+    for start in range(0, len(items), max(1, size)):
+        yield items[start : start + size]
@@ -1,8 +1,26 @@
-from dataclasses import dataclass
+from collections.abc import AsyncIterator, Callable
+from contextlib import aclosing
+from dataclasses import dataclass, field
+import time
 
-from ..ports.embeddings import ChatClient, EmbeddingClient
+from ..answer_cache import (
+    AnswerCache,
+    AnswerCacheStats,
+    KnowledgeGeneration,
+    normalize_question,
+)
+from ..ports.embeddings import AsyncChatClient, AsyncEmbeddingClient, ChatUsage
 from ..ports.event_bus import EventBus
-from ..ports.vector_store import RetrievedDocument, VectorStore
+from ..ports.vector_store import AsyncVectorStore, DocumentFilter, RetrievedDocument
+from ..query_embedding_cache import QueryEmbeddingCacheStats
+from ..single_flight import SingleFlight, SingleFlightStats
+
+_SYSTEM_PROMPT = (
+    "You are a helpful operations assistant. Answer using only the provided context. "
+    "If the answer is not in the context, say you do not have enough data. "
+    "If the question is about audit logs, say whether any audit data appears in context. "
+    "Suggest running ingestion to refresh the knowledge base when data is missing."
+)
 
 
 @dataclass(frozen=True)
@@ -11,39 +29,213 @@ class QueryResult:
     sources: list[RetrievedDocument]
 
 
+@dataclass(frozen=True)
+class QueryStreamEvent:
+    event: str
+    sources: list[RetrievedDocument] = field(default_factory=list)
+    text: str = ""
+    usage: ChatUsage | None = None
+    timings: dict[str, float] = field(default_factory=dict)
+    cached: bool = False
+
+
+@dataclass(frozen=True)
+class QueryMetrics:
+    coalescing: SingleFlightStats | None
+    answer_cache: AnswerCacheStats | None
+    embedding_cache: QueryEmbeddingCacheStats | None
+
+
+_FlightKey = tuple[str, int, int, DocumentFilter | None]
+_Answer = tuple[QueryResult, bool]
+
+
+@dataclass(frozen=True)
+class _Retrieval:
+    generation: int
+    scope: DocumentFilter | None
+    embedding: list[float] | None
+    sources: list[RetrievedDocument]
+    cached: QueryResult | None = None
+
+
 class QueryAgentUseCase:
     def __init__(
         self,
-        embeddings: EmbeddingClient,
-        chat: ChatClient,
-        vector_store: VectorStore,
+        embeddings: AsyncEmbeddingClient,
+        chat: AsyncChatClient,
+        vector_store: AsyncVectorStore,
         event_bus: EventBus,
+        answers: AnswerCache[QueryResult] | None = None,
+        generation: KnowledgeGeneration | None = None,
+        inflight: SingleFlight[_FlightKey, _Answer] | None = None,
+        router: Callable[[str], DocumentFilter | None] | None = None,
+        clock=time.perf_counter,
     ) -> None:
         self.embeddings = embeddings
         self.chat = chat
         self.vector_store = vector_store
         self.event_bus = event_bus
+        self.answers = answers
+        self.generation = generation or KnowledgeGeneration()
+        self.inflight = inflight
+        self.router = router
+        self.clock = clock
 
-    def execute(
+    async def execute(
         self,
         question: str,
         top_k: int,
         actor_id: str | None = None,
         actor_role: str | None = None,
+        where: DocumentFilter | None = None,
     ) -> QueryResult:
-        embedding = self.embeddings.embed_texts([question])[0]
-        retrieved = self.vector_store.query(embedding, top_k)
-        context = "\n".join(
-            f"[{index + 1}] {doc.content}" for index, doc in enumerate(retrieved)
+        where, routed = self._scope(question, where)
+        if self.inflight:
+            key = (
+                normalize_question(question),
+                top_k,
+                self.generation.current,
+                where,
+            )
+            (result, cached), coalesced = await self.inflight.run(
+                key, lambda: self._answer(question, top_k, where, routed)
+            )
+        else:
+            answer = await self._answer(question, top_k, where, routed)
+            (result, cached), coalesced = answer, False
+        self._publish(question, top_k, result, actor_id, actor_role, cached, coalesced)
+        return result
+
+    async def stream(
+        self,
+        question: str,
+        top_k: int,
+        actor_id: str | None = None,
+        actor_role: str | None = None,
+        where: DocumentFilter | None = None,
+    ) -> AsyncIterator[QueryStreamEvent]:
+        started = self.clock()
+        where, routed = self._scope(question, where)
+        retrieval = await self._retrieve(question, top_k, where, routed)
+        retrieved_at = self.clock()
+        cached = retrieval.cached
+        yield QueryStreamEvent(
+            event="sources",
+            sources=cached.sources if cached else retrieval.sources,
+            cached=cached is not None,
+        )
+
+        first_token_at: float | None = None
+        usage: ChatUsage | None = None
+        if cached:
+            first_token_at = self.clock()
+            yield QueryStreamEvent(event="token", text=cached.answer, cached=True)
+            result = cached
+        else:
+            parts: list[str] = []
+            chunks = self.chat.stream(
+                _SYSTEM_PROMPT, _user_prompt(question, retrieval.sources)
+            )
+            async with aclosing(chunks):
+                async for chunk in chunks:
+                    if chunk.usage:
+                        usage = chunk.usage
+                    if not chunk.text:
+                        continue
+                    if first_token_at is None:
+                        first_token_at = self.clock()
+                    parts.append(chunk.text)
+                    yield QueryStreamEvent(event="token", text=chunk.text)
+            result = QueryResult(answer="".join(parts), sources=retrieval.sources)
+            self._remember(question, top_k, retrieval, result)
+
+        finished = self.clock()
+        yield QueryStreamEvent(
+            event="done",
+            usage=usage,
+            cached=cached is not None,
+            timings={
+                "retrieval_ms": (retrieved_at - started) * 1000,
+                "first_token_ms": ((first_token_at or finished) - started) * 1000,
+                "total_ms": (finished - started) * 1000,
+            },
         )
-        system_prompt = (
-            "You are a helpful operations assistant. Answer using only the provided context. "
-            "If the answer is not in the context, say you do not have enough data. "
-            "If the question is about audit logs, say whether any audit data appears in context. "
-            "Suggest running ingestion to refresh the knowledge base when data is missing."
+        self._publish(question, top_k, result, actor_id, actor_role, cached is not None)
+
+    def _scope(
+        self, question: str, where: DocumentFilter | None
+    ) -> tuple[DocumentFilter | None, bool]:
+        if where is not None or self.router is None:
+            return where, False
+        routed = self.router(question)
+        return routed, routed is not None
+
+    async def _answer(
+        self,
+        question: str,
+        top_k: int,
+        where: DocumentFilter | None,
+        routed: bool,
+    ) -> _Answer:
+        retrieval = await self._retrieve(question, top_k, where, routed)
+        if retrieval.cached:
+            return retrieval.cached, True
+        answer = await self.chat.generate(
+            _SYSTEM_PROMPT, _user_prompt(question, retrieval.sources)
         )
-        user_prompt = f"Question: {question}\n\nContext:\n{context}"
-        answer = self.chat.generate(system_prompt, user_prompt)
+        result = QueryResult(answer=answer, sources=retrieval.sources)
+        self._remember(question, top_k, retrieval, result)
+        return result, False
+
+    async def _retrieve(
+        self,
+        question: str,
+        top_k: int,
+        where: DocumentFilter | None,
+        routed: bool,
+    ) -> _Retrieval:
+        generation = self.generation.current
+        cached = (
+            self.answers.get(question, top_k, generation, where)
+            if self.answers
+            else None
+        )
+        if cached:
+            return _Retrieval(generation, where, None, [], cached)
+        embedding = (await self.embeddings.embed_texts([question]))[0]
+        if self.answers:
+            cached = self.answers.get_similar(embedding, top_k, generation, where)
+            if cached:
+                return _Retrieval(generation, where, embedding, [], cached)
+        sources = await self.vector_store.query(embedding, top_k, where)
+        if routed and not sources:
+            sources = await self.vector_store.query(embedding, top_k)
+        return _Retrieval(generation, where, embedding, sources)
+
+    def _remember(
+        self, question: str, top_k: int, retrieval: _Retrieval, result: QueryResult
+    ) -> None:
+        if self.answers and retrieval.embedding is not None:
+            self.answers.put(
+                question,
+                retrieval.embedding,
+                top_k,
+                retrieval.generation,
+                result,
+                retrieval.scope,
+            )
+
+    def _publish(
+        self,
+        question: str,
+        top_k: int,
+        result: QueryResult,
+        actor_id: str | None,
+        actor_role: str | None,
+        cached: bool,
+        coalesced: bool = False,
+    ) -> None:
         self.event_bus.publish(
             "AiQueried",
             {
@@ -51,7 +243,15 @@ class QueryAgentUseCase:
                 "actorRole": actor_role,
                 "question": question,
                 "topK": top_k,
-                "sourceCount": len(retrieved),
+                "sourceCount": len(result.sources),
+                "cached": cached,
+                "coalesced": coalesced,
             },
         )
-        return QueryResult(answer=answer, sources=retrieved)
+
+
+def _user_prompt(question: str, sources: list[RetrievedDocument]) -> str:
+    context = "\n".join(
+        f"[{index + 1}] {doc.content}" for index, doc in enumerate(sources)
+    )
+    return f"Question: {question}\n\nContext:\n{context}"
@@ -19,6 +19,54 @@ class Settings:
     rabbitmq_exchange: str
     request_timeout_seconds: float
     max_batch_size: int
+    embedding_cache_path: str | None = None
+    embedding_cache_max_entries: int = 100_000
+    ingest_concurrency: int = 3
+    embedding_max_concurrency: int = 8
+    embedding_requests_per_minute: int = 3000
+    embedding_tokens_per_minute: int = 1_000_000
+    embedding_max_retries: int = 5
+    embedding_max_request_tokens: int = 300_000
+    embedding_max_input_tokens: int | None = None
+    audit_page_size: int = 500
+    ingest_chunk_size: int = 256
+    ingest_queue_size: int = 4
+    ingest_render_concurrency: int = 1
+    ingest_embed_concurrency: int = 2
+    ingest_upsert_concurrency: int = 1
+    ingest_max_concurrent_jobs: int = 1
+    ingest_job_retention: int = 100
+    internal_service_token: str | None = None
+    user_internal_url: str = "http://user:3002/internal/users"
+    role_internal_url: str = "http://role:3003/internal/roles"
+    index_queue: str = "ai.index"
+    index_batch_size: int = 100
+    index_batch_window_seconds: float = 2.0
+    index_max_attempts: int = 10
+    source_response_cache_entries: int = 32
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 30.0
+    http2_enabled: bool = True
+    event_queue_size: int = 1000
+    event_max_publish_attempts: int = 5
+    event_queue_full_policy: str = "drop"
+    event_publish_block_seconds: float = 1.0
+    auth_token_cache_size: int = 1024
+    auth_jwks_refresh_seconds: float = 300.0
+    auth_jwks_min_refetch_seconds: float = 30.0
+    role_cache_ttl_seconds: float = 60.0
+    role_cache_stale_seconds: float = 300.0
+    role_cache_events_enabled: bool = True
+    role_cache_miss_refetch_seconds: float = 5.0
+    cursor_store_backend: str = "chroma"
+    cursor_store_path: str = "/tmp/toka-ai/cursors.sqlite3"
+    answer_cache_entries: int = 256
+    answer_cache_ttl_seconds: float = 300.0
+    answer_cache_similarity: float = 0.95
+    query_embedding_cache_bytes: int = 16 * 1024 * 1024
+    query_coalescing_enabled: bool = True
+    query_router_enabled: bool = True
 
     @staticmethod
     def from_env() -> "Settings":
@@ -46,4 +94,103 @@ class Settings:
             rabbitmq_exchange=os.getenv("RABBITMQ_EXCHANGE", "toka.events"),
             request_timeout_seconds=float(os.getenv("REQUEST_TIMEOUT_SECONDS", "10")),
             max_batch_size=int(os.getenv("EMBEDDING_BATCH_SIZE", "128")),
+            embedding_cache_path=os.getenv(
+                "EMBEDDING_CACHE_PATH", "/tmp/toka-ai/embeddings.sqlite3"
+            )
+            or None,
+            embedding_cache_max_entries=int(
+                os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "100000")
+            ),
+            ingest_concurrency=int(os.getenv("INGEST_CONCURRENCY", "3")),
+            embedding_max_concurrency=int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "8")),
+            embedding_requests_per_minute=int(os.getenv("EMBEDDING_RPM", "3000")),
+            embedding_tokens_per_minute=int(os.getenv("EMBEDDING_TPM", "1000000")),
+            embedding_max_retries=int(os.getenv("EMBEDDING_MAX_RETRIES", "5")),
+            embedding_max_request_tokens=int(
+                os.getenv("EMBEDDING_MAX_REQUEST_TOKENS", "300000")
+            ),
+            embedding_max_input_tokens=int(os.environ["EMBEDDING_MAX_INPUT_TOKENS"])
+            if os.getenv("EMBEDDING_MAX_INPUT_TOKENS")
+            else None,
+            audit_page_size=int(os.getenv("AUDIT_PAGE_SIZE", "500")),
+            ingest_chunk_size=int(os.getenv("INGEST_CHUNK_SIZE", "256")),
+            ingest_queue_size=int(os.getenv("INGEST_QUEUE_SIZE", "4")),
+            ingest_render_concurrency=int(os.getenv("INGEST_RENDER_CONCURRENCY", "1")),
+            ingest_embed_concurrency=int(os.getenv("INGEST_EMBED_CONCURRENCY", "2")),
+            ingest_upsert_concurrency=int(os.getenv("INGEST_UPSERT_CONCURRENCY", "1")),
+            ingest_max_concurrent_jobs=int(
+                os.getenv("INGEST_MAX_CONCURRENT_JOBS", "1")
+            ),
+            ingest_job_retention=int(os.getenv("INGEST_JOB_RETENTION", "100")),
+            internal_service_token=os.getenv("INTERNAL_SERVICE_TOKEN"),
+            user_internal_url=os.getenv(
+                "USER_SERVICE_INTERNAL_URL", "http://user:3002/internal/users"
+            ),
+            role_internal_url=os.getenv(
+                "ROLE_SERVICE_INTERNAL_URL", "http://role:3003/internal/roles"
+            ),
+            index_queue=os.getenv("RABBITMQ_INDEX_QUEUE", "ai.index"),
+            index_batch_size=int(os.getenv("INDEX_BATCH_SIZE", "100")),
+            index_batch_window_seconds=float(
+                os.getenv("INDEX_BATCH_WINDOW_SECONDS", "2")
+            ),
+            index_max_attempts=int(os.getenv("INDEX_MAX_ATTEMPTS", "10")),
+            source_response_cache_entries=int(
+                os.getenv("SOURCE_RESPONSE_CACHE_ENTRIES", "32")
+            ),
+            http_max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+            http_max_keepalive_connections=int(
+                os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")
+            ),
+            http_keepalive_expiry_seconds=float(
+                os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30")
+            ),
+            http2_enabled=os.getenv("HTTP2_ENABLED", "true").lower()
+            in ("1", "true", "yes"),
+            event_queue_size=int(os.getenv("EVENT_QUEUE_SIZE", "1000")),
+            event_max_publish_attempts=int(
+                os.getenv("EVENT_MAX_PUBLISH_ATTEMPTS", "5")
+            ),
+            event_queue_full_policy=os.getenv("EVENT_QUEUE_FULL_POLICY", "drop"),
+            event_publish_block_seconds=float(
+                os.getenv("EVENT_PUBLISH_BLOCK_SECONDS", "1")
+            ),
+            auth_token_cache_size=int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "1024")),
+            auth_jwks_refresh_seconds=float(
+                os.getenv("AUTH_JWKS_REFRESH_SECONDS", "300")
+            ),
+            auth_jwks_min_refetch_seconds=float(
+                os.getenv("AUTH_JWKS_MIN_REFETCH_SECONDS", "30")
+            ),
+            role_cache_ttl_seconds=float(os.getenv("ROLE_CACHE_TTL_SECONDS", "60")),
+            role_cache_stale_seconds=float(
+                os.getenv("ROLE_CACHE_STALE_SECONDS", "300")
+            ),
+            role_cache_events_enabled=os.getenv(
+                "ROLE_CACHE_EVENTS_ENABLED", "true"
+            ).lower()
+            in ("1", "true", "yes"),
+            role_cache_miss_refetch_seconds=float(
+                os.getenv("ROLE_CACHE_MISS_REFETCH_SECONDS", "5")
+            ),
+            cursor_store_backend=os.getenv("CURSOR_STORE_BACKEND", "chroma").lower(),
+            cursor_store_path=os.getenv(
+                "CURSOR_STORE_PATH", "/tmp/toka-ai/cursors.sqlite3"
+            ),
+            answer_cache_entries=int(os.getenv("ANSWER_CACHE_ENTRIES", "256")),
+            answer_cache_ttl_seconds=float(
+                os.getenv("ANSWER_CACHE_TTL_SECONDS", "300")
+            ),
+            answer_cache_similarity=float(
+                os.getenv("ANSWER_CACHE_SIMILARITY", "0.95")
+            ),
+            query_embedding_cache_bytes=int(
+                os.getenv("QUERY_EMBEDDING_CACHE_BYTES", str(16 * 1024 * 1024))
+            ),
+            query_coalescing_enabled=os.getenv(
+                "QUERY_COALESCING_ENABLED", "true"
+            ).lower()
+            in ("1", "true", "yes"),
+            query_router_enabled=os.getenv("QUERY_ROUTER_ENABLED", "true").lower()
+            in ("1", "true", "yes"),
         )
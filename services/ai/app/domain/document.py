@@ -1,4 +1,8 @@
 from dataclasses import dataclass
+import hashlib
+import json
+
+FINGERPRINT_KEY = "content_hash"
 
 
 @dataclass(frozen=True)
@@ -6,3 +10,11 @@ class EmbeddingDocument:
     doc_id: str
     content: str
     metadata: dict[str, str | int | float | bool | None]
+
+    def fingerprint(self) -> str:
+        payload = json.dumps(
+            {"content": self.content, "metadata": self.metadata},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -1,3 +1,5 @@
+from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
 
 
@@ -5,3 +7,9 @@ class SourceType(str, Enum):
     users = "users"
     roles = "roles"
     audit = "audit"
+
+
+@dataclass(frozen=True, order=True)
+class SourceCursor:
+    timestamp: datetime
+    key: str = ""
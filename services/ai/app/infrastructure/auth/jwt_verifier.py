@@ -1,5 +1,14 @@
-from jwt import PyJWKClient, decode
-from jwt import InvalidTokenError
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import datetime, timezone
+import hashlib
+import logging
+import threading
+import time
+from typing import Any
+
+from jwt import PyJWK, PyJWKClient, decode, get_unverified_header
+from jwt import InvalidTokenError, PyJWTError
 
 from ...core.config import Settings
 from ...application.ports.auth import (
@@ -10,16 +19,71 @@ from ...application.ports.auth import (
 
 
 class JwtAccessTokenVerifier(AccessTokenVerifier):
-    def __init__(self, settings: Settings) -> None:
+    def __init__(
+        self, settings: Settings, clock: Callable[[], float] = time.time
+    ) -> None:
         self.settings = settings
-        self.jwks_client = PyJWKClient(settings.auth_jwks_url)
+        self.clock = clock
+        self.jwks_client = PyJWKClient(
+            settings.auth_jwks_url,
+            cache_jwk_set=False,
+            timeout=int(max(1, settings.request_timeout_seconds)),
+        )
+        self.cache_size = settings.auth_token_cache_size
+        self.logger = logging.getLogger(__name__)
+        self._claims: OrderedDict[str, tuple[AccessTokenClaims, float]] = (
+            OrderedDict()
+        )
+        self._keys: dict[str | None, PyJWK] = {}
+        self._last_fetch: float | None = None
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresher: threading.Thread | None = None
+
+    def start(self) -> None:
+        try:
+            self.refresh_keys()
+        except PyJWTError as exc:
+            self.logger.warning("JWKS prefetch failed", exc_info=exc)
+        if self._refresher or self.settings.auth_jwks_refresh_seconds <= 0:
+            return
+        self._refresher = threading.Thread(
+            target=self._refresh_loop, name="jwks-refresh", daemon=True
+        )
+        self._refresher.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._refresher:
+            self._refresher.join(timeout=1)
+
+    def refresh_keys(self) -> None:
+        with self._fetch_lock:
+            self._fetch_keys()
+
+    def _refresh_if_stale(self) -> None:
+        with self._fetch_lock:
+            if self._may_refetch():
+                self._fetch_keys()
+
+    def _fetch_keys(self) -> None:
+        self._last_fetch = self.clock()
+        jwk_set = self.jwks_client.get_jwk_set(refresh=True)
+        keys = {key.key_id: key for key in jwk_set.keys}
+        with self._lock:
+            self._keys = keys
 
     def verify(self, token: str) -> AccessTokenClaims:
+        cache_key = hashlib.sha256(token.encode()).hexdigest()
+        cached = self._cached(cache_key)
+        if cached:
+            return cached
+
         try:
-            signing_key = self.jwks_client.get_signing_key_from_jwt(token)
             payload = decode(
                 token,
-                signing_key.key,
+                self._signing_key(token).key,
                 algorithms=["RS256"],
                 issuer=self.settings.auth_issuer,
                 options={"verify_aud": False},
@@ -27,28 +91,85 @@ class JwtAccessTokenVerifier(AccessTokenVerifier):
         except InvalidTokenError as exc:
             raise ValueError("Invalid access token") from exc
 
-        role_value = (
-            payload.get("roleId") or payload.get("role_id") or payload.get("role")
-        )
-        role_abilities_payload = payload.get("roleAbilities") or payload.get(
-            "role_abilities"
-        )
-        required = ["sub", "email", "name"]
-        for field in required:
-            if field not in payload or not payload.get(field):
-                raise ValueError("Access token missing required claims")
-        if not role_value:
+        claims = _to_claims(payload)
+        self._remember(cache_key, claims, payload.get("exp"))
+        return claims
+
+    def _signing_key(self, token: str) -> PyJWK:
+        kid = get_unverified_header(token).get("kid")
+        with self._lock:
+            key = self._keys.get(kid)
+        if key:
+            return key
+        try:
+            self._refresh_if_stale()
+        except PyJWTError as exc:
+            raise InvalidTokenError("Unable to fetch signing keys") from exc
+        with self._lock:
+            key = self._keys.get(kid)
+        if not key:
+            raise InvalidTokenError(f"No signing key matches kid {kid!r}")
+        return key
+
+    def _may_refetch(self) -> bool:
+        if self._last_fetch is None:
+            return True
+        elapsed = self.clock() - self._last_fetch
+        return elapsed >= self.settings.auth_jwks_min_refetch_seconds
+
+    def _cached(self, cache_key: str) -> AccessTokenClaims | None:
+        with self._lock:
+            entry = self._claims.get(cache_key)
+            if not entry:
+                return None
+            claims, expires_at = entry
+            if expires_at <= self.clock():
+                del self._claims[cache_key]
+                return None
+            self._claims.move_to_end(cache_key)
+            return claims
+
+    def _remember(self, cache_key: str, claims: AccessTokenClaims, exp: Any) -> None:
+        if self.cache_size <= 0 or not isinstance(exp, (int, float)):
+            return
+        with self._lock:
+            self._claims[cache_key] = (claims, float(exp))
+            self._claims.move_to_end(cache_key)
+            while len(self._claims) > self.cache_size:
+                self._claims.popitem(last=False)
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.wait(self.settings.auth_jwks_refresh_seconds):
+            try:
+                self.refresh_keys()
+            except PyJWTError as exc:
+                self.logger.warning("JWKS refresh failed", exc_info=exc)
+
+
+def _to_claims(payload: dict[str, Any]) -> AccessTokenClaims:
+    role_value = (
+        payload.get("roleId") or payload.get("role_id") or payload.get("role")
+    )
+    role_abilities_payload = payload.get("roleAbilities") or payload.get(
+        "role_abilities"
+    )
+    required = ["sub", "email", "name"]
+    for field in required:
+        if field not in payload or not payload.get(field):
             raise ValueError("Access token missing required claims")
+    if not role_value:
+        raise ValueError("Access token missing required claims")
 
-        return AccessTokenClaims(
-            sub=str(payload.get("sub")),
-            email=str(payload.get("email")),
-            name=str(payload.get("name")),
-            role=str(role_value),
-            role_abilities=_to_role_abilities(role_abilities_payload),
-            scope=str(payload.get("scope")) if payload.get("scope") else None,
-            client_id=str(payload.get("clientId")) if payload.get("clientId") else None,
-        )
+    return AccessTokenClaims(
+        sub=str(payload.get("sub")),
+        email=str(payload.get("email")),
+        name=str(payload.get("name")),
+        role=str(role_value),
+        role_abilities=_to_role_abilities(role_abilities_payload),
+        scope=str(payload.get("scope")) if payload.get("scope") else None,
+        client_id=str(payload.get("clientId")) if payload.get("clientId") else None,
+        expires_at=_to_datetime(payload.get("exp")),
+    )
 
 
 def _to_role_abilities(payload: object) -> RoleAbilitiesClaims | None:
@@ -62,6 +183,12 @@ def _to_role_abilities(payload: object) -> RoleAbilitiesClaims | None:
     )
 
 
+def _to_datetime(value: object) -> datetime | None:
+    if not isinstance(value, (int, float)):
+        return None
+    return datetime.fromtimestamp(value, timezone.utc)
+
+
 def _to_bool(value: object) -> bool | None:
     if value is None:
         return None
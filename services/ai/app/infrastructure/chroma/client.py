@@ -1,12 +1,27 @@
 from urllib.parse import urlparse
 
 import chromadb
+from chromadb.api import AsyncClientAPI
 
 from ...core.config import Settings
 
 
 def build_chroma_client(settings: Settings) -> chromadb.HttpClient:
-    parsed = urlparse(settings.chroma_url)
-    host = parsed.hostname or "chromadb"
-    port = parsed.port or 8000
+    host, port = _address(settings)
     return chromadb.HttpClient(host=host, port=port)
+
+
+async def build_async_chroma_client(settings: Settings) -> AsyncClientAPI:
+    host, port = _address(settings)
+    return await chromadb.AsyncHttpClient(host=host, port=port)
+
+
+async def close_async_chroma_client(client: AsyncClientAPI) -> None:
+    server = getattr(client, "_server", None)
+    if server is not None:
+        await server.__aexit__(None, None, None)
+
+
+def _address(settings: Settings) -> tuple[str, int]:
+    parsed = urlparse(settings.chroma_url)
+    return parsed.hostname or "chromadb", parsed.port or 8000
@@ -1,38 +1,75 @@
+from collections.abc import Iterable
 from datetime import datetime
 
+from chromadb.api import ClientAPI
 from chromadb.api.models.Collection import Collection
 
 from ...application.ports.cursor_store import CursorStore
 from ...core.config import Settings
-from ...domain.source import SourceType
+from ...domain.source import SourceCursor, SourceType
 from .client import build_chroma_client
 
+_ADVANCE_ATTEMPTS = 3
+
 
 class ChromaCursorStore(CursorStore):
-    def __init__(self, settings: Settings) -> None:
-        self.client = build_chroma_client(settings)
+    def __init__(self, settings: Settings, client: ClientAPI | None = None) -> None:
+        self.client = client or build_chroma_client(settings)
         self.collection: Collection = self.client.get_or_create_collection(
             name=settings.chroma_cursor_collection,
             metadata={"hnsw:space": "cosine"},
         )
 
-    def get_cursor(self, source: SourceType) -> datetime | None:
-        result = self.collection.get(ids=[source.value], include=["metadatas"])
-        metadatas = result.get("metadatas")
-        if not metadatas:
-            return None
-        metadata = metadatas[0] or {}
-        value = metadata.get("cursor")
-        if not value:
-            return None
-        return _parse_datetime(value)
-
-    def set_cursor(self, source: SourceType, cursor: datetime) -> None:
+    def get_cursor(self, source: SourceType) -> SourceCursor | None:
+        return self.get_cursors([source]).get(source)
+
+    def get_cursors(
+        self, sources: Iterable[SourceType]
+    ) -> dict[SourceType, SourceCursor]:
+        wanted = list(dict.fromkeys(source.value for source in sources))
+        if not wanted:
+            return {}
+        result = self.collection.get(ids=wanted, include=["metadatas"])
+        ids = result.get("ids") or []
+        metadatas = result.get("metadatas") or []
+        cursors: dict[SourceType, SourceCursor] = {}
+        for doc_id, metadata in zip(ids, metadatas):
+            metadata = metadata or {}
+            value = metadata.get("cursor")
+            parsed = _parse_datetime(value) if value else None
+            if parsed:
+                cursors[SourceType(doc_id)] = SourceCursor(
+                    parsed, str(metadata.get("key") or "")
+                )
+        return cursors
+
+    def set_cursor(self, source: SourceType, cursor: SourceCursor) -> None:
+        self._write({source: cursor})
+
+    def advance_cursors(
+        self, cursors: dict[SourceType, SourceCursor]
+    ) -> dict[SourceType, SourceCursor]:
+        for _ in range(_ADVANCE_ATTEMPTS):
+            current = self.get_cursors(cursors)
+            behind = {
+                source: cursor
+                for source, cursor in cursors.items()
+                if source not in current or cursor > current[source]
+            }
+            if not behind:
+                return current
+            self._write(behind)
+        return {**current, **behind}
+
+    def _write(self, cursors: dict[SourceType, SourceCursor]) -> None:
         self.collection.upsert(
-            ids=[source.value],
-            embeddings=[[0.0]],
-            documents=["cursor"],
-            metadatas=[{"cursor": cursor.isoformat()}],
+            ids=[source.value for source in cursors],
+            embeddings=[[0.0] for _ in cursors],
+            documents=["cursor" for _ in cursors],
+            metadatas=[
+                {"cursor": cursor.timestamp.isoformat(), "key": cursor.key}
+                for cursor in cursors.values()
+            ],
         )
 
 
@@ -1,14 +1,31 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Iterator
+from typing import Any
+
+from chromadb.api import AsyncClientAPI, ClientAPI
+from chromadb.api.models.AsyncCollection import AsyncCollection
 from chromadb.api.models.Collection import Collection
 
-from ...application.ports.vector_store import RetrievedDocument, VectorStore
+from ...application.ports.vector_store import (
+    AsyncVectorStore,
+    DocumentFilter,
+    RetrievedDocument,
+    VectorStore,
+)
 from ...core.config import Settings
-from ...domain.document import EmbeddingDocument
-from .client import build_chroma_client
+from ...domain.document import FINGERPRINT_KEY, EmbeddingDocument
+from .client import (
+    build_async_chroma_client,
+    build_chroma_client,
+    close_async_chroma_client,
+)
+
+_GET_BATCH_SIZE = 500
 
 
 class ChromaVectorStore(VectorStore):
-    def __init__(self, settings: Settings) -> None:
-        self.client = build_chroma_client(settings)
+    def __init__(self, settings: Settings, client: ClientAPI | None = None) -> None:
+        self.client = client or build_chroma_client(settings)
         self.collection: Collection = self.client.get_or_create_collection(
             name=settings.chroma_collection,
             metadata={"hnsw:space": "cosine"},
@@ -27,26 +44,132 @@ class ChromaVectorStore(VectorStore):
             metadatas=metadatas,
         )
 
-    def query(self, embedding: list[float], top_k: int) -> list[RetrievedDocument]:
+    def query(
+        self,
+        embedding: list[float],
+        top_k: int,
+        where: DocumentFilter | None = None,
+    ) -> list[RetrievedDocument]:
         result = self.collection.query(
             query_embeddings=[embedding],
             n_results=top_k,
+            where=_to_where(where),
             include=["documents", "metadatas", "distances"],
         )
-        documents = result.get("documents", [[]])[0]
-        metadatas = result.get("metadatas", [[]])[0]
-        distances = result.get("distances", [[]])[0]
-        ids = result.get("ids", [[]])[0]
-        if not ids:
-            ids = [f"doc-{index}" for index, _ in enumerate(documents)]
-        items: list[RetrievedDocument] = []
-        for index, doc in enumerate(documents):
-            items.append(
-                RetrievedDocument(
-                    doc_id=ids[index],
-                    content=doc,
-                    metadata=metadatas[index] or {},
-                    distance=distances[index] if distances else None,
-                )
+        return _to_documents(result)
+
+    def get_fingerprints(self, doc_ids: list[str]) -> dict[str, str]:
+        fingerprints: dict[str, str] = {}
+        for start in range(0, len(doc_ids), _GET_BATCH_SIZE):
+            batch = doc_ids[start : start + _GET_BATCH_SIZE]
+            result = self.collection.get(ids=batch, include=["metadatas"])
+            ids = result.get("ids") or []
+            metadatas = result.get("metadatas") or []
+            for doc_id, metadata in zip(ids, metadatas):
+                value = (metadata or {}).get(FINGERPRINT_KEY)
+                if value:
+                    fingerprints[doc_id] = str(value)
+        return fingerprints
+
+    def delete(self, doc_ids: list[str]) -> None:
+        for start in range(0, len(doc_ids), _GET_BATCH_SIZE):
+            self.collection.delete(ids=doc_ids[start : start + _GET_BATCH_SIZE])
+
+    def iter_doc_ids(
+        self, source: str, fields: tuple[tuple[str, str], ...] = ()
+    ) -> Iterator[list[str]]:
+        where = _to_where(DocumentFilter(sources=(source,), fields=fields))
+        offset = 0
+        while True:
+            result = self.collection.get(
+                where=where,
+                include=[],
+                limit=_GET_BATCH_SIZE,
+                offset=offset,
             )
-        return items
+            ids = result.get("ids") or []
+            if ids:
+                yield list(ids)
+            if len(ids) < _GET_BATCH_SIZE:
+                return
+            offset += len(ids)
+
+
+class AsyncChromaVectorStore(AsyncVectorStore):
+    def __init__(
+        self,
+        settings: Settings,
+        connect: Callable[[], Awaitable[AsyncClientAPI]] | None = None,
+    ) -> None:
+        self.settings = settings
+        self.connect = connect or (lambda: build_async_chroma_client(settings))
+        self.collection: AsyncCollection | None = None
+        self._client: AsyncClientAPI | None = None
+        self._lock = asyncio.Lock()
+
+    async def query(
+        self,
+        embedding: list[float],
+        top_k: int,
+        where: DocumentFilter | None = None,
+    ) -> list[RetrievedDocument]:
+        collection = await self._collection()
+        result = await collection.query(
+            query_embeddings=[embedding],
+            n_results=top_k,
+            where=_to_where(where),
+            include=["documents", "metadatas", "distances"],
+        )
+        return _to_documents(result)
+
+    async def aclose(self) -> None:
+        async with self._lock:
+            client, self._client, self.collection = self._client, None, None
+        if client is not None:
+            await close_async_chroma_client(client)
+
+    async def _collection(self) -> AsyncCollection:
+        if self.collection is None:
+            async with self._lock:
+                if self.collection is None:
+                    if self._client is None:
+                        self._client = await self.connect()
+                    self.collection = await self._client.get_or_create_collection(
+                        name=self.settings.chroma_collection,
+                        metadata={"hnsw:space": "cosine"},
+                    )
+        return self.collection
+
+
+def _to_where(where: DocumentFilter | None) -> dict[str, Any] | None:
+    if where is None:
+        return None
+    clauses: list[dict[str, Any]] = []
+    if len(where.sources) == 1:
+        clauses.append({"source": where.sources[0]})
+    elif where.sources:
+        clauses.append({"source": {"$in": list(where.sources)}})
+    clauses.extend({key: value} for key, value in where.fields)
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def _to_documents(result: Any) -> list[RetrievedDocument]:
+    documents = result.get("documents", [[]])[0]
+    metadatas = result.get("metadatas", [[]])[0]
+    distances = result.get("distances", [[]])[0]
+    ids = result.get("ids", [[]])[0]
+    if not ids:
+        ids = [f"doc-{index}" for index, _ in enumerate(documents)]
+    items: list[RetrievedDocument] = []
+    for index, doc in enumerate(documents):
+        items.append(
+            RetrievedDocument(
+                doc_id=ids[index],
+                content=doc,
+                metadata=metadatas[index] or {},
+                distance=distances[index] if distances else None,
+            )
+        )
+    return items
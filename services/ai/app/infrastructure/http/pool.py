@@ -0,0 +1,21 @@
+import importlib.util
+
+import httpx
+
+from ...core.config import Settings
+
+
+def build_http_client(settings: Settings) -> httpx.Client:
+    return httpx.Client(
+        timeout=settings.request_timeout_seconds,
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        ),
+        http2=settings.http2_enabled and _h2_available(),
+    )
+
+
+def _h2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
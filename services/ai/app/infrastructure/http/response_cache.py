@@ -0,0 +1,47 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+import threading
+from typing import Any
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    value: Any
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ConditionalResponseCache:
+    def __init__(self, max_entries: int = 32) -> None:
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry:
+                self._entries.move_to_end(url)
+            return entry
+
+    def store(
+        self, url: str, value: Any, etag: str | None, last_modified: str | None
+    ) -> None:
+        with self._lock:
+            if not etag and not last_modified:
+                self._entries.pop(url, None)
+                return
+            self._entries[url] = CachedResponse(
+                value=value, etag=etag, last_modified=last_modified
+            )
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
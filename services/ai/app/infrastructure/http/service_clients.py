@@ -1,4 +1,7 @@
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, nullcontext
 from datetime import datetime
+import importlib.util
 from typing import Any
 from urllib.parse import urlencode
 
@@ -10,82 +13,77 @@ from ...application.ports.sources import (
     RoleAbilities,
     RoleGateway,
     RoleInfo,
+    RoleLookup,
     RoleRecord,
     UserGateway,
+    UserLookup,
     UserRecord,
 )
 from ...core.config import Settings
+from ...domain.source import SourceCursor
+from .response_cache import ConditionalResponseCache
+
+_ACCEPT_ENCODING = (
+    "br, gzip"
+    if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi")
+    else "gzip"
+)
 
 
 class UserServiceClient(UserGateway):
-    def __init__(self, settings: Settings) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        cache: ConditionalResponseCache | None = None,
+        http: httpx.Client | None = None,
+    ) -> None:
         self.settings = settings
+        self.cache = cache
+        self.http = http
 
-    def list_users(self, access_token: str | None) -> list[UserRecord]:
-        data = self._get_json(self.settings.user_service_url, access_token)
-        users: list[UserRecord] = []
-        for item in data:
-            role_id = _optional_str(item.get("roleId") or item.get("role_id"))
-            if not role_id:
-                role_id = _optional_str(item.get("role"))
-            users.append(
-                UserRecord(
-                    user_id=str(item.get("id")),
-                    name=str(item.get("name")),
-                    email=str(item.get("email")),
-                    role_id=role_id or "",
-                    role_name=_optional_str(item.get("roleName") or item.get("role")),
-                    created_at=_parse_datetime(
-                        item.get("createdAt") or item.get("created_at")
-                    ),
-                    updated_at=_parse_datetime(
-                        item.get("updatedAt") or item.get("updated_at")
-                    ),
-                )
-            )
-        return users
-
-    def _get_json(self, url: str, access_token: str | None) -> list[dict[str, Any]]:
-        headers = _auth_headers(access_token)
-        with httpx.Client(timeout=self.settings.request_timeout_seconds) as client:
-            response = client.get(url, headers=headers)
-        if response.status_code >= 400:
-            raise RuntimeError(_error_message("users", response))
-        return response.json()
+    def list_users(
+        self, access_token: str | None, updated_after: datetime | None = None
+    ) -> list[UserRecord]:
+        url = _with_updated_after(self.settings.user_service_url, updated_after)
+        return _get_list(
+            _session(self.settings, self.http),
+            self.cache,
+            url,
+            access_token,
+            "users",
+            _user_from_payload,
+        )
 
 
 class RoleServiceClient(RoleGateway):
-    def __init__(self, settings: Settings) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        cache: ConditionalResponseCache | None = None,
+        http: httpx.Client | None = None,
+    ) -> None:
         self.settings = settings
+        self.cache = cache
+        self.http = http
 
-    def list_roles(self, access_token: str | None) -> list[RoleRecord]:
-        data = self._get_json(self.settings.role_service_url, access_token)
-        roles: list[RoleRecord] = []
-        for item in data:
-            abilities = item.get("abilities") or {}
-            roles.append(
-                RoleRecord(
-                    role_id=str(item.get("id")),
-                    name=str(item.get("name")),
-                    can_view=bool(abilities.get("canView")),
-                    can_create=bool(abilities.get("canCreate")),
-                    can_update=bool(abilities.get("canUpdate")),
-                    can_delete=bool(abilities.get("canDelete")),
-                    created_at=_parse_datetime(
-                        item.get("createdAt") or item.get("created_at")
-                    ),
-                    updated_at=_parse_datetime(
-                        item.get("updatedAt") or item.get("updated_at")
-                    ),
-                )
-            )
-        return roles
+    def list_roles(
+        self, access_token: str | None, updated_after: datetime | None = None
+    ) -> list[RoleRecord]:
+        url = _with_updated_after(self.settings.role_service_url, updated_after)
+        return _get_list(
+            _session(self.settings, self.http),
+            self.cache,
+            url,
+            access_token,
+            "roles",
+            _role_record_from_payload,
+        )
 
     def get_role(self, role_ref: str, access_token: str | None) -> RoleInfo | None:
         headers = _auth_headers(access_token)
         if _looks_like_uuid(role_ref):
             url = f"{self.settings.role_service_url}/{role_ref}"
-            with httpx.Client(timeout=self.settings.request_timeout_seconds) as client:
+            with _session(self.settings, self.http) as client:
                 response = client.get(url, headers=headers)
             if response.status_code == 404:
                 return None
@@ -108,30 +106,88 @@ class RoleServiceClient(RoleGateway):
                 )
         return None
 
-    def _get_json(self, url: str, access_token: str | None) -> list[dict[str, Any]]:
-        headers = _auth_headers(access_token)
-        with httpx.Client(timeout=self.settings.request_timeout_seconds) as client:
-            response = client.get(url, headers=headers)
-        if response.status_code >= 400:
-            raise RuntimeError(_error_message("roles", response))
-        return response.json()
+
+class InternalUserClient(UserLookup):
+    def __init__(self, settings: Settings, http: httpx.Client | None = None) -> None:
+        self.settings = settings
+        self.http = http
+
+    def find_user(self, user_id: str) -> UserRecord | None:
+        payload = _get_internal(
+            self.settings,
+            self.http,
+            f"{self.settings.user_internal_url}/{user_id}",
+            "users",
+        )
+        return _user_from_payload(payload) if payload else None
+
+
+class InternalRoleClient(RoleLookup):
+    def __init__(self, settings: Settings, http: httpx.Client | None = None) -> None:
+        self.settings = settings
+        self.http = http
+
+    def find_role(self, role_id: str) -> RoleRecord | None:
+        payload = _get_internal(
+            self.settings,
+            self.http,
+            f"{self.settings.role_internal_url}/{role_id}",
+            "roles",
+        )
+        return _role_record_from_payload(payload) if payload else None
 
 
 class AuditServiceClient(AuditGateway):
-    def __init__(self, settings: Settings) -> None:
+    def __init__(self, settings: Settings, http: httpx.Client | None = None) -> None:
         self.settings = settings
+        self.http = http
+
+    def iter_log_pages(
+        self,
+        access_token: str | None,
+        after: SourceCursor | None,
+        max_items: int | None = None,
+    ) -> Iterator[list[AuditRecord]]:
+        page_size = self.settings.audit_page_size
+        remaining = max_items
+        cursor = after
+        with _session(self.settings, self.http) as client:
+            while remaining is None or remaining > 0:
+                limit = page_size if remaining is None else min(page_size, remaining)
+                page = self._fetch_page(client, access_token, cursor, limit)
+                fresh = [log for log in page if _is_after(log, cursor)]
+                if remaining is not None:
+                    remaining -= len(fresh)
+                if fresh:
+                    yield fresh
 
-    def list_logs(
-        self, access_token: str | None, occurred_after: datetime | None
+                if len(page) < limit:
+                    return
+                latest = max(
+                    (position for log in page if (position := _audit_cursor(log))),
+                    default=None,
+                )
+                if latest is None or (cursor is not None and latest <= cursor):
+                    raise RuntimeError(
+                        f"audit service returned no records after {cursor}; "
+                        "the pager cannot advance"
+                    )
+                cursor = latest
+
+    def _fetch_page(
+        self,
+        client: httpx.Client,
+        access_token: str | None,
+        after: SourceCursor | None,
+        limit: int,
     ) -> list[AuditRecord]:
-        params = {}
-        if occurred_after:
-            params["from"] = occurred_after.isoformat()
-        query = f"?{urlencode(params)}" if params else ""
-        url = f"{self.settings.audit_service_url}{query}"
-        headers = _auth_headers(access_token)
-        with httpx.Client(timeout=self.settings.request_timeout_seconds) as client:
-            response = client.get(url, headers=headers)
+        params = {"limit": str(limit), "order": "asc"}
+        if after:
+            params["from"] = after.timestamp.isoformat()
+            if after.key:
+                params["afterId"] = after.key
+        url = f"{self.settings.audit_service_url}?{urlencode(params)}"
+        response = client.get(url, headers=_auth_headers(access_token))
         if response.status_code >= 400:
             raise RuntimeError(_error_message("audit", response))
         payload = response.json()
@@ -153,6 +209,98 @@ class AuditServiceClient(AuditGateway):
         return logs
 
 
+def _audit_cursor(log: AuditRecord) -> SourceCursor | None:
+    if log.occurred_at is None:
+        return None
+    return SourceCursor(log.occurred_at, log.audit_id)
+
+
+def _is_after(log: AuditRecord, cursor: SourceCursor | None) -> bool:
+    position = _audit_cursor(log)
+    return cursor is None or position is None or position > cursor
+
+
+def _session(
+    settings: Settings, http: httpx.Client | None
+) -> AbstractContextManager[httpx.Client]:
+    if http:
+        return nullcontext(http)
+    return httpx.Client(timeout=settings.request_timeout_seconds)
+
+
+def _get_list(
+    session: AbstractContextManager[httpx.Client],
+    cache: ConditionalResponseCache | None,
+    url: str,
+    access_token: str | None,
+    service: str,
+    parse: Callable[[dict[str, Any]], Any],
+) -> list[Any]:
+    cached = cache.get(url) if cache else None
+    headers = {**_auth_headers(access_token), "Accept-Encoding": _ACCEPT_ENCODING}
+    if cached:
+        headers.update(cached.conditional_headers())
+    with session as client:
+        response = client.get(url, headers=headers)
+    if response.status_code == 304 and cached:
+        return list(cached.value)
+    if response.status_code >= 400:
+        raise RuntimeError(_error_message(service, response))
+    records = [parse(item) for item in response.json()]
+    if cache:
+        cache.store(
+            url,
+            tuple(records),
+            response.headers.get("etag"),
+            response.headers.get("last-modified"),
+        )
+    return records
+
+
+def _get_internal(
+    settings: Settings, http: httpx.Client | None, url: str, service: str
+) -> dict[str, Any] | None:
+    headers = {}
+    if settings.internal_service_token:
+        headers["x-service-token"] = settings.internal_service_token
+    with _session(settings, http) as client:
+        response = client.get(url, headers=headers)
+    if response.status_code == 404:
+        return None
+    if response.status_code >= 400:
+        raise RuntimeError(_error_message(service, response))
+    return response.json()
+
+
+def _user_from_payload(item: dict[str, Any]) -> UserRecord:
+    role_id = _optional_str(item.get("roleId") or item.get("role_id"))
+    if not role_id:
+        role_id = _optional_str(item.get("role"))
+    return UserRecord(
+        user_id=str(item.get("id")),
+        name=str(item.get("name")),
+        email=str(item.get("email")),
+        role_id=role_id or "",
+        role_name=_optional_str(item.get("roleName") or item.get("role")),
+        created_at=_parse_datetime(item.get("createdAt") or item.get("created_at")),
+        updated_at=_parse_datetime(item.get("updatedAt") or item.get("updated_at")),
+    )
+
+
+def _role_record_from_payload(item: dict[str, Any]) -> RoleRecord:
+    abilities = item.get("abilities") or {}
+    return RoleRecord(
+        role_id=str(item.get("id")),
+        name=str(item.get("name")),
+        can_view=bool(abilities.get("canView")),
+        can_create=bool(abilities.get("canCreate")),
+        can_update=bool(abilities.get("canUpdate")),
+        can_delete=bool(abilities.get("canDelete")),
+        created_at=_parse_datetime(item.get("createdAt") or item.get("created_at")),
+        updated_at=_parse_datetime(item.get("updatedAt") or item.get("updated_at")),
+    )
+
+
 def _role_info_from_payload(payload: dict[str, Any]) -> RoleInfo:
     abilities = payload.get("abilities") or {}
     return RoleInfo(
@@ -167,6 +315,13 @@ def _role_info_from_payload(payload: dict[str, Any]) -> RoleInfo:
     )
 
 
+def _with_updated_after(url: str, updated_after: datetime | None) -> str:
+    if not updated_after:
+        return url
+    cursor = updated_after.isoformat(timespec="milliseconds")
+    return f"{url}?{urlencode({'updatedAfter': cursor})}"
+
+
 def _auth_headers(access_token: str | None) -> dict[str, str]:
     if access_token:
         return {"Authorization": access_token}
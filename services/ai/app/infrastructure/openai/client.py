@@ -1,41 +1,152 @@
-from openai import OpenAI
+import asyncio
+from collections.abc import AsyncIterator
+import logging
+from typing import Any
 
-from ...application.ports.embeddings import ChatClient, EmbeddingClient
+from openai import AsyncOpenAI, OpenAI
+
+from ...application.ports.embeddings import (
+    AsyncChatClient,
+    AsyncEmbeddingClient,
+    ChatChunk,
+    ChatUsage,
+    EmbeddingClient,
+)
 from ...core.config import Settings
+from .dispatcher import BatchDispatcher, RateLimiter
+from .tokens import TokenBatch, TokenCounter, max_input_tokens_for, pack_batches
 
 
-class OpenAIEmbeddingClient(EmbeddingClient):
+class _EmbeddingBatches:
     def __init__(self, settings: Settings) -> None:
         if not settings.openai_api_key:
             raise ValueError("OPENAI_API_KEY is required")
-        self.client = OpenAI(api_key=settings.openai_api_key)
         self.model = settings.openai_embedding_model
         self.max_batch_size = settings.max_batch_size
+        self.max_request_tokens = settings.embedding_max_request_tokens
+        self.max_input_tokens = settings.embedding_max_input_tokens or (
+            max_input_tokens_for(self.model)
+        )
+        self.tokens = TokenCounter(self.model)
+        self.logger = logging.getLogger(__name__)
+
+    def _batches(self, inputs: list[str]) -> list[TokenBatch]:
+        return pack_batches(
+            [self._fit(index, text) for index, text in enumerate(inputs)],
+            max_tokens=self.max_request_tokens,
+            max_items=self.max_batch_size,
+        )
+
+    def _fit(self, index: int, text: str) -> tuple[str, int]:
+        tokens = self.tokens.count(text)
+        if tokens <= self.max_input_tokens:
+            return text, tokens
+        self.logger.warning(
+            "Embedding input %s truncated from %s to %s tokens",
+            index,
+            tokens,
+            self.max_input_tokens,
+        )
+        return self.tokens.truncate(text, self.max_input_tokens), self.max_input_tokens
+
+
+class OpenAIEmbeddingClient(_EmbeddingBatches, EmbeddingClient):
+    def __init__(self, settings: Settings, client: OpenAI | None = None) -> None:
+        super().__init__(settings)
+        self.client = (client or OpenAI(api_key=settings.openai_api_key)).with_options(
+            max_retries=0
+        )
+        self.dispatcher = BatchDispatcher(
+            limiter=RateLimiter(
+                requests_per_minute=settings.embedding_requests_per_minute,
+                tokens_per_minute=settings.embedding_tokens_per_minute,
+            ),
+            max_concurrency=settings.embedding_max_concurrency,
+            max_retries=settings.embedding_max_retries,
+        )
 
     def embed_texts(self, inputs: list[str]) -> list[list[float]]:
-        embeddings: list[list[float]] = []
-        for start in range(0, len(inputs), self.max_batch_size):
-            batch = inputs[start : start + self.max_batch_size]
-            response = self.client.embeddings.create(model=self.model, input=batch)
-            embeddings.extend([item.embedding for item in response.data])
-        return embeddings
+        results = self.dispatcher.run(
+            self._batches(inputs), self._embed_batch, lambda batch: batch.tokens
+        )
+        return [embedding for batch in results for embedding in batch]
 
+    def _embed_batch(self, batch: TokenBatch) -> list[list[float]]:
+        response = self.client.embeddings.create(model=self.model, input=batch.texts)
+        return [item.embedding for item in response.data]
 
-class OpenAIChatClient(ChatClient):
-    def __init__(self, settings: Settings) -> None:
+
+class AsyncOpenAIEmbeddingClient(_EmbeddingBatches, AsyncEmbeddingClient):
+    def __init__(self, settings: Settings, client: AsyncOpenAI | None = None) -> None:
+        super().__init__(settings)
+        self.client = client or AsyncOpenAI(api_key=settings.openai_api_key)
+
+    async def embed_texts(self, inputs: list[str]) -> list[list[float]]:
+        results = await asyncio.gather(
+            *(self._embed_batch(batch) for batch in self._batches(inputs))
+        )
+        return [embedding for batch in results for embedding in batch]
+
+    async def _embed_batch(self, batch: TokenBatch) -> list[list[float]]:
+        response = await self.client.embeddings.create(
+            model=self.model, input=batch.texts
+        )
+        return [item.embedding for item in response.data]
+
+
+class AsyncOpenAIChatClient(AsyncChatClient):
+    def __init__(self, settings: Settings, client: AsyncOpenAI | None = None) -> None:
         if not settings.openai_api_key:
             raise ValueError("OPENAI_API_KEY is required")
-        self.client = OpenAI(api_key=settings.openai_api_key)
+        self.client = client or AsyncOpenAI(api_key=settings.openai_api_key)
         self.model = settings.openai_chat_model
 
-    def generate(self, system_prompt: str, user_prompt: str) -> str:
-        response = self.client.chat.completions.create(
+    async def generate(self, system_prompt: str, user_prompt: str) -> str:
+        response = await self.client.chat.completions.create(
             model=self.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
+            messages=_messages(system_prompt, user_prompt),
             temperature=0.2,
         )
         message = response.choices[0].message
         return message.content or ""
+
+    async def stream(
+        self, system_prompt: str, user_prompt: str
+    ) -> AsyncIterator[ChatChunk]:
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=_messages(system_prompt, user_prompt),
+            temperature=0.2,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        try:
+            async for chunk in response:
+                for item in _to_chunks(chunk):
+                    yield item
+        finally:
+            await response.close()
+
+
+def _messages(system_prompt: str, user_prompt: str) -> list[dict[str, str]]:
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def _to_chunks(chunk: Any) -> list[ChatChunk]:
+    chunks: list[ChatChunk] = []
+    if chunk.choices and chunk.choices[0].delta.content:
+        chunks.append(ChatChunk(text=chunk.choices[0].delta.content))
+    if chunk.usage:
+        chunks.append(
+            ChatChunk(
+                usage=ChatUsage(
+                    prompt_tokens=chunk.usage.prompt_tokens,
+                    completion_tokens=chunk.usage.completion_tokens,
+                    total_tokens=chunk.usage.total_tokens,
+                )
+            )
+        )
+    return chunks
@@ -0,0 +1,140 @@
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import random
+import threading
+import time
+from typing import TypeVar
+
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    InternalServerError,
+    RateLimitError,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_RETRYABLE = (RateLimitError, APIConnectionError, InternalServerError)
+
+
+class TokenBucket:
+    def __init__(
+        self, per_minute: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        with self._lock:
+            now = self.clock()
+            elapsed = max(0.0, now - self.updated)
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+            self.tokens -= min(amount, self.capacity)
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.requests = TokenBucket(requests_per_minute, clock)
+        self.tokens = TokenBucket(tokens_per_minute, clock)
+        self.sleep = sleep
+
+    def acquire(self, tokens: int) -> None:
+        wait = max(self.requests.reserve(1), self.tokens.reserve(tokens))
+        if wait > 0:
+            self.sleep(wait)
+
+
+class BatchDispatcher:
+    def __init__(
+        self,
+        limiter: RateLimiter,
+        max_concurrency: int,
+        max_retries: int,
+        base_backoff_seconds: float = 0.5,
+        max_backoff_seconds: float = 30.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.limiter = limiter
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.sleep = sleep
+        self.logger = logging.getLogger(__name__)
+
+    def run(
+        self,
+        batches: list[T],
+        call: Callable[[T], R],
+        cost: Callable[[T], int],
+    ) -> list[R]:
+        def attempt(batch: T) -> R:
+            return self._call_with_retry(batch, call, cost(batch))
+
+        workers = min(self.max_concurrency, len(batches))
+        if workers <= 1:
+            return [attempt(batch) for batch in batches]
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="embed"
+        ) as executor:
+            return list(executor.map(attempt, batches))
+
+    def _call_with_retry(self, batch: T, call: Callable[[T], R], tokens: int) -> R:
+        retries = 0
+        while True:
+            self.limiter.acquire(tokens)
+            try:
+                return call(batch)
+            except _RETRYABLE as exc:
+                if retries >= self.max_retries:
+                    raise
+                delay = _retry_after_seconds(exc)
+                if delay is None:
+                    delay = self._backoff(retries)
+                retries += 1
+                self.logger.warning(
+                    "Embedding request failed (%s); retry %s in %.2fs",
+                    type(exc).__name__,
+                    retries,
+                    delay,
+                )
+                self.sleep(delay)
+
+    def _backoff(self, retries: int) -> float:
+        delay = min(self.max_backoff_seconds, self.base_backoff_seconds * 2**retries)
+        return delay * (0.5 + random.random() / 2)
+
+
+def _retry_after_seconds(exc: Exception) -> float | None:
+    if not isinstance(exc, APIStatusError):
+        return None
+    headers = exc.response.headers if exc.response is not None else {}
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            return None
+    return None
@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from functools import lru_cache
+import logging
+import math
+from typing import Any
+
+_CHARS_PER_TOKEN = 3
+logger = logging.getLogger(__name__)
+_DEFAULT_MAX_INPUT_TOKENS = 8191
+_MODEL_MAX_INPUT_TOKENS = {
+    "text-embedding-3-small": 8191,
+    "text-embedding-3-large": 8191,
+    "text-embedding-ada-002": 8191,
+}
+
+
+@dataclass(frozen=True)
+class TokenBatch:
+    texts: list[str]
+    tokens: int
+
+
+class TokenCounter:
+    def __init__(self, model: str) -> None:
+        self.encoder = get_token_encoder(model)
+
+    def count(self, text: str) -> int:
+        if self.encoder:
+            return len(self.encoder.encode(text))
+        return max(1, math.ceil(len(text) / _CHARS_PER_TOKEN))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        if self.encoder:
+            return self.encoder.decode(self.encoder.encode(text)[:max_tokens])
+        return text[: max_tokens * _CHARS_PER_TOKEN]
+
+
+@lru_cache
+def get_token_encoder(model: str) -> Any | None:
+    try:
+        import tiktoken  # type: ignore
+    except ModuleNotFoundError:
+        logger.warning(
+            "tiktoken is not installed; estimating %s tokens as %s characters "
+            "each, which can undercount UUID, JSON and non-English text",
+            model,
+            _CHARS_PER_TOKEN,
+        )
+        return None
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def max_input_tokens_for(model: str) -> int:
+    return _MODEL_MAX_INPUT_TOKENS.get(model, _DEFAULT_MAX_INPUT_TOKENS)
+
+
+def pack_batches(
+    items: list[tuple[str, int]], max_tokens: int, max_items: int
+) -> list[TokenBatch]:
+    batches: list[TokenBatch] = []
+    texts: list[str] = []
+    total = 0
+    for text, tokens in items:
+        if texts and (total + tokens > max_tokens or len(texts) >= max_items):
+            batches.append(TokenBatch(texts=texts, tokens=total))
+            texts, total = [], 0
+        texts.append(text)
+        total += tokens
+    if texts:
+        batches.append(TokenBatch(texts=texts, tokens=total))
+    return batches
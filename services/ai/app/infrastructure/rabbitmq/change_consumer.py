@@ -0,0 +1,261 @@
+from collections.abc import Callable
+from datetime import datetime
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any
+
+import pika
+from pika.exceptions import AMQPError
+
+from ...application.ports.sources import AuditRecord
+from ...application.use_cases.index_changes import EntityChange
+from ...core.config import Settings
+from ...domain.source import SourceType
+
+_POLL_SECONDS = 0.5
+_MAX_BACKOFF_SECONDS = 30.0
+_ROUTING_KEYS = ("user.*", "role.*", "audit.log.recorded")
+_ENTITY_EVENTS = {
+    "UserCreated": (SourceType.users, "userId", False),
+    "UserUpdated": (SourceType.users, "userId", False),
+    "UserDeleted": (SourceType.users, "userId", True),
+    "RoleCreated": (SourceType.roles, "roleId", False),
+    "RoleUpdated": (SourceType.roles, "roleId", False),
+    "RoleDeleted": (SourceType.roles, "roleId", True),
+}
+_AUDIT_LOG_RECORDED = "AuditLogRecorded"
+_DEAD_LETTER_SUFFIX = ".dead"
+_KNOWLEDGE_EVENTS = frozenset(
+    {"RoleCreated", "RoleUpdated", "RoleDeleted", "AiIndexUpdated", "AiIngested"}
+)
+
+
+class RabbitMqChangeConsumer:
+    def __init__(
+        self,
+        settings: Settings,
+        handler: Callable[[list[Any]], Any],
+        connect: Callable[[], Any] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        queue: str | None = None,
+        routing_keys: tuple[str, ...] = _ROUTING_KEYS,
+        parse: Callable[[bytes], Any] | None = None,
+    ) -> None:
+        self.settings = settings
+        self.queue = settings.index_queue if queue is None else queue
+        self.routing_keys = routing_keys
+        self.handler = handler
+        self.parse = parse or parse_change
+        self.connect = connect or (
+            lambda: pika.BlockingConnection(pika.URLParameters(settings.rabbitmq_url))
+        )
+        self.clock = clock
+        self.sleep = sleep
+        self.batch_size = max(1, settings.index_batch_size)
+        self.max_attempts = max(1, settings.index_max_attempts)
+        self.logger = logging.getLogger(__name__)
+        self._stop = threading.Event()
+        self._failures = 0
+        self._attempts: dict[str, int] = {}
+
+    def run(self) -> None:
+        attempt = 0
+        while not self._stop.is_set():
+            try:
+                connection = self.connect()
+            except AMQPError as exc:
+                attempt += 1
+                delay = min(_MAX_BACKOFF_SECONDS, 2.0**attempt)
+                self.logger.warning(
+                    "RabbitMQ connection failed (attempt %s); retrying in %ss",
+                    attempt,
+                    delay,
+                    exc_info=exc,
+                )
+                self.sleep(delay)
+                continue
+
+            attempt = 0
+            try:
+                channel = connection.channel()
+                queue = self._declare(channel)
+                self.logger.info("Change consumer connected to %s", queue)
+                self.consume(channel, queue)
+            except AMQPError as exc:
+                self.logger.warning("Change consumer disconnected", exc_info=exc)
+            finally:
+                if connection.is_open:
+                    connection.close()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def consume(self, channel: Any, queue: str | None = None) -> None:
+        pending: list[tuple[int, bytes]] = []
+        deadline: float | None = None
+        for method, _, body in channel.consume(
+            queue or self.queue, inactivity_timeout=_POLL_SECONDS
+        ):
+            if method is not None:
+                pending.append((method.delivery_tag, body))
+                if deadline is None:
+                    deadline = self.clock() + self.settings.index_batch_window_seconds
+            if pending and (
+                len(pending) >= self.batch_size or self.clock() >= deadline
+            ):
+                self._flush(channel, pending)
+                pending, deadline = [], None
+            if self._stop.is_set():
+                break
+        if pending:
+            self._flush(channel, pending)
+        channel.cancel()
+
+    def _declare(self, channel: Any) -> str:
+        channel.exchange_declare(
+            exchange=self.settings.rabbitmq_exchange,
+            exchange_type="topic",
+            durable=True,
+        )
+        queue = self.queue
+        if queue:
+            dead_letter = f"{queue}{_DEAD_LETTER_SUFFIX}"
+            channel.exchange_declare(
+                exchange=dead_letter, exchange_type="fanout", durable=True
+            )
+            channel.queue_declare(queue=dead_letter, durable=True)
+            channel.queue_bind(queue=dead_letter, exchange=dead_letter, routing_key="")
+            channel.queue_declare(
+                queue=queue,
+                durable=True,
+                arguments={"x-dead-letter-exchange": dead_letter},
+            )
+        else:
+            queue = channel.queue_declare(queue="", exclusive=True).method.queue
+        for routing_key in self.routing_keys:
+            channel.queue_bind(
+                queue=queue,
+                exchange=self.settings.rabbitmq_exchange,
+                routing_key=routing_key,
+            )
+        channel.basic_qos(prefetch_count=self.batch_size)
+        return queue
+
+    def _flush(self, channel: Any, pending: list[tuple[int, bytes]]) -> None:
+        parsed: list[tuple[int, bytes, Any]] = []
+        for tag, body in pending:
+            try:
+                change = self.parse(body)
+            except (ValueError, TypeError, AttributeError) as exc:
+                self.logger.warning("Dropping malformed change event", exc_info=exc)
+                continue
+            if change:
+                parsed.append((tag, body, change))
+
+        last_tag = pending[-1][0]
+        try:
+            if parsed:
+                self.handler([change for _, _, change in parsed])
+        except Exception as exc:
+            self._failures += 1
+            delay = min(_MAX_BACKOFF_SECONDS, 2.0**self._failures)
+            self.logger.warning(
+                "Indexing %s changes failed; retrying each and requeueing in %ss",
+                len(parsed),
+                delay,
+                exc_info=exc,
+            )
+            self._settle_each(channel, pending, parsed)
+            self.sleep(delay)
+            return
+
+        self._failures = 0
+        for _, body, _ in parsed:
+            self._attempts.pop(_digest(body), None)
+        channel.basic_ack(delivery_tag=last_tag, multiple=True)
+
+    def _settle_each(
+        self,
+        channel: Any,
+        pending: list[tuple[int, bytes]],
+        parsed: list[tuple[int, bytes, Any]],
+    ) -> None:
+        changes = {tag: (body, change) for tag, body, change in parsed}
+        for tag, _ in pending:
+            if tag not in changes:
+                channel.basic_ack(delivery_tag=tag, multiple=False)
+                continue
+            body, change = changes[tag]
+            key = _digest(body)
+            if len(parsed) > 1 and self._handle_one(change):
+                self._attempts.pop(key, None)
+                channel.basic_ack(delivery_tag=tag, multiple=False)
+                continue
+            attempts = self._attempts.get(key, 0) + 1
+            if attempts < self.max_attempts:
+                self._attempts[key] = attempts
+                channel.basic_nack(delivery_tag=tag, multiple=False, requeue=True)
+                continue
+            self._attempts.pop(key, None)
+            self.logger.error(
+                "Dead-lettering change %r after %s attempts", change, attempts
+            )
+            channel.basic_nack(delivery_tag=tag, multiple=False, requeue=False)
+
+    def _handle_one(self, change: Any) -> bool:
+        try:
+            self.handler([change])
+        except Exception as exc:
+            self.logger.warning("Indexing change %r failed", change, exc_info=exc)
+            return False
+        return True
+
+
+def parse_change(body: bytes) -> EntityChange | None:
+    envelope = json.loads(body)
+    name = envelope.get("name")
+    payload = envelope.get("payload") or {}
+    if name in _ENTITY_EVENTS:
+        source, id_key, deleted = _ENTITY_EVENTS[name]
+        entity_id = payload.get(id_key)
+        if not entity_id:
+            return None
+        return EntityChange(source=source, entity_id=str(entity_id), deleted=deleted)
+    if name == _AUDIT_LOG_RECORDED and payload.get("auditId"):
+        audit_id = str(payload["auditId"])
+        return EntityChange(
+            source=SourceType.audit,
+            entity_id=audit_id,
+            audit=AuditRecord(
+                audit_id=audit_id,
+                action=str(payload.get("action")),
+                resource=str(payload.get("resource")),
+                actor_id=payload.get("actorId"),
+                actor_role=payload.get("actorRole"),
+                occurred_at=_parse_datetime(payload.get("occurredAt")),
+                metadata=None,
+            ),
+        )
+    return None
+
+
+def parse_knowledge_event(body: bytes) -> str | None:
+    name = json.loads(body).get("name")
+    return name if name in _KNOWLEDGE_EVENTS else None
+
+
+def _digest(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+def _parse_datetime(value: Any) -> datetime | None:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
@@ -1,13 +1,22 @@
+from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime, timezone
 import json
 import logging
+import queue
+import threading
+from typing import Any
 
 import pika
+from pika.exceptions import AMQPError, NackError, UnroutableError
 
 from ...application.ports.event_bus import EventBus
 from ...core.config import Settings
 
+_POLL_SECONDS = 0.5
+_MAX_BACKOFF_SECONDS = 30.0
+_BLOCK_POLICY = "block"
+
 
 @dataclass(frozen=True)
 class EventEnvelope:
@@ -16,10 +25,36 @@ class EventEnvelope:
     payload: dict
 
 
+@dataclass(frozen=True)
+class _OutgoingEvent:
+    name: str
+    routing_key: str
+    body: str
+
+
 class RabbitMqEventBus(EventBus):
-    def __init__(self, settings: Settings) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        connect: Callable[[], Any] | None = None,
+        wait: Callable[[float], Any] | None = None,
+    ) -> None:
         self.settings = settings
+        self.connect = connect or (
+            lambda: pika.BlockingConnection(pika.URLParameters(settings.rabbitmq_url))
+        )
+        self.max_attempts = max(1, settings.event_max_publish_attempts)
         self.logger = logging.getLogger(__name__)
+        self.queue: queue.Queue[_OutgoingEvent] = queue.Queue(
+            maxsize=max(1, settings.event_queue_size)
+        )
+        self.dropped = 0
+        self._stop = threading.Event()
+        self.wait = wait or self._stop.wait
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._connection: Any = None
+        self._channel: Any = None
 
     def publish(self, name: str, payload: dict) -> None:
         envelope = EventEnvelope(
@@ -27,32 +62,147 @@ class RabbitMqEventBus(EventBus):
             occurred_at=datetime.now(timezone.utc).isoformat(),
             payload=payload,
         )
+        event = _OutgoingEvent(
+            name=name,
+            routing_key=_to_routing_key(name),
+            body=json.dumps(
+                {
+                    "name": envelope.name,
+                    "occurredAt": envelope.occurred_at,
+                    "payload": envelope.payload,
+                }
+            ),
+        )
+        if not self.start():
+            self._drop(event, "publisher is closed")
+            return
+        block = self.settings.event_queue_full_policy == _BLOCK_POLICY
         try:
-            connection = pika.BlockingConnection(
-                pika.URLParameters(self.settings.rabbitmq_url)
-            )
-            channel = connection.channel()
-            channel.exchange_declare(
-                exchange=self.settings.rabbitmq_exchange,
-                exchange_type="topic",
-                durable=True,
+            self.queue.put(
+                event,
+                block=block,
+                timeout=self.settings.event_publish_block_seconds if block else None,
             )
-            channel.basic_publish(
-                exchange=self.settings.rabbitmq_exchange,
-                routing_key=_to_routing_key(name),
-                body=json.dumps(
-                    {
-                        "name": envelope.name,
-                        "occurredAt": envelope.occurred_at,
-                        "payload": envelope.payload,
-                    }
-                ),
-                properties=pika.BasicProperties(content_type="application/json"),
-            )
-            channel.close()
+        except queue.Full:
+            self._drop(event, "queue is full")
+
+    def start(self) -> bool:
+        with self._lock:
+            if self._stop.is_set():
+                return False
+            if not self._thread or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="event-publisher", daemon=True
+                )
+                self._thread.start()
+            return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            self._stop.set()
+            thread = self._thread
+        if thread:
+            thread.join(timeout)
+            if thread.is_alive():
+                self.logger.warning("Event publisher did not drain before shutdown")
+                return
+        self._disconnect()
+
+    def _run(self) -> None:
+        pending: _OutgoingEvent | None = None
+        attempt = 0
+        rejections = 0
+        while True:
+            if pending is None:
+                pending = self._take()
+                if pending is None:
+                    if self._stop.is_set():
+                        return
+                    self._keep_alive()
+                    continue
+            try:
+                self._publish(pending)
+                pending, attempt, rejections = None, 0, 0
+            except AMQPError as exc:
+                self._disconnect()
+                if isinstance(exc, (NackError, UnroutableError)):
+                    rejections += 1
+                    if rejections >= self.max_attempts:
+                        self._drop(pending, f"broker rejected it {rejections} times")
+                        pending, rejections = None, 0
+                        continue
+                if self._stop.is_set():
+                    self.logger.warning(
+                        "Dropping %s unpublished events on shutdown",
+                        1 + self.queue.qsize(),
+                        exc_info=exc,
+                    )
+                    return
+                attempt += 1
+                delay = min(_MAX_BACKOFF_SECONDS, 2.0**attempt)
+                self.logger.warning(
+                    "Publishing %s failed; retrying in %ss",
+                    pending.name,
+                    delay,
+                    exc_info=exc,
+                )
+                self.wait(delay)
+
+    def _take(self) -> _OutgoingEvent | None:
+        try:
+            return self.queue.get(timeout=_POLL_SECONDS)
+        except queue.Empty:
+            return None
+
+    def _keep_alive(self) -> None:
+        connection = self._connection
+        if connection is None or not connection.is_open:
+            return
+        try:
+            connection.process_data_events(time_limit=0)
+        except AMQPError as exc:
+            self.logger.info("Idle RabbitMQ publisher connection dropped", exc_info=exc)
+            self._disconnect()
+
+    def _publish(self, event: _OutgoingEvent) -> None:
+        self._ensure_channel().basic_publish(
+            exchange=self.settings.rabbitmq_exchange,
+            routing_key=event.routing_key,
+            body=event.body,
+            properties=pika.BasicProperties(
+                content_type="application/json",
+                delivery_mode=pika.DeliveryMode.Persistent,
+            ),
+        )
+
+    def _ensure_channel(self) -> Any:
+        if self._channel is not None and self._channel.is_open:
+            return self._channel
+        self._disconnect()
+        self._connection = self.connect()
+        channel = self._connection.channel()
+        channel.exchange_declare(
+            exchange=self.settings.rabbitmq_exchange,
+            exchange_type="topic",
+            durable=True,
+        )
+        channel.confirm_delivery()
+        self._channel = channel
+        return channel
+
+    def _disconnect(self) -> None:
+        connection, self._connection, self._channel = self._connection, None, None
+        if connection is None or not connection.is_open:
+            return
+        try:
             connection.close()
-        except Exception as exc:  # pragma: no cover
-            self.logger.warning("RabbitMQ publish failed", exc_info=exc)
+        except AMQPError as exc:
+            self.logger.debug("RabbitMQ connection close failed", exc_info=exc)
+
+    def _drop(self, event: _OutgoingEvent, reason: str) -> None:
+        with self._lock:
+            self.dropped += 1
+        self.logger.warning("Dropping %s event: %s", event.name, reason)
 
 
 def _to_routing_key(name: str) -> str:
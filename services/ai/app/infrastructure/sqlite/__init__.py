@@ -0,0 +1 @@
+"""SQLite stores."""
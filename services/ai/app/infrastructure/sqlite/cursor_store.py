@@ -0,0 +1,116 @@
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import sqlite3
+import threading
+import time
+
+from ...application.ports.cursor_store import CursorStore
+from ...domain.source import SourceCursor, SourceType
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class SqliteCursorStore(CursorStore):
+    def __init__(self, path: str) -> None:
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS cursors ("
+            "source TEXT PRIMARY KEY, "
+            "cursor TEXT NOT NULL, "
+            "cursor_us INTEGER NOT NULL, "
+            "cursor_key TEXT NOT NULL DEFAULT '', "
+            "updated_at REAL NOT NULL)"
+        )
+        columns = {
+            row[1] for row in self._connection.execute("PRAGMA table_info(cursors)")
+        }
+        if "cursor_key" not in columns:
+            self._connection.execute(
+                "ALTER TABLE cursors ADD COLUMN cursor_key TEXT NOT NULL DEFAULT ''"
+            )
+
+    def get_cursor(self, source: SourceType) -> SourceCursor | None:
+        return self.get_cursors([source]).get(source)
+
+    def get_cursors(
+        self, sources: Iterable[SourceType]
+    ) -> dict[SourceType, SourceCursor]:
+        wanted = [source.value for source in dict.fromkeys(sources)]
+        if not wanted:
+            return {}
+        with self._lock:
+            return self._select(wanted)
+
+    def set_cursor(self, source: SourceType, cursor: SourceCursor) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cursors "
+                "(source, cursor, cursor_us, cursor_key, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                _row(source, cursor),
+            )
+
+    def advance_cursors(
+        self, cursors: dict[SourceType, SourceCursor]
+    ) -> dict[SourceType, SourceCursor]:
+        if not cursors:
+            return {}
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.executemany(
+                    "INSERT INTO cursors "
+                    "(source, cursor, cursor_us, cursor_key, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(source) DO UPDATE SET "
+                    "cursor = excluded.cursor, "
+                    "cursor_us = excluded.cursor_us, "
+                    "cursor_key = excluded.cursor_key, "
+                    "updated_at = excluded.updated_at "
+                    "WHERE (excluded.cursor_us, excluded.cursor_key) "
+                    "> (cursors.cursor_us, cursors.cursor_key)",
+                    [_row(source, cursor) for source, cursor in cursors.items()],
+                )
+                stored = self._select([source.value for source in cursors])
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+        return stored
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _select(self, sources: list[str]) -> dict[SourceType, SourceCursor]:
+        placeholders = ",".join("?" for _ in sources)
+        rows = self._connection.execute(
+            "SELECT source, cursor, cursor_key FROM cursors "
+            f"WHERE source IN ({placeholders})",
+            sources,
+        ).fetchall()
+        return {
+            SourceType(source): SourceCursor(datetime.fromisoformat(value), key)
+            for source, value, key in rows
+        }
+
+
+def _row(source: SourceType, cursor: SourceCursor) -> tuple[str, str, int, str, float]:
+    timestamp = cursor.timestamp
+    aware = timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=timezone.utc)
+    return (
+        source.value,
+        aware.isoformat(),
+        (aware - _EPOCH) // _MICROSECOND,
+        cursor.key,
+        time.time(),
+    )
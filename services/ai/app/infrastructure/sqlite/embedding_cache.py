@@ -0,0 +1,148 @@
+from array import array
+from dataclasses import dataclass
+import hashlib
+from pathlib import Path
+import sqlite3
+import threading
+import time
+
+from ...application.ports.embeddings import EmbeddingClient
+
+_SQL_BATCH_SIZE = 500
+
+
+@dataclass(frozen=True)
+class EmbeddingCacheStats:
+    hits: int
+    misses: int
+    entries: int
+
+
+class SqliteEmbeddingCache(EmbeddingClient):
+    def __init__(
+        self,
+        inner: EmbeddingClient,
+        model: str,
+        path: str,
+        max_entries: int,
+    ) -> None:
+        self.inner = inner
+        self.model = model
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model TEXT NOT NULL, "
+            "text_hash TEXT NOT NULL, "
+            "embedding BLOB NOT NULL, "
+            "last_used REAL NOT NULL, "
+            "PRIMARY KEY (model, text_hash))"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)"
+        )
+
+    def embed_texts(self, inputs: list[str]) -> list[list[float]]:
+        hashes = [_text_hash(text) for text in inputs]
+        unique: dict[str, str] = {}
+        for text_hash, text in zip(hashes, inputs):
+            unique.setdefault(text_hash, text)
+
+        found = self._load(list(unique))
+        missing = [text_hash for text_hash in unique if text_hash not in found]
+
+        if missing:
+            fresh = self.inner.embed_texts([unique[text_hash] for text_hash in missing])
+            computed = dict(zip(missing, fresh))
+            self._store(computed)
+            found.update(computed)
+
+        return [list(found[text_hash]) for text_hash in hashes]
+
+    def stats(self) -> EmbeddingCacheStats:
+        with self._lock:
+            row = self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            return EmbeddingCacheStats(
+                hits=self.hits, misses=self.misses, entries=row[0]
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _load(self, text_hashes: list[str]) -> dict[str, list[float]]:
+        found: dict[str, list[float]] = {}
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(text_hashes), _SQL_BATCH_SIZE):
+                batch = text_hashes[start : start + _SQL_BATCH_SIZE]
+                placeholders = ",".join("?" for _ in batch)
+                rows = self._connection.execute(
+                    "SELECT text_hash, embedding FROM embeddings "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    [self.model, *batch],
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = _decode(blob)
+                if rows:
+                    self._connection.execute(
+                        "UPDATE embeddings SET last_used = ? "
+                        f"WHERE model = ? AND text_hash IN ({placeholders})",
+                        [now, self.model, *batch],
+                    )
+            self.hits += len(found)
+            self.misses += len(text_hashes) - len(found)
+        return found
+
+    def _store(self, embeddings: dict[str, list[float]]) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO embeddings "
+                    "(model, text_hash, embedding, last_used) VALUES (?, ?, ?, ?)",
+                    [
+                        (self.model, text_hash, _encode(vector), now)
+                        for text_hash, vector in embeddings.items()
+                    ],
+                )
+                self._evict()
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    def _evict(self) -> None:
+        count = self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+        self._connection.execute(
+            "DELETE FROM embeddings WHERE rowid IN ("
+            "SELECT rowid FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+            (overflow,),
+        )
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _encode(vector: list[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _decode(blob: bytes) -> list[float]:
+    values = array("f")
+    values.frombytes(blob)
+    return values.tolist()
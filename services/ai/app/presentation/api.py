@@ -1,24 +1,64 @@
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+import json
+import logging
+from typing import Any
+
 from fastapi import Depends, FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
+from ..application.ingest_jobs import IngestJob, IngestJobManager, IngestJobRequest
+from ..application.ports.vector_store import DocumentFilter, RetrievedDocument
+from ..application.use_cases.ingest_embeddings import IngestResult
+from ..application.use_cases.query_agent import QueryMetrics, QueryStreamEvent
+from ..domain.source import SourceType
+from .container import ServiceContainer
 from .dependencies import (
     AuthContext,
     get_auth_context,
+    get_ingest_job_manager,
     get_ingest_use_case,
+    get_query_metrics,
     get_query_use_case,
+    get_settings,
     get_sources_or_default,
     require_create_permission,
 )
 from .schemas import (
+    AnswerCacheMetricsResponse,
+    CoalescingMetricsResponse,
+    EmbeddingCacheMetricsResponse,
+    IngestJobResponse,
     IngestRequest,
     IngestResponse,
+    QueryMetricsResponse,
     QueryRequest,
     QueryResponse,
     QuerySource,
+    SourceProgressResponse,
+    StageMetricsResponse,
 )
 
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    container = ServiceContainer(get_settings())
+    await run_in_threadpool(container.warm_up)
+    await container.awarm_up()
+    app.state.container = container
+    try:
+        yield
+    finally:
+        await run_in_threadpool(container.close)
+        await container.aclose()
+
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="AI Service")
+    app = FastAPI(title="AI Service", lifespan=lifespan)
 
     @app.get("/")
     def health() -> dict[str, str]:
@@ -35,6 +75,8 @@ def create_app() -> FastAPI:
                 sources=get_sources_or_default(payload.sources),
                 access_token=auth.token,
                 max_items=payload.max_items,
+                full=payload.full,
+                reconcile=payload.reconcile,
                 actor_id=auth.claims.sub,
                 actor_role=auth.claims.role,
             )
@@ -43,35 +85,234 @@ def create_app() -> FastAPI:
         except ValueError as exc:
             raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-        return IngestResponse(ingested=result.ingested, cursors=result.cursors)
+        return _to_ingest_response(result)
+
+    @app.post("/ingest/jobs", response_model=IngestJobResponse, status_code=202)
+    def enqueue_ingest_job(
+        payload: IngestRequest,
+        auth: AuthContext = Depends(require_create_permission),
+        jobs: IngestJobManager = Depends(get_ingest_job_manager),
+    ) -> IngestJobResponse:
+        job = jobs.submit(
+            IngestJobRequest(
+                sources=get_sources_or_default(payload.sources),
+                access_token=auth.token,
+                max_items=payload.max_items,
+                full=payload.full,
+                reconcile=payload.reconcile,
+                actor_id=auth.claims.sub,
+                actor_role=auth.claims.role,
+                token_expires_at=auth.claims.expires_at,
+            )
+        )
+        return _to_job_response(job)
+
+    @app.get("/ingest/jobs/{job_id}", response_model=IngestJobResponse)
+    def get_ingest_job(
+        job_id: str,
+        auth: AuthContext = Depends(require_create_permission),
+        jobs: IngestJobManager = Depends(get_ingest_job_manager),
+    ) -> IngestJobResponse:
+        job = jobs.get(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Ingest job not found")
+        return _to_job_response(job)
 
     @app.post("/query", response_model=QueryResponse)
-    def query_agent(
+    async def query_agent(
         payload: QueryRequest,
         auth: AuthContext = Depends(get_auth_context),
         use_case=Depends(get_query_use_case),
     ) -> QueryResponse:
         try:
-            result = use_case.execute(
+            result = await use_case.execute(
                 payload.question,
                 payload.top_k,
                 actor_id=auth.claims.sub,
                 actor_role=auth.claims.role,
+                where=_to_filter(payload),
             )
         except RuntimeError as exc:
             raise HTTPException(status_code=502, detail=str(exc)) from exc
         except ValueError as exc:
             raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-        sources = [
-            QuerySource(
-                doc_id=doc.doc_id,
-                source=str(doc.metadata.get("source")) if doc.metadata else None,
-                metadata=doc.metadata,
-                distance=doc.distance,
-            )
-            for doc in result.sources
-        ]
+        sources = [_to_query_source(doc) for doc in result.sources]
         return QueryResponse(answer=result.answer, sources=sources)
 
+    @app.post("/query/stream")
+    async def stream_query_agent(
+        payload: QueryRequest,
+        auth: AuthContext = Depends(get_auth_context),
+        use_case=Depends(get_query_use_case),
+    ) -> StreamingResponse:
+        events = use_case.stream(
+            payload.question,
+            payload.top_k,
+            actor_id=auth.claims.sub,
+            actor_role=auth.claims.role,
+            where=_to_filter(payload),
+        )
+        try:
+            first = await anext(events)
+        except RuntimeError as exc:
+            raise HTTPException(status_code=502, detail=str(exc)) from exc
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+        return StreamingResponse(
+            _sse_stream(first, events),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.get("/query/metrics", response_model=QueryMetricsResponse)
+    def query_metrics(
+        auth: AuthContext = Depends(get_auth_context),
+        metrics: QueryMetrics = Depends(get_query_metrics),
+    ) -> QueryMetricsResponse:
+        return _to_metrics_response(metrics)
+
     return app
+
+
+def _to_filter(payload: QueryRequest) -> DocumentFilter | None:
+    fields = payload.filters.model_dump(exclude_none=True) if payload.filters else {}
+    if not payload.sources and not fields:
+        return None
+    requested = set(payload.sources or [])
+    return DocumentFilter(
+        sources=tuple(source.value for source in SourceType if source in requested),
+        fields=tuple(sorted(fields.items())),
+    )
+
+
+def _to_metrics_response(metrics: QueryMetrics) -> QueryMetricsResponse:
+    coalescing = metrics.coalescing
+    answers = metrics.answer_cache
+    embeddings = metrics.embedding_cache
+    return QueryMetricsResponse(
+        coalescing=CoalescingMetricsResponse(
+            leaders=coalescing.leaders,
+            followers=coalescing.followers,
+            in_flight=coalescing.in_flight,
+            coalesced_ratio=coalescing.coalesced_ratio,
+        )
+        if coalescing
+        else None,
+        answer_cache=AnswerCacheMetricsResponse(
+            hits=answers.hits,
+            semantic_hits=answers.semantic_hits,
+            misses=answers.misses,
+            entries=answers.entries,
+        )
+        if answers
+        else None,
+        embedding_cache=EmbeddingCacheMetricsResponse(
+            hits=embeddings.hits,
+            misses=embeddings.misses,
+            entries=embeddings.entries,
+            bytes_used=embeddings.bytes_used,
+        )
+        if embeddings
+        else None,
+    )
+
+
+def _to_query_source(doc: RetrievedDocument) -> QuerySource:
+    return QuerySource(
+        doc_id=doc.doc_id,
+        source=str(doc.metadata.get("source")) if doc.metadata else None,
+        metadata=doc.metadata,
+        distance=doc.distance,
+    )
+
+
+async def _sse_stream(
+    first: QueryStreamEvent, events: AsyncGenerator[QueryStreamEvent, None]
+) -> AsyncIterator[str]:
+    yield _sse(first)
+    try:
+        async for event in events:
+            yield _sse(event)
+    except (RuntimeError, ValueError) as exc:
+        logger.warning("Query stream failed: %s", exc)
+        yield _sse_message("error", {"detail": str(exc)})
+    finally:
+        await events.aclose()
+
+
+def _sse(event: QueryStreamEvent) -> str:
+    if event.event == "sources":
+        data: dict[str, Any] = {
+            "sources": [
+                _to_query_source(doc).model_dump() for doc in event.sources
+            ],
+            "cached": event.cached,
+        }
+    elif event.event == "token":
+        data = {"text": event.text}
+    else:
+        data = {
+            "usage": asdict(event.usage) if event.usage else None,
+            "timings": event.timings,
+            "cached": event.cached,
+        }
+    return _sse_message(event.event, data)
+
+
+def _sse_message(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _to_ingest_response(result: IngestResult) -> IngestResponse:
+    return IngestResponse(
+        ingested=result.ingested,
+        embedded=result.embedded,
+        unchanged=result.unchanged,
+        skipped=result.skipped,
+        cursors=result.cursors,
+        errors=result.errors,
+        deleted=result.deleted,
+        pipeline={
+            source: [
+                StageMetricsResponse(
+                    name=stage.name,
+                    chunks=stage.chunks,
+                    items=stage.items,
+                    busy_seconds=stage.busy_seconds,
+                    items_per_second=stage.items_per_second,
+                    max_queue_depth=stage.max_queue_depth,
+                )
+                for stage in stages
+            ]
+            for source, stages in result.pipeline.items()
+        },
+    )
+
+
+def _to_job_response(job: IngestJob) -> IngestJobResponse:
+    duration = None
+    if job.started_at and job.finished_at:
+        duration = (job.finished_at - job.started_at).total_seconds()
+    return IngestJobResponse(
+        job_id=job.job_id,
+        status=job.status,
+        sources=job.sources,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        duration_seconds=duration,
+        progress={
+            source: SourceProgressResponse(
+                fetched=progress.fetched,
+                embedded=progress.embedded,
+                upserted=progress.upserted,
+                started_at=progress.started_at,
+                updated_at=progress.updated_at,
+            )
+            for source, progress in job.progress.items()
+        },
+        result=_to_ingest_response(job.result) if job.result else None,
+        error=job.error,
+    )
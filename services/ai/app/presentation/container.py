@@ -0,0 +1,290 @@
+from functools import cached_property
+import logging
+import threading
+
+from chromadb.api import ClientAPI
+from openai import AsyncOpenAI, OpenAI
+
+from ..application.answer_cache import AnswerCache, KnowledgeGeneration
+from ..application.ingest_jobs import IngestJobManager, IngestJobRequest
+from ..application.ports.cursor_store import CursorStore
+from ..application.ports.embeddings import (
+    AsyncChatClient,
+    AsyncEmbeddingClient,
+    EmbeddingClient,
+)
+from ..application.query_embedding_cache import AsyncQueryEmbeddingCache
+from ..application.query_router import route_question
+from ..application.role_cache import RoleAbilitiesCache
+from ..application.single_flight import SingleFlight
+from ..application.use_cases.index_changes import IndexChangesUseCase
+from ..application.use_cases.ingest_embeddings import (
+    IngestEmbeddingsUseCase,
+    IngestPipelineConfig,
+    IngestProgress,
+    IngestResult,
+)
+from ..application.use_cases.query_agent import (
+    QueryAgentUseCase,
+    QueryMetrics,
+    QueryResult,
+)
+from ..core.config import Settings
+from ..infrastructure.auth.jwt_verifier import JwtAccessTokenVerifier
+from ..infrastructure.chroma.client import build_chroma_client
+from ..infrastructure.chroma.cursor_store import ChromaCursorStore
+from ..infrastructure.chroma.vector_store import (
+    AsyncChromaVectorStore,
+    ChromaVectorStore,
+)
+from ..infrastructure.http.pool import build_http_client
+from ..infrastructure.http.response_cache import ConditionalResponseCache
+from ..infrastructure.http.service_clients import (
+    AuditServiceClient,
+    InternalRoleClient,
+    InternalUserClient,
+    RoleServiceClient,
+    UserServiceClient,
+)
+from ..infrastructure.openai.client import (
+    AsyncOpenAIChatClient,
+    AsyncOpenAIEmbeddingClient,
+    OpenAIEmbeddingClient,
+)
+from ..infrastructure.rabbitmq.change_consumer import (
+    RabbitMqChangeConsumer,
+    parse_knowledge_event,
+)
+from ..infrastructure.rabbitmq.event_bus import RabbitMqEventBus
+from ..infrastructure.sqlite.cursor_store import SqliteCursorStore
+from ..infrastructure.sqlite.embedding_cache import SqliteEmbeddingCache
+
+_WARM_UP = ("vector_store", "cursor_store", "embeddings", "query_embeddings", "chat")
+_ROLE_CACHE_EVENTS = ("role.*",)
+_ANSWER_CACHE_EVENTS = ("ai.index.updated", "ai.ingested")
+_ROLE_EVENTS = ("RoleCreated", "RoleUpdated", "RoleDeleted")
+_SQLITE_CURSORS = "sqlite"
+
+
+class ServiceContainer:
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+        self.logger = logging.getLogger(__name__)
+        self.http = build_http_client(settings)
+        self.token_verifier = JwtAccessTokenVerifier(settings)
+        self.openai = (
+            OpenAI(api_key=settings.openai_api_key)
+            if settings.openai_api_key
+            else None
+        )
+        self.async_openai = (
+            AsyncOpenAI(api_key=settings.openai_api_key)
+            if settings.openai_api_key
+            else None
+        )
+        self.response_cache = (
+            ConditionalResponseCache(settings.source_response_cache_entries)
+            if settings.source_response_cache_entries > 0
+            else None
+        )
+        self.event_bus = RabbitMqEventBus(settings)
+        self.users = UserServiceClient(settings, self.response_cache, self.http)
+        self.roles = RoleServiceClient(settings, self.response_cache, self.http)
+        self.audit = AuditServiceClient(settings, self.http)
+        self.role_abilities = RoleAbilitiesCache(
+            self.roles,
+            ttl_seconds=settings.role_cache_ttl_seconds,
+            stale_seconds=settings.role_cache_stale_seconds,
+            miss_refetch_seconds=settings.role_cache_miss_refetch_seconds,
+        )
+        self.generation = KnowledgeGeneration()
+        self.answers: AnswerCache[QueryResult] | None = (
+            AnswerCache(
+                max_entries=settings.answer_cache_entries,
+                ttl_seconds=settings.answer_cache_ttl_seconds,
+                similarity_threshold=settings.answer_cache_similarity,
+            )
+            if settings.answer_cache_entries > 0
+            else None
+        )
+        self.inflight: SingleFlight | None = (
+            SingleFlight() if settings.query_coalescing_enabled else None
+        )
+        routing_keys = (
+            _ROLE_CACHE_EVENTS if settings.role_cache_events_enabled else ()
+        ) + (_ANSWER_CACHE_EVENTS if self.answers else ())
+        self.change_events = (
+            RabbitMqChangeConsumer(
+                settings,
+                self._on_changes,
+                queue="",
+                routing_keys=routing_keys,
+                parse=parse_knowledge_event,
+            )
+            if routing_keys
+            else None
+        )
+        self.jobs = IngestJobManager(
+            self._run_job,
+            max_concurrent_jobs=settings.ingest_max_concurrent_jobs,
+            max_retained_jobs=settings.ingest_job_retention,
+        )
+
+    @cached_property
+    def chroma(self) -> ClientAPI:
+        return build_chroma_client(self.settings)
+
+    @cached_property
+    def vector_store(self) -> ChromaVectorStore:
+        return ChromaVectorStore(self.settings, self.chroma)
+
+    @cached_property
+    def query_vector_store(self) -> AsyncChromaVectorStore:
+        return AsyncChromaVectorStore(self.settings)
+
+    @cached_property
+    def cursor_store(self) -> CursorStore:
+        if self.settings.cursor_store_backend == _SQLITE_CURSORS:
+            return SqliteCursorStore(self.settings.cursor_store_path)
+        return ChromaCursorStore(self.settings, self.chroma)
+
+    @cached_property
+    def embeddings(self) -> EmbeddingClient:
+        client = OpenAIEmbeddingClient(self.settings, self.openai)
+        if not self.settings.embedding_cache_path:
+            return client
+        return SqliteEmbeddingCache(
+            client,
+            model=self.settings.openai_embedding_model,
+            path=self.settings.embedding_cache_path,
+            max_entries=self.settings.embedding_cache_max_entries,
+        )
+
+    @cached_property
+    def query_embeddings(self) -> AsyncEmbeddingClient:
+        client = AsyncOpenAIEmbeddingClient(self.settings, self.async_openai)
+        if self.settings.query_embedding_cache_bytes <= 0:
+            return client
+        return AsyncQueryEmbeddingCache(
+            client,
+            model=self.settings.openai_embedding_model,
+            max_bytes=self.settings.query_embedding_cache_bytes,
+        )
+
+    @cached_property
+    def chat(self) -> AsyncChatClient:
+        return AsyncOpenAIChatClient(self.settings, self.async_openai)
+
+    def ingest_use_case(self) -> IngestEmbeddingsUseCase:
+        return IngestEmbeddingsUseCase(
+            users=self.users,
+            roles=self.roles,
+            audit=self.audit,
+            embeddings=self.embeddings,
+            vector_store=self.vector_store,
+            cursor_store=self.cursor_store,
+            event_bus=self.event_bus,
+            concurrency=self.settings.ingest_concurrency,
+            pipeline=IngestPipelineConfig(
+                chunk_size=self.settings.ingest_chunk_size,
+                queue_size=self.settings.ingest_queue_size,
+                render_concurrency=self.settings.ingest_render_concurrency,
+                embed_concurrency=self.settings.ingest_embed_concurrency,
+                upsert_concurrency=self.settings.ingest_upsert_concurrency,
+            ),
+            generation=self.generation,
+        )
+
+    def query_use_case(self) -> QueryAgentUseCase:
+        return QueryAgentUseCase(
+            embeddings=self.query_embeddings,
+            chat=self.chat,
+            vector_store=self.query_vector_store,
+            event_bus=self.event_bus,
+            answers=self.answers,
+            generation=self.generation,
+            inflight=self.inflight,
+            router=route_question if self.settings.query_router_enabled else None,
+        )
+
+    def query_metrics(self) -> QueryMetrics:
+        embeddings = self.__dict__.get("query_embeddings")
+        return QueryMetrics(
+            coalescing=self.inflight.stats() if self.inflight else None,
+            answer_cache=self.answers.stats() if self.answers else None,
+            embedding_cache=(
+                embeddings.stats()
+                if isinstance(embeddings, AsyncQueryEmbeddingCache)
+                else None
+            ),
+        )
+
+    def index_changes_use_case(self) -> IndexChangesUseCase:
+        return IndexChangesUseCase(
+            users=InternalUserClient(self.settings, self.http),
+            roles=InternalRoleClient(self.settings, self.http),
+            embeddings=self.embeddings,
+            vector_store=self.vector_store,
+            event_bus=self.event_bus,
+        )
+
+    def warm_up(self) -> None:
+        self.token_verifier.start()
+        if self.change_events:
+            threading.Thread(
+                target=self.change_events.run, name="change-events", daemon=True
+            ).start()
+        for name in _WARM_UP:
+            try:
+                getattr(self, name)
+            except Exception as exc:
+                self.logger.warning("Could not warm up %s", name, exc_info=exc)
+
+    async def awarm_up(self) -> None:
+        try:
+            await self.query_vector_store._collection()
+        except Exception as exc:
+            self.logger.warning("Could not warm up query_vector_store", exc_info=exc)
+
+    def close(self) -> None:
+        if self.change_events:
+            self.change_events.stop()
+        self.jobs.shutdown(cancel_pending=True)
+        self.event_bus.close()
+        self.token_verifier.close()
+        embeddings = self.__dict__.get("embeddings")
+        if isinstance(embeddings, SqliteEmbeddingCache):
+            embeddings.close()
+        cursor_store = self.__dict__.get("cursor_store")
+        if isinstance(cursor_store, SqliteCursorStore):
+            cursor_store.close()
+        if self.openai:
+            self.openai.close()
+        self.http.close()
+
+    async def aclose(self) -> None:
+        query_vector_store = self.__dict__.get("query_vector_store")
+        if query_vector_store:
+            await query_vector_store.aclose()
+        if self.async_openai:
+            await self.async_openai.close()
+
+    def _on_changes(self, events: list[str]) -> None:
+        if any(event not in _ROLE_EVENTS for event in events):
+            self.generation.bump()
+        if any(event in _ROLE_EVENTS for event in events):
+            self.role_abilities.invalidate()
+
+    def _run_job(
+        self, request: IngestJobRequest, progress: IngestProgress
+    ) -> IngestResult:
+        return self.ingest_use_case().execute(
+            sources=request.sources,
+            access_token=request.access_token,
+            max_items=request.max_items,
+            full=request.full,
+            actor_id=request.actor_id,
+            actor_role=request.actor_role,
+            progress=progress,
+            reconcile=request.reconcile,
+        )
@@ -2,23 +2,18 @@ from dataclasses import dataclass
 from functools import lru_cache
 from typing import Annotated
 
-from fastapi import Depends, Header, HTTPException
+from fastapi import Depends, Header, HTTPException, Request
 
+from ..application.ingest_jobs import IngestJobManager
 from ..application.ports.auth import AccessTokenClaims
 from ..application.use_cases.ingest_embeddings import IngestEmbeddingsUseCase
-from ..application.use_cases.query_agent import QueryAgentUseCase
+from ..application.use_cases.query_agent import QueryAgentUseCase, QueryMetrics
 from ..core.config import Settings
 from ..domain.source import SourceType
 from ..infrastructure.auth.jwt_verifier import JwtAccessTokenVerifier
-from ..infrastructure.chroma.cursor_store import ChromaCursorStore
-from ..infrastructure.chroma.vector_store import ChromaVectorStore
-from ..infrastructure.http.service_clients import (
-    AuditServiceClient,
-    RoleServiceClient,
-    UserServiceClient,
-)
-from ..infrastructure.openai.client import OpenAIChatClient, OpenAIEmbeddingClient
-from ..infrastructure.rabbitmq.event_bus import RabbitMqEventBus
+from ..infrastructure.http.service_clients import RoleServiceClient
+from ..infrastructure.rabbitmq.change_consumer import RabbitMqChangeConsumer
+from .container import ServiceContainer
 
 
 @dataclass(frozen=True)
@@ -37,21 +32,22 @@ def get_token_verifier() -> JwtAccessTokenVerifier:
     return JwtAccessTokenVerifier(get_settings())
 
 
-@lru_cache
-def get_event_bus() -> RabbitMqEventBus:
-    return RabbitMqEventBus(get_settings())
+def get_container(request: Request) -> ServiceContainer:
+    return request.app.state.container
 
 
 def get_auth_context(
     authorization: Annotated[str | None, Header()] = None,
+    container: Annotated[ServiceContainer | None, Depends(get_container)] = None,
 ) -> AuthContext:
     if not authorization:
         raise HTTPException(status_code=401, detail="Missing Authorization header")
     token = authorization.replace("Bearer ", "").strip()
     if not token:
         raise HTTPException(status_code=401, detail="Invalid Authorization header")
+    verifier = container.token_verifier if container else get_token_verifier()
     try:
-        claims = get_token_verifier().verify(token)
+        claims = verifier.verify(token)
     except ValueError as exc:
         raise HTTPException(status_code=401, detail=str(exc)) from exc
     return AuthContext(token=authorization, claims=claims)
@@ -60,6 +56,7 @@ def get_auth_context(
 def require_create_permission(
     auth: Annotated[AuthContext, Depends(get_auth_context)],
     settings: Annotated[Settings, Depends(get_settings)],
+    container: Annotated[ServiceContainer | None, Depends(get_container)] = None,
 ) -> AuthContext:
     abilities = auth.claims.role_abilities
     if abilities and abilities.can_create is True:
@@ -67,7 +64,9 @@ def require_create_permission(
     if abilities and abilities.can_create is False:
         raise HTTPException(status_code=403, detail="Insufficient role permissions")
 
-    role_client = RoleServiceClient(settings)
+    role_client = (
+        container.role_abilities if container else RoleServiceClient(settings)
+    )
     try:
         role = role_client.get_role(auth.claims.role, auth.token)
     except RuntimeError as exc:
@@ -78,30 +77,33 @@ def require_create_permission(
 
 
 def get_ingest_use_case(
-    settings: Annotated[Settings, Depends(get_settings)],
-    event_bus: Annotated[RabbitMqEventBus, Depends(get_event_bus)],
+    container: Annotated[ServiceContainer, Depends(get_container)],
 ) -> IngestEmbeddingsUseCase:
-    return IngestEmbeddingsUseCase(
-        users=UserServiceClient(settings),
-        roles=RoleServiceClient(settings),
-        audit=AuditServiceClient(settings),
-        embeddings=OpenAIEmbeddingClient(settings),
-        vector_store=ChromaVectorStore(settings),
-        cursor_store=ChromaCursorStore(settings),
-        event_bus=event_bus,
+    return container.ingest_use_case()
+
+
+def get_ingest_job_manager(
+    container: Annotated[ServiceContainer, Depends(get_container)],
+) -> IngestJobManager:
+    return container.jobs
+
+
+def get_change_consumer(container: ServiceContainer) -> RabbitMqChangeConsumer:
+    return RabbitMqChangeConsumer(
+        container.settings, container.index_changes_use_case().execute
     )
 
 
 def get_query_use_case(
-    settings: Annotated[Settings, Depends(get_settings)],
-    event_bus: Annotated[RabbitMqEventBus, Depends(get_event_bus)],
+    container: Annotated[ServiceContainer, Depends(get_container)],
 ) -> QueryAgentUseCase:
-    return QueryAgentUseCase(
-        embeddings=OpenAIEmbeddingClient(settings),
-        chat=OpenAIChatClient(settings),
-        vector_store=ChromaVectorStore(settings),
-        event_bus=event_bus,
-    )
+    return container.query_use_case()
+
+
+def get_query_metrics(
+    container: Annotated[ServiceContainer, Depends(get_container)],
+) -> QueryMetrics:
+    return container.query_metrics()
 
 
 def get_sources_or_default(sources: list[SourceType] | None) -> list[SourceType]:
@@ -1,21 +1,73 @@
-from pydantic import BaseModel, Field
+from datetime import datetime
 
+from pydantic import BaseModel, ConfigDict, Field
+
+from ..application.ingest_jobs import JobStatus
 from ..domain.source import SourceType
 
 
 class IngestRequest(BaseModel):
     sources: list[SourceType] | None = None
     max_items: int | None = Field(default=None, ge=1, le=1000)
+    full: bool = False
+    reconcile: bool = False
+
+
+class StageMetricsResponse(BaseModel):
+    name: str
+    chunks: int
+    items: int
+    busy_seconds: float
+    items_per_second: float
+    max_queue_depth: int
 
 
 class IngestResponse(BaseModel):
     ingested: dict[str, int]
+    embedded: dict[str, int] = Field(default_factory=dict)
+    unchanged: dict[str, int] = Field(default_factory=dict)
+    skipped: dict[str, int] = Field(default_factory=dict)
     cursors: dict[str, str | None]
+    errors: dict[str, str] = Field(default_factory=dict)
+    pipeline: dict[str, list[StageMetricsResponse]] = Field(default_factory=dict)
+    deleted: dict[str, int] = Field(default_factory=dict)
+
+
+class SourceProgressResponse(BaseModel):
+    fetched: int
+    embedded: int
+    upserted: int
+    started_at: datetime | None
+    updated_at: datetime | None
+
+
+class IngestJobResponse(BaseModel):
+    job_id: str
+    status: JobStatus
+    sources: list[SourceType]
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    duration_seconds: float | None = None
+    progress: dict[str, SourceProgressResponse] = Field(default_factory=dict)
+    result: IngestResponse | None = None
+    error: str | None = None
+
+
+class QueryFilters(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    user_id: str | None = Field(default=None, min_length=1, max_length=200)
+    role_id: str | None = Field(default=None, min_length=1, max_length=200)
+    action: str | None = Field(default=None, min_length=1, max_length=200)
+    resource: str | None = Field(default=None, min_length=1, max_length=200)
 
 
 class QueryRequest(BaseModel):
     question: str = Field(min_length=3, max_length=500)
     top_k: int = Field(default=5, ge=1, le=10)
+    sources: list[SourceType] | None = None
+    filters: QueryFilters | None = None
 
 
 class QuerySource(BaseModel):
@@ -28,3 +80,30 @@ class QuerySource(BaseModel):
 class QueryResponse(BaseModel):
     answer: str
     sources: list[QuerySource]
+
+
+class CoalescingMetricsResponse(BaseModel):
+    leaders: int
+    followers: int
+    in_flight: int
+    coalesced_ratio: float
+
+
+class AnswerCacheMetricsResponse(BaseModel):
+    hits: int
+    semantic_hits: int
+    misses: int
+    entries: int
+
+
+class EmbeddingCacheMetricsResponse(BaseModel):
+    hits: int
+    misses: int
+    entries: int
+    bytes_used: int
+
+
+class QueryMetricsResponse(BaseModel):
+    coalescing: CoalescingMetricsResponse | None = None
+    answer_cache: AnswerCacheMetricsResponse | None = None
+    embedding_cache: EmbeddingCacheMetricsResponse | None = None
@@ -0,0 +1,99 @@
+import argparse
+from dataclasses import replace
+import json
+import time
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+import jwt
+from jwt import PyJWKSet
+from jwt.algorithms import RSAAlgorithm
+
+from app.core.config import Settings
+from app.infrastructure.auth.jwt_verifier import JwtAccessTokenVerifier
+
+ISSUER = "https://issuer.local"
+KID = "bench"
+
+
+class StaticJwksClient:
+    def __init__(self, jwk: dict) -> None:
+        self.jwk = jwk
+
+    def get_jwk_set(self, refresh: bool = False) -> PyJWKSet:
+        return PyJWKSet([self.jwk])
+
+
+def build_verifier(cache_size: int, jwk: dict) -> JwtAccessTokenVerifier:
+    settings = replace(
+        Settings.from_env(),
+        auth_issuer=ISSUER,
+        auth_token_cache_size=cache_size,
+    )
+    verifier = JwtAccessTokenVerifier(settings)
+    verifier.jwks_client = StaticJwksClient(jwk)
+    verifier.refresh_keys()
+    return verifier
+
+
+def measure(verifier: JwtAccessTokenVerifier, token: str, requests: int) -> float:
+    verifier.verify(token)
+    started = time.perf_counter()
+    for _ in range(requests):
+        verifier.verify(token)
+    return (time.perf_counter() - started) / requests
+
+
+def run_benchmark(args: argparse.Namespace) -> dict[str, float]:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = {
+        **json.loads(RSAAlgorithm.to_jwk(private_key.public_key())),
+        "kid": KID,
+        "alg": "RS256",
+    }
+    token = jwt.encode(
+        {
+            "sub": "user",
+            "email": "user@example.com",
+            "name": "User",
+            "role": "admin",
+            "iss": ISSUER,
+            "exp": int(time.time()) + 3600,
+        },
+        private_key,
+        algorithm="RS256",
+        headers={"kid": KID},
+    )
+    uncached = measure(build_verifier(0, jwk), token, args.requests)
+    cached = measure(build_verifier(args.cache_size, jwk), token, args.requests)
+    return {
+        "requests": args.requests,
+        "uncached_us_per_request": uncached * 1_000_000,
+        "cached_us_per_request": cached * 1_000_000,
+        "speedup": uncached / cached if cached else 0.0,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Measure access-token verification cost with and without the claims cache"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=2000, help="Verifications per run"
+    )
+    parser.add_argument(
+        "--cache-size", type=int, default=1024, help="Claims cache entries"
+    )
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    report = run_benchmark(args)
+    print(f"Requests:            {report['requests']}")
+    print(f"Uncached verify:     {report['uncached_us_per_request']:.1f} us/request")
+    print(f"Cached verify:       {report['cached_us_per_request']:.1f} us/request")
+    print(f"Speedup:             {report['speedup']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
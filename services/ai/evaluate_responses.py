@@ -1,4 +1,5 @@
 import argparse
+import asyncio
 import json
 import math
 import os
@@ -10,8 +11,12 @@ from typing import Any
 
 from app.application.use_cases.query_agent import QueryAgentUseCase
 from app.core.config import Settings
-from app.infrastructure.chroma.vector_store import ChromaVectorStore
-from app.infrastructure.openai.client import OpenAIChatClient, OpenAIEmbeddingClient
+from app.infrastructure.chroma.vector_store import AsyncChromaVectorStore
+from app.infrastructure.openai.client import (
+    AsyncOpenAIChatClient,
+    AsyncOpenAIEmbeddingClient,
+)
+from app.infrastructure.openai.tokens import get_token_encoder
 
 SYSTEM_PROMPT = (
     "You are a helpful operations assistant. Answer using only the provided context. "
@@ -96,18 +101,6 @@ def estimate_tokens(text: str, encoder: Any | None) -> int:
     return max(1, math.ceil(len(text) / 4))
 
 
-def get_token_encoder(model: str) -> Any | None:
-    try:
-        import tiktoken  # type: ignore
-    except ModuleNotFoundError:
-        return None
-
-    try:
-        return tiktoken.encoding_for_model(model)
-    except KeyError:
-        return tiktoken.get_encoding("cl100k_base")
-
-
 def extract_keywords(text: str) -> list[str]:
     tokens = re.findall(r"[a-zA-Z0-9']+", text.lower())
     stopwords = {
@@ -198,14 +191,17 @@ def run_evaluation(args: argparse.Namespace) -> list[EvalMetrics]:
     settings = Settings.from_env()
     if not settings.openai_api_key:
         raise SystemExit("OPENAI_API_KEY is required")
+    return asyncio.run(evaluate(args, settings))
+
 
+async def evaluate(args: argparse.Namespace, settings: Settings) -> list[EvalMetrics]:
     encoder = get_token_encoder(settings.openai_chat_model)
     input_cost_per_1k = args.input_cost_per_1k
     output_cost_per_1k = args.output_cost_per_1k
 
-    embeddings = OpenAIEmbeddingClient(settings)
-    chat = OpenAIChatClient(settings)
-    vector_store = ChromaVectorStore(settings)
+    embeddings = AsyncOpenAIEmbeddingClient(settings)
+    chat = AsyncOpenAIChatClient(settings)
+    vector_store = AsyncChromaVectorStore(settings)
     use_case = QueryAgentUseCase(embeddings, chat, vector_store, NoopEventBus())
 
     metrics: list[EvalMetrics] = []
@@ -213,7 +209,7 @@ def run_evaluation(args: argparse.Namespace) -> list[EvalMetrics]:
         question = item["question"]
         top_k = int(item.get("top_k", args.top_k))
         start = time.perf_counter()
-        result = use_case.execute(question, top_k)
+        result = await use_case.execute(question, top_k)
         latency_ms = (time.perf_counter() - start) * 1000
 
         context = build_context(result.sources)
@@ -0,0 +1,17 @@
+import signal
+
+from app.core.logging import configure_logging
+from app.presentation.container import ServiceContainer
+from app.presentation.dependencies import get_change_consumer, get_settings
+
+configure_logging()
+
+if __name__ == "__main__":
+    container = ServiceContainer(get_settings())
+    consumer = get_change_consumer(container)
+    signal.signal(signal.SIGTERM, lambda *_: consumer.stop())
+    signal.signal(signal.SIGINT, lambda *_: consumer.stop())
+    try:
+        consumer.run()
+    finally:
+        container.close()
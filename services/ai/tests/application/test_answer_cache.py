@@ -0,0 +1,76 @@
+from app.application.answer_cache import (
+    AnswerCache,
+    KnowledgeGeneration,
+    normalize_question,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_answer_cache_hits_on_normalized_question() -> None:
+    cache = AnswerCache()
+    cache.put("Who is  Ada?", [1.0, 0.0], 5, 0, "answer")
+
+    assert cache.get("  who IS ada? ", 5, 0) == "answer"
+    assert cache.get("who is ada?", 3, 0) is None
+    assert cache.stats().hits == 1
+    assert normalize_question(" A\tB  c ") == "a b c"
+
+
+def test_answer_cache_matches_near_duplicate_embeddings() -> None:
+    cache = AnswerCache(similarity_threshold=0.95)
+    cache.put("Who is Ada?", [1.0, 0.0, 0.0], 5, 0, "ada")
+    cache.put("List roles", [0.0, 1.0, 0.0], 5, 0, "roles")
+
+    assert cache.get_similar([0.99, 0.05, 0.0], 5, 0) == "ada"
+    assert cache.get_similar([0.7, 0.7, 0.0], 5, 0) is None
+    assert cache.get_similar([1.0, 0.0, 0.0], 3, 0) is None
+    assert cache.get_similar([1.0, 0.0], 5, 0) is None
+    stats = cache.stats()
+    assert (stats.semantic_hits, stats.misses, stats.entries) == (1, 3, 2)
+
+
+def test_answer_cache_keeps_scoped_answers_apart() -> None:
+    cache = AnswerCache()
+    cache.put("List roles", [1.0, 0.0], 5, 0, "all", None)
+    cache.put("List roles", [1.0, 0.0], 5, 0, "roles only", ("roles",))
+
+    assert cache.get("list roles", 5, 0) == "all"
+    assert cache.get("list roles", 5, 0, ("roles",)) == "roles only"
+    assert cache.get("list roles", 5, 0, ("audit",)) is None
+    assert cache.get_similar([1.0, 0.0], 5, 0, ("roles",)) == "roles only"
+    assert cache.get_similar([1.0, 0.0], 5, 0, ("audit",)) is None
+
+
+def test_answer_cache_drops_entries_from_older_generations_and_expired() -> None:
+    clock = FakeClock()
+    generation = KnowledgeGeneration()
+    cache = AnswerCache(ttl_seconds=10, clock=clock)
+    cache.put("q1", [1.0, 0.0], 5, generation.current, "old")
+
+    assert generation.bump() == 1
+    assert cache.get("q1", 5, generation.current) is None
+    assert cache.get_similar([1.0, 0.0], 5, generation.current) is None
+    assert cache.stats().entries == 0
+
+    cache.put("q2", [0.0, 1.0], 5, generation.current, "fresh")
+    clock.now = 11
+    assert cache.get("q2", 5, generation.current) is None
+
+
+def test_answer_cache_evicts_least_recently_used() -> None:
+    cache = AnswerCache(max_entries=2)
+    cache.put("a", [1.0, 0.0], 5, 0, "a")
+    cache.put("b", [0.0, 1.0], 5, 0, "b")
+    cache.get("a", 5, 0)
+    cache.put("c", [0.0, 0.0], 5, 0, "c")
+
+    assert cache.get("a", 5, 0) == "a"
+    assert cache.get("b", 5, 0) is None
+    assert cache.get("c", 5, 0) == "c"
@@ -0,0 +1,235 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.application.ports.sources import AuditRecord, RoleRecord, UserRecord
+from app.application.use_cases.index_changes import EntityChange, IndexChangesUseCase
+from app.domain.source import SourceType
+
+
+class StubUsers:
+    def __init__(self, users) -> None:
+        self.users = {user.user_id: user for user in users}
+        self.calls = []
+
+    def find_user(self, user_id):
+        self.calls.append(user_id)
+        return self.users.get(user_id)
+
+
+class StubRoles:
+    def __init__(self, roles) -> None:
+        self.roles = {role.role_id: role for role in roles}
+        self.calls = []
+
+    def find_role(self, role_id):
+        self.calls.append(role_id)
+        return self.roles.get(role_id)
+
+
+class StubEmbeddings:
+    def __init__(self) -> None:
+        self.calls = []
+
+    def embed_texts(self, inputs):
+        self.calls.append(list(inputs))
+        return [[0.1] for _ in inputs]
+
+
+class StubVectorStore:
+    def __init__(self) -> None:
+        self.upserts = []
+        self.deletes = []
+        self.fingerprints = {}
+        self.metadata = {}
+
+    def upsert(self, documents, embeddings) -> None:
+        self.upserts.append(list(documents))
+        for doc in documents:
+            self.fingerprints[doc.doc_id] = doc.metadata["content_hash"]
+            self.metadata[doc.doc_id] = doc.metadata
+
+    def get_fingerprints(self, doc_ids):
+        return {
+            doc_id: self.fingerprints[doc_id]
+            for doc_id in doc_ids
+            if doc_id in self.fingerprints
+        }
+
+    def delete(self, doc_ids) -> None:
+        self.deletes.append(list(doc_ids))
+
+    def iter_doc_ids(self, source, fields=()):
+        ids = [
+            doc_id
+            for doc_id, metadata in self.metadata.items()
+            if metadata["source"] == source
+            and all(metadata.get(key) == value for key, value in fields)
+        ]
+        if ids:
+            yield ids
+
+
+class StubEventBus:
+    def __init__(self) -> None:
+        self.events = []
+
+    def publish(self, name, payload) -> None:
+        self.events.append((name, payload))
+
+
+ROLE = RoleRecord(
+    role_id="role-1",
+    name="Admin",
+    can_view=True,
+    can_create=True,
+    can_update=False,
+    can_delete=False,
+)
+
+
+def build_user(user_id, name="Ada"):
+    return UserRecord(
+        user_id=user_id,
+        name=name,
+        email=f"{user_id}@example.com",
+        role_id="role-1",
+    )
+
+
+def build_use_case(users=(), roles=(ROLE,)):
+    return IndexChangesUseCase(
+        users=StubUsers(users),
+        roles=StubRoles(roles),
+        embeddings=StubEmbeddings(),
+        vector_store=StubVectorStore(),
+        event_bus=StubEventBus(),
+    )
+
+
+def test_indexes_changed_entities_and_resolves_role_names_once() -> None:
+    use_case = build_use_case([build_user("u1"), build_user("u2")])
+    audit = AuditRecord(
+        audit_id="a1",
+        action="UserCreated",
+        resource="user",
+        actor_id="u1",
+        actor_role="admin",
+        occurred_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        metadata=None,
+    )
+
+    result = use_case.execute(
+        [
+            EntityChange(SourceType.users, "u1"),
+            EntityChange(SourceType.users, "u2"),
+            EntityChange(SourceType.users, "u1"),
+            EntityChange(SourceType.roles, "role-1"),
+            EntityChange(SourceType.audit, "a1", audit=audit),
+        ]
+    )
+
+    assert result.upserted == {"users": 2, "roles": 1, "audit": 1}
+    assert use_case.users.calls == ["u1", "u2"]
+    assert use_case.roles.calls == ["role-1", "role-1"]
+    assert len(use_case.embeddings.calls) == 1
+    upserted = use_case.vector_store.upserts[0]
+    assert [doc.doc_id for doc in upserted] == [
+        "users:u1",
+        "users:u2",
+        "roles:role-1",
+        "audit:a1",
+    ]
+    assert upserted[0].metadata["role_name"] == "Admin"
+    assert use_case.vector_store.deletes == []
+    assert use_case.event_bus.events == [
+        (
+            "AiIndexUpdated",
+            {"upserted": {"users": 2, "roles": 1, "audit": 1}, "deleted": {}},
+        )
+    ]
+
+
+def test_deletes_removed_and_missing_entities() -> None:
+    use_case = build_use_case([build_user("u1")], roles=())
+
+    result = use_case.execute(
+        [
+            EntityChange(SourceType.users, "u1"),
+            EntityChange(SourceType.users, "u1", deleted=True),
+            EntityChange(SourceType.roles, "role-gone"),
+            EntityChange(SourceType.audit, "a-missing"),
+        ]
+    )
+
+    assert result.deleted == {"users": 1, "roles": 1}
+    assert use_case.vector_store.deletes == [["users:u1", "roles:role-gone"]]
+    assert use_case.vector_store.upserts == []
+    assert use_case.users.calls == []
+
+
+def test_role_changes_reindex_users_with_that_role() -> None:
+    use_case = build_use_case([build_user("u1"), build_user("u2")])
+    use_case.execute(
+        [EntityChange(SourceType.users, "u1"), EntityChange(SourceType.users, "u2")]
+    )
+    use_case.roles.roles["role-1"] = RoleRecord(
+        role_id="role-1",
+        name="Owner",
+        can_view=True,
+        can_create=True,
+        can_update=True,
+        can_delete=True,
+    )
+    use_case.roles.calls.clear()
+
+    result = use_case.execute([EntityChange(SourceType.roles, "role-1")])
+
+    assert result.upserted == {"roles": 1, "users": 2}
+    assert use_case.roles.calls == ["role-1"]
+    upserted = {doc.doc_id: doc for doc in use_case.vector_store.upserts[-1]}
+    assert upserted["users:u1"].metadata["role_name"] == "Owner"
+    assert "role_name=Owner" in upserted["users:u2"].content
+
+
+def test_skips_unchanged_documents() -> None:
+    use_case = build_use_case([build_user("u1")])
+    use_case.execute([EntityChange(SourceType.users, "u1")])
+
+    result = use_case.execute([EntityChange(SourceType.users, "u1")])
+
+    assert result.upserted == {}
+    assert result.unchanged == {"users": 1}
+    assert len(use_case.embeddings.calls) == 1
+    assert len(use_case.event_bus.events) == 1
+
+
+def test_ai_originated_audit_logs_do_not_announce_index_updates() -> None:
+    use_case = build_use_case()
+    audit = AuditRecord(
+        audit_id="a1",
+        action="AiQueried",
+        resource="ai",
+        actor_id="u1",
+        actor_role="admin",
+        occurred_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        metadata=None,
+    )
+
+    result = use_case.execute([EntityChange(SourceType.audit, "a1", audit=audit)])
+
+    assert result.upserted == {"audit": 1}
+    assert use_case.event_bus.events == []
+
+
+def test_lookup_errors_propagate() -> None:
+    class FailingUsers(StubUsers):
+        def find_user(self, user_id):
+            raise RuntimeError("users service error (503): down")
+
+    use_case = build_use_case()
+    use_case.users = FailingUsers([])
+
+    with pytest.raises(RuntimeError, match="users service error"):
+        use_case.execute([EntityChange(SourceType.users, "u1")])
+    assert use_case.vector_store.upserts == []
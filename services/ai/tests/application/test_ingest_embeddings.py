@@ -1,40 +1,72 @@
+from dataclasses import replace
 from datetime import datetime, timezone
+import threading
 
+import pytest
+
+from app.application.answer_cache import KnowledgeGeneration
 from app.application.ports.sources import AuditRecord, RoleRecord, UserRecord
-from app.application.use_cases.ingest_embeddings import IngestEmbeddingsUseCase
-from app.domain.source import SourceType
+from app.application.use_cases.ingest_embeddings import (
+    IngestEmbeddingsUseCase,
+    IngestPipelineConfig,
+    UpsertStats,
+    diff_documents,
+)
+from app.domain.document import EmbeddingDocument
+from app.domain.source import SourceCursor, SourceType
 
 
 class StubUsers:
     def __init__(self, users) -> None:
         self.users = users
         self.last_access_token = None
+        self.last_updated_after = None
 
-    def list_users(self, access_token):
+    def list_users(self, access_token, updated_after=None):
         self.last_access_token = access_token
-        return self.users
+        self.last_updated_after = updated_after
+        return [
+            user
+            for user in self.users
+            if not updated_after
+            or (user.updated_at or user.created_at) > updated_after
+        ]
 
 
 class StubRoles:
     def __init__(self, roles) -> None:
         self.roles = roles
         self.last_access_token = None
+        self.last_updated_after = None
+        self.calls = 0
 
-    def list_roles(self, access_token):
+    def list_roles(self, access_token, updated_after=None):
+        self.calls += 1
         self.last_access_token = access_token
-        return self.roles
+        self.last_updated_after = updated_after
+        return [
+            role
+            for role in self.roles
+            if not updated_after
+            or (role.updated_at or role.created_at) > updated_after
+        ]
 
 
 class StubAudit:
-    def __init__(self, logs) -> None:
+    def __init__(self, logs, page_size=100) -> None:
         self.logs = logs
+        self.page_size = page_size
         self.last_access_token = None
         self.last_occurred_after = None
+        self.last_max_items = None
 
-    def list_logs(self, access_token, occurred_after):
+    def iter_log_pages(self, access_token, occurred_after, max_items=None):
         self.last_access_token = access_token
         self.last_occurred_after = occurred_after
-        return self.logs
+        self.last_max_items = max_items
+        logs = self.logs[:max_items] if max_items else self.logs
+        for start in range(0, len(logs), self.page_size):
+            yield logs[start : start + self.page_size]
 
 
 class StubEmbeddings:
@@ -47,11 +79,35 @@ class StubEmbeddings:
 
 
 class StubVectorStore:
-    def __init__(self) -> None:
+    def __init__(self, page_size=2) -> None:
         self.upserts = []
+        self.fingerprints = {}
+        self.deleted = []
+        self.page_size = page_size
 
     def upsert(self, documents, embeddings) -> None:
         self.upserts.append((list(documents), list(embeddings)))
+        for doc in documents:
+            self.fingerprints[doc.doc_id] = doc.metadata["content_hash"]
+
+    def get_fingerprints(self, doc_ids):
+        return {
+            doc_id: self.fingerprints[doc_id]
+            for doc_id in doc_ids
+            if doc_id in self.fingerprints
+        }
+
+    def delete(self, doc_ids) -> None:
+        self.deleted.append(list(doc_ids))
+        for doc_id in doc_ids:
+            self.fingerprints.pop(doc_id, None)
+
+    def iter_doc_ids(self, source):
+        ids = sorted(
+            doc_id for doc_id in self.fingerprints if doc_id.startswith(f"{source}:")
+        )
+        for start in range(0, len(ids), self.page_size):
+            yield ids[start : start + self.page_size]
 
 
 class StubCursorStore:
@@ -59,13 +115,29 @@ class StubCursorStore:
         self.cursors = {}
         self.set_calls = []
 
+        self.get_calls = []
+
     def get_cursor(self, source):
         return self.cursors.get(source)
 
+    def get_cursors(self, sources):
+        sources = list(sources)
+        self.get_calls.append(sources)
+        return {
+            source: self.cursors[source] for source in sources if source in self.cursors
+        }
+
     def set_cursor(self, source, cursor) -> None:
         self.cursors[source] = cursor
         self.set_calls.append((source, cursor))
 
+    def advance_cursors(self, cursors):
+        for source, cursor in cursors.items():
+            self.set_calls.append((source, cursor))
+            if source not in self.cursors or cursor > self.cursors[source]:
+                self.cursors[source] = cursor
+        return {source: self.cursors[source] for source in cursors}
+
 
 class StubEventBus:
     def __init__(self) -> None:
@@ -75,7 +147,7 @@ class StubEventBus:
         self.events.append((name, payload))
 
 
-def build_use_case(users, roles, logs):
+def build_use_case(users, roles, logs, concurrency=1):
     return IngestEmbeddingsUseCase(
         users=StubUsers(users),
         roles=StubRoles(roles),
@@ -84,6 +156,7 @@ def build_use_case(users, roles, logs):
         vector_store=StubVectorStore(),
         cursor_store=StubCursorStore(),
         event_bus=StubEventBus(),
+        concurrency=concurrency,
     )
 
 
@@ -139,7 +212,7 @@ def test_execute_ingests_sources_and_publishes_event() -> None:
 
     use_case = build_use_case(users, roles, logs)
     cursor_store = use_case.cursor_store
-    cursor_store.cursors[SourceType.audit] = created
+    cursor_store.cursors[SourceType.audit] = SourceCursor(created)
 
     result = use_case.execute(
         [SourceType.users, SourceType.roles, SourceType.audit],
@@ -149,11 +222,13 @@ def test_execute_ingests_sources_and_publishes_event() -> None:
     )
 
     assert result.ingested == {"users": 2, "roles": 1, "audit": 1}
+    assert result.embedded == {"users": 2, "roles": 1, "audit": 1}
+    assert result.unchanged == {"users": 0, "roles": 0, "audit": 0}
     assert result.cursors["users"] == updated.isoformat()
     assert result.cursors["roles"] == role_updated.isoformat()
     assert result.cursors["audit"] == audit_time.isoformat()
 
-    assert use_case.audit.last_occurred_after == created
+    assert use_case.audit.last_occurred_after == SourceCursor(created)
     assert use_case.event_bus.events[0][0] == "AiIngested"
     assert use_case.event_bus.events[0][1]["actorId"] == "actor"
     assert use_case.event_bus.events[0][1]["sources"] == ["users", "roles", "audit"]
@@ -164,6 +239,8 @@ def test_execute_ingests_sources_and_publishes_event() -> None:
     assert upserts[1][0][0].metadata["source"] == "roles"
     assert upserts[2][0][0].metadata["source"] == "audit"
     assert upserts[0][0][0].metadata["role_name"] == "Admin"
+    assert upserts[2][0][0].metadata["user_id"] == "u1"
+    assert upserts[2][0][0].metadata["actor_role"] == "role-1"
 
 
 def test_execute_respects_max_items() -> None:
@@ -219,10 +296,12 @@ def test_resolve_cursor_uses_latest_timestamp() -> None:
     first = datetime(2024, 1, 1, tzinfo=timezone.utc)
     second = datetime(2024, 1, 2, tzinfo=timezone.utc)
 
-    cursor = use_case._resolve_cursor(SourceType.users, [first, second], 2)
+    cursor = use_case._resolve_cursor(
+        SourceType.users, [SourceCursor(first), SourceCursor(second)], 2
+    )
 
     assert cursor == second.isoformat()
-    assert cursor_store.cursors[SourceType.users] == second
+    assert cursor_store.cursors[SourceType.users] == SourceCursor(second)
 
 
 def test_resolve_cursor_fallback_when_missing_timestamps(monkeypatch) -> None:
@@ -238,26 +317,510 @@ def test_resolve_cursor_fallback_when_missing_timestamps(monkeypatch) -> None:
         "app.application.use_cases.ingest_embeddings.datetime", FixedDatetime
     )
 
-    cursor = use_case._resolve_cursor(SourceType.roles, [None], 1)
+    cursor = use_case._resolve_cursor(SourceType.roles, [], 1)
 
     assert cursor == fixed.isoformat()
-    assert use_case.cursor_store.cursors[SourceType.roles] == fixed
+    assert use_case.cursor_store.cursors[SourceType.roles] == SourceCursor(fixed)
 
 
 def test_resolve_cursor_returns_existing_when_no_items() -> None:
     use_case = build_use_case([], [], [])
     existing = datetime(2024, 3, 1, tzinfo=timezone.utc)
-    use_case.cursor_store.cursors[SourceType.audit] = existing
+    use_case.cursor_store.cursors[SourceType.audit] = SourceCursor(existing)
 
-    cursor = use_case._resolve_cursor(SourceType.audit, [], 0)
+    cursor = use_case._resolve_cursor(
+        SourceType.audit, [], 0, SourceCursor(existing)
+    )
 
     assert cursor == existing.isoformat()
 
 
-def test_upsert_documents_noop_when_empty() -> None:
+def test_execute_bumps_knowledge_generation_after_success() -> None:
+    use_case = build_use_case([build_user(1)], [], [])
+    use_case.generation = KnowledgeGeneration()
+
+    use_case.execute([SourceType.users], access_token=None)
+
+    assert use_case.generation.current == 1
+
+
+def test_diff_documents_noop_when_empty() -> None:
+    changed, stats = diff_documents(StubVectorStore(), [])
+
+    assert changed == []
+    assert stats == UpsertStats()
+
+
+def test_execute_skips_unchanged_documents() -> None:
+    created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    users = [
+        UserRecord(
+            user_id="u1",
+            name="Ada",
+            email="ada@example.com",
+            role_id="role-1",
+            role_name="Admin",
+            created_at=created,
+        ),
+        UserRecord(
+            user_id="u2",
+            name="Bea",
+            email="bea@example.com",
+            role_id="role-1",
+            role_name="Admin",
+            created_at=created,
+        ),
+    ]
+    use_case = build_use_case(users, [], [])
+    use_case.execute([SourceType.users], access_token=None)
+
+    use_case.users.users = [
+        users[0],
+        UserRecord(
+            user_id="u2",
+            name="Bea Renamed",
+            email="bea@example.com",
+            role_id="role-1",
+            role_name="Admin",
+            created_at=created,
+        ),
+    ]
+    result = use_case.execute([SourceType.users], access_token=None, full=True)
+
+    assert result.ingested == {"users": 2}
+    assert result.embedded == {"users": 1}
+    assert result.unchanged == {"users": 1}
+    assert use_case.embeddings.calls[-1] == [
+        "User u2: name=Bea Renamed, email=bea@example.com, "
+        "role_id=role-1, role_name=Admin"
+    ]
+    assert [doc.doc_id for doc in use_case.vector_store.upserts[-1][0]] == ["users:u2"]
+
+
+def test_diff_documents_skips_duplicate_ids() -> None:
+    documents = [
+        EmbeddingDocument(doc_id="audit:a1", content="first", metadata={}),
+        EmbeddingDocument(doc_id="audit:a1", content="second", metadata={}),
+    ]
+
+    changed, stats = diff_documents(StubVectorStore(), documents)
+
+    assert stats.embedded == 1
+    assert stats.skipped == 1
+    assert [doc.content for doc in changed] == ["second"]
+
+
+def test_execute_runs_sources_concurrently() -> None:
+    barrier = threading.Barrier(2, timeout=5)
+
+    class BarrierRoles(StubRoles):
+        def list_roles(self, access_token, updated_after=None):
+            barrier.wait()
+            return super().list_roles(access_token, updated_after)
+
+    class BarrierAudit(StubAudit):
+        def iter_log_pages(self, access_token, occurred_after, max_items=None):
+            barrier.wait()
+            return super().iter_log_pages(access_token, occurred_after, max_items)
+
+    use_case = build_use_case([], [], [], concurrency=2)
+    use_case.roles = BarrierRoles([])
+    use_case.audit = BarrierAudit([])
+
+    result = use_case.execute([SourceType.audit, SourceType.roles], access_token=None)
+
+    assert list(result.ingested) == ["audit", "roles"]
+    assert result.errors == {}
+
+
+def test_execute_isolates_source_failures() -> None:
+    class FailingAudit(StubAudit):
+        def iter_log_pages(self, access_token, occurred_after, max_items=None):
+            raise RuntimeError("audit service error (503): down")
+
+    created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    users = [
+        UserRecord(
+            user_id="u1",
+            name="Ada",
+            email="ada@example.com",
+            role_id="role-1",
+            created_at=created,
+        )
+    ]
+    use_case = build_use_case(users, [], [], concurrency=2)
+    use_case.audit = FailingAudit([])
+
+    result = use_case.execute([SourceType.users, SourceType.audit], access_token=None)
+
+    assert result.ingested == {"users": 1}
+    assert result.errors == {"audit": "audit service error (503): down"}
+    assert use_case.event_bus.events[0][1]["errors"] == result.errors
+
+
+def test_execute_raises_when_every_source_fails() -> None:
+    class FailingUsers(StubUsers):
+        def list_users(self, access_token, updated_after=None):
+            raise RuntimeError("users service error (500): boom")
+
+    use_case = build_use_case([], [], [])
+    use_case.users = FailingUsers([])
+
+    with pytest.raises(RuntimeError):
+        use_case.execute([SourceType.users], access_token=None)
+
+    assert use_case.event_bus.events == []
+
+
+def test_execute_ingests_audit_page_by_page() -> None:
+    logs = [
+        AuditRecord(
+            audit_id=f"a{index}",
+            action="create",
+            resource="users",
+            actor_id="u1",
+            actor_role="admin",
+            occurred_at=datetime(2024, 1, index, tzinfo=timezone.utc),
+            metadata=None,
+        )
+        for index in range(1, 6)
+    ]
+    use_case = build_use_case([], [], logs)
+    use_case.audit.page_size = 2
+
+    result = use_case.execute([SourceType.audit], access_token=None, max_items=5)
+
+    assert use_case.audit.last_max_items == 5
+    assert result.ingested == {"audit": 5}
+    assert result.embedded == {"audit": 5}
+    assert [len(upsert[0]) for upsert in use_case.vector_store.upserts] == [2, 2, 1]
+    assert [call[1].timestamp.day for call in use_case.cursor_store.set_calls] == [2, 4, 5]
+    assert use_case.cursor_store.cursors[SourceType.audit] == SourceCursor(
+        logs[-1].occurred_at, "a5"
+    )
+    assert result.cursors["audit"] == logs[-1].occurred_at.isoformat()
+
+
+def test_execute_pipelines_chunks_through_stages() -> None:
+    users = [
+        UserRecord(
+            user_id=f"u{index}",
+            name=f"User {index}",
+            email=f"user{index}@example.com",
+            role_id="role-1",
+            role_name=None,
+            created_at=datetime(2024, 1, index, tzinfo=timezone.utc),
+            updated_at=None,
+        )
+        for index in range(1, 8)
+    ]
+    use_case = build_use_case(users, [], [])
+    use_case.pipeline = IngestPipelineConfig(
+        chunk_size=3, queue_size=1, render_concurrency=2, embed_concurrency=2
+    )
+
+    result = use_case.execute([SourceType.users], access_token=None)
+
+    assert result.ingested == {"users": 7}
+    assert result.embedded == {"users": 7}
+    upserted = [doc.doc_id for docs, _ in use_case.vector_store.upserts for doc in docs]
+    assert sorted(upserted) == [f"users:u{index}" for index in range(1, 8)]
+    metrics = result.pipeline["users"]
+    assert [stage.name for stage in metrics] == [
+        "fetch",
+        "render",
+        "embed",
+        "upsert",
+        "commit",
+    ]
+    assert [stage.chunks for stage in metrics] == [3, 3, 3, 3, 3]
+    assert result.cursors["users"] == users[-1].created_at.isoformat()
+
+
+def build_user(index, updated_day=None):
+    return UserRecord(
+        user_id=f"u{index}",
+        name=f"User {index}",
+        email=f"user{index}@example.com",
+        role_id="role-1",
+        role_name="Admin",
+        created_at=datetime(2024, 1, index, tzinfo=timezone.utc),
+        updated_at=datetime(2024, 2, updated_day, tzinfo=timezone.utc)
+        if updated_day
+        else None,
+    )
+
+
+def test_execute_truncates_in_updated_at_then_id_order() -> None:
+    users = [build_user(3, updated_day=5), build_user(2, updated_day=5)]
+    use_case = build_use_case(users, [], [])
+
+    result = use_case.execute([SourceType.users], access_token=None, max_items=1)
+
+    upserted = use_case.vector_store.upserts[0][0]
+    assert [doc.doc_id for doc in upserted] == ["users:u2"]
+    assert result.ingested == {"users": 1}
+
+
+def test_execute_truncated_run_does_not_skip_tied_timestamps() -> None:
+    users = [build_user(1), build_user(2, updated_day=5), build_user(3, updated_day=5)]
+    use_case = build_use_case(users, [], [])
+
+    first = use_case.execute([SourceType.users], access_token=None, max_items=2)
+    second = use_case.execute([SourceType.users], access_token=None)
+
+    assert first.cursors["users"] == users[0].created_at.isoformat()
+    assert use_case.users.last_updated_after == users[0].created_at
+    assert second.embedded == {"users": 1}
+    assert "users:u3" in use_case.vector_store.fingerprints
+    assert second.cursors["users"] == users[2].updated_at.isoformat()
+
+
+def test_execute_fetches_only_users_changed_since_cursor() -> None:
+    users = [build_user(1), build_user(2), build_user(3)]
+    use_case = build_use_case(users, [], [])
+    cursor = datetime(2024, 1, 2, tzinfo=timezone.utc)
+    use_case.cursor_store.cursors[SourceType.users] = SourceCursor(cursor)
+
+    result = use_case.execute([SourceType.users], access_token=None)
+
+    assert use_case.users.last_updated_after == cursor
+    assert result.ingested == {"users": 1}
+    assert [doc.doc_id for doc in use_case.vector_store.upserts[0][0]] == ["users:u3"]
+    assert result.cursors["users"] == users[2].created_at.isoformat()
+    assert use_case.cursor_store.get_calls == [[SourceType.users]]
+
+
+def test_execute_refreshes_users_whose_role_changed_since_cursor() -> None:
+    users = [build_user(1), build_user(2), replace(build_user(3), role_id="role-2")]
+    users = [replace(user, role_name=None) for user in users]
+    role = RoleRecord(
+        role_id="role-1",
+        name="Owner",
+        can_view=True,
+        can_create=True,
+        can_update=True,
+        can_delete=True,
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        updated_at=datetime(2024, 1, 9, tzinfo=timezone.utc),
+    )
+    use_case = build_use_case(users, [role], [])
+    cursor = datetime(2024, 1, 5, tzinfo=timezone.utc)
+    use_case.cursor_store.cursors[SourceType.users] = SourceCursor(cursor)
+
+    result = use_case.execute([SourceType.users], access_token=None)
+
+    upserted = [doc for docs, _ in use_case.vector_store.upserts for doc in docs]
+    assert [doc.doc_id for doc in upserted] == ["users:u1", "users:u2"]
+    assert {doc.metadata["role_name"] for doc in upserted} == {"Owner"}
+    assert result.ingested == {"users": 2}
+    assert result.cursors["users"] == cursor.isoformat()
+
+
+def test_resolve_cursor_never_moves_backwards() -> None:
     use_case = build_use_case([], [], [])
+    newer = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    use_case.cursor_store.cursors[SourceType.users] = SourceCursor(newer)
+
+    cursor = use_case._resolve_cursor(
+        SourceType.users, [SourceCursor(datetime(2024, 1, 1, tzinfo=timezone.utc))], 1
+    )
+
+    assert cursor == newer.isoformat()
+    assert use_case.cursor_store.cursors[SourceType.users] == SourceCursor(newer)
+
+
+def test_execute_full_run_ignores_cursor() -> None:
+    users = [build_user(1), build_user(2, updated_day=1), build_user(3)]
+    use_case = build_use_case(users, [], [])
+    cursor = datetime(2024, 1, 5, tzinfo=timezone.utc)
+    use_case.cursor_store.cursors[SourceType.users] = SourceCursor(cursor)
+    use_case.cursor_store.cursors[SourceType.audit] = SourceCursor(cursor)
+
+    result = use_case.execute(
+        [SourceType.users, SourceType.audit], access_token=None, full=True
+    )
+
+    assert use_case.users.last_updated_after is None
+    assert use_case.audit.last_occurred_after is None
+    assert result.ingested == {"users": 3, "audit": 0}
+    assert result.cursors["users"] == users[1].updated_at.isoformat()
+    assert result.cursors["audit"] == cursor.isoformat()
+    assert use_case.event_bus.events[0][1]["full"] is True
+
+
+def test_execute_truncated_full_run_keeps_cursor() -> None:
+    users = [build_user(3), build_user(1), build_user(2)]
+    use_case = build_use_case(users, [], [])
+    cursor = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    use_case.cursor_store.cursors[SourceType.users] = SourceCursor(cursor)
+
+    result = use_case.execute(
+        [SourceType.users], access_token=None, max_items=1, full=True
+    )
+
+    assert result.ingested == {"users": 1}
+    assert result.cursors["users"] == cursor.isoformat()
+    assert use_case.cursor_store.set_calls == []
+
+
+def test_execute_ingests_only_roles_changed_since_cursor() -> None:
+    roles = [
+        RoleRecord(
+            role_id=f"role-{index}",
+            name=f"Role {index}",
+            can_view=True,
+            can_create=False,
+            can_update=False,
+            can_delete=False,
+            created_at=datetime(2024, 1, index, tzinfo=timezone.utc),
+        )
+        for index in range(1, 4)
+    ]
+    use_case = build_use_case([], roles, [])
+    cursor = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    use_case.cursor_store.cursors[SourceType.roles] = SourceCursor(cursor)
+
+    result = use_case.execute([SourceType.roles], access_token=None)
+
+    assert use_case.roles.last_updated_after is None
+    assert result.ingested == {"roles": 2}
+    assert result.cursors["roles"] == roles[2].created_at.isoformat()
+
+
+def test_execute_reconcile_removes_deleted_users_and_roles() -> None:
+    users = [build_user(1), build_user(2), build_user(3)]
+    role = RoleRecord(
+        role_id="role-1",
+        name="Admin",
+        can_view=True,
+        can_create=False,
+        can_update=False,
+        can_delete=False,
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+    use_case = build_use_case(users, [role], [])
+    use_case.vector_store.fingerprints.update(
+        {"users:gone": "x", "roles:gone": "y", "audit:a1": "z"}
+    )
+    use_case.cursor_store.cursors[SourceType.users] = SourceCursor(
+        datetime(2024, 1, 2, tzinfo=timezone.utc)
+    )
+
+    result = use_case.execute(
+        [SourceType.users, SourceType.roles, SourceType.audit],
+        access_token=None,
+        reconcile=True,
+    )
+
+    assert result.ingested["users"] == 1
+    assert result.deleted == {"users": 1, "roles": 1}
+    assert sorted(use_case.vector_store.deleted) == [["roles:gone"], ["users:gone"]]
+    assert "audit:a1" in use_case.vector_store.fingerprints
+    assert use_case.event_bus.events[0][1]["deleted"] == result.deleted
+
+
+def test_execute_without_reconcile_keeps_stale_documents() -> None:
+    use_case = build_use_case([build_user(1)], [], [])
+    use_case.vector_store.fingerprints["users:gone"] = "x"
+
+    result = use_case.execute([SourceType.users], access_token=None)
+
+    assert result.deleted == {}
+    assert use_case.vector_store.deleted == []
+
+
+def test_execute_reports_progress_per_source() -> None:
+    users = [build_user(1), build_user(2)]
+    use_case = build_use_case(users, [], [])
+    use_case.execute([SourceType.users], access_token=None)
+    use_case.users.users = [build_user(1), build_user(2, updated_day=1), build_user(3)]
+    events = []
+
+    use_case.execute(
+        [SourceType.users],
+        access_token=None,
+        full=True,
+        progress=lambda source, stage, count: events.append((source, stage, count)),
+    )
+
+    assert events == [
+        (SourceType.users, "fetched", 3),
+        (SourceType.users, "embedded", 1),
+        (SourceType.users, "upserted", 1),
+    ]
+
+
+def test_execute_lists_roles_once_per_run() -> None:
+    role = RoleRecord(
+        role_id="role-1",
+        name="Admin",
+        can_view=True,
+        can_create=False,
+        can_update=False,
+        can_delete=False,
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+    use_case = build_use_case([build_user(1)], [role], [], concurrency=2)
+
+    result = use_case.execute(
+        [SourceType.users, SourceType.roles], access_token="token", full=True
+    )
+    use_case.execute([SourceType.roles], access_token="token", full=True)
+    use_case.cursor_store.cursors[SourceType.roles] = SourceCursor(
+        datetime(2023, 12, 31, tzinfo=timezone.utc)
+    )
+    incremental = use_case.execute(
+        [SourceType.users, SourceType.roles], access_token="token"
+    )
+
+    assert result.ingested == {"users": 1, "roles": 1}
+    assert incremental.ingested["roles"] == 1
+    assert use_case.roles.calls == 3
+
+
+class FailingVectorStore(StubVectorStore):
+    def __init__(self, fail_on_call) -> None:
+        super().__init__()
+        self.fail_on_call = fail_on_call
+        self.calls = 0
+
+    def upsert(self, documents, embeddings) -> None:
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise RuntimeError("vector store outage")
+        super().upsert(documents, embeddings)
+
+
+def test_execute_checkpoints_users_per_chunk_and_resumes_after_failure() -> None:
+    users = [build_user(index) for index in (4, 1, 5, 3, 2)]
+    use_case = build_use_case(users, [], [])
+    use_case.pipeline = IngestPipelineConfig(chunk_size=2)
+    use_case.vector_store = FailingVectorStore(fail_on_call=2)
+
+    with pytest.raises(RuntimeError, match="vector store outage"):
+        use_case.execute([SourceType.users], access_token=None)
+
+    assert use_case.cursor_store.cursors[SourceType.users].timestamp.day == 2
+
+    use_case.vector_store.fail_on_call = None
+    resumed = use_case.execute([SourceType.users], access_token=None)
+
+    assert use_case.users.last_updated_after.day == 2
+    assert resumed.ingested == {"users": 3}
+    assert [
+        doc.doc_id for upsert in use_case.vector_store.upserts[1:] for doc in upsert[0]
+    ] == ["users:u3", "users:u4", "users:u5"]
+    assert resumed.cursors["users"] == users[2].created_at.isoformat()
+
+
+def test_execute_checkpoint_stops_before_timestamps_shared_with_next_chunk() -> None:
+    users = [build_user(1), build_user(2), build_user(3), build_user(4)]
+    users[2] = replace(users[2], created_at=users[1].created_at)
+    use_case = build_use_case(users, [], [])
+    use_case.pipeline = IngestPipelineConfig(chunk_size=2)
 
-    use_case._upsert_documents([])
+    result = use_case.execute([SourceType.users], access_token=None)
 
-    assert use_case.embeddings.calls == []
-    assert use_case.vector_store.upserts == []
+    assert [call[1].timestamp.day for call in use_case.cursor_store.set_calls] == [1, 4]
+    assert result.cursors["users"] == users[3].created_at.isoformat()
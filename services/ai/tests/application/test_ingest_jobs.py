@@ -0,0 +1,243 @@
+from datetime import datetime, timedelta, timezone
+import threading
+
+from app.application.ingest_jobs import IngestJobManager, IngestJobRequest, JobStatus
+from app.application.use_cases.ingest_embeddings import IngestResult
+from app.domain.source import SourceType
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def __call__(self):
+        self.now += timedelta(seconds=1)
+        return self.now
+
+
+def build_result() -> IngestResult:
+    return IngestResult(ingested={"users": 2}, cursors={"users": None})
+
+
+def wait_for(manager, job_id, status):
+    for _ in range(200):
+        job = manager.get(job_id)
+        if job.status == status:
+            return job
+        threading.Event().wait(0.01)
+    raise AssertionError(f"job {job_id} never reached {status}")
+
+
+def test_job_runs_in_background_and_reports_progress() -> None:
+    release = threading.Event()
+
+    def runner(request, progress):
+        progress(SourceType.users, "fetched", 2)
+        progress(SourceType.users, "embedded", 1)
+        release.wait(timeout=5)
+        progress(SourceType.users, "upserted", 1)
+        return build_result()
+
+    manager = IngestJobManager(runner, clock=FakeClock())
+    job = manager.submit(IngestJobRequest(sources=[SourceType.users], access_token="t"))
+
+    assert job.status == JobStatus.queued
+    running = wait_for(manager, job.job_id, JobStatus.running)
+    release.set()
+    done = wait_for(manager, job.job_id, JobStatus.succeeded)
+    manager.shutdown()
+
+    assert running.started_at is not None
+    assert done.result == build_result()
+    assert done.finished_at > done.started_at
+    progress = done.progress["users"]
+    assert (progress.fetched, progress.embedded, progress.upserted) == (2, 1, 1)
+    assert progress.updated_at > progress.started_at
+
+
+def test_job_failure_is_recorded() -> None:
+    def runner(request, progress):
+        raise RuntimeError("users service error (500): boom")
+
+    manager = IngestJobManager(runner)
+    job = manager.submit(IngestJobRequest(sources=[SourceType.users], access_token=None))
+    failed = wait_for(manager, job.job_id, JobStatus.failed)
+    manager.shutdown()
+
+    assert failed.error == "users service error (500): boom"
+    assert failed.result is None
+
+
+def test_pending_job_is_shared_per_source_set() -> None:
+    release = threading.Event()
+    calls = []
+
+    def runner(request, progress):
+        calls.append(request.sources)
+        release.wait(timeout=5)
+        return build_result()
+
+    manager = IngestJobManager(runner, max_concurrent_jobs=1)
+    running = manager.submit(
+        IngestJobRequest(sources=[SourceType.users], access_token=None)
+    )
+    wait_for(manager, running.job_id, JobStatus.running)
+
+    queued = manager.submit(
+        IngestJobRequest(
+            sources=[SourceType.users, SourceType.roles], access_token=None
+        )
+    )
+    duplicate = manager.submit(
+        IngestJobRequest(
+            sources=[SourceType.roles, SourceType.users], access_token=None
+        )
+    )
+    other = manager.submit(IngestJobRequest(sources=[SourceType.audit], access_token=None))
+    release.set()
+    manager.shutdown()
+
+    assert duplicate.job_id == queued.job_id
+    assert other.job_id != queued.job_id
+    assert running.job_id != queued.job_id
+    assert len(calls) == 3
+    assert manager.get(queued.job_id).status == JobStatus.succeeded
+
+
+def test_pending_job_merges_options_across_callers() -> None:
+    release = threading.Event()
+    calls = []
+
+    def runner(request, progress):
+        calls.append(
+            (request.max_items, request.full, request.reconcile, request.actor_id)
+        )
+        release.wait(timeout=5)
+        return build_result()
+
+    manager = IngestJobManager(runner, max_concurrent_jobs=1)
+    running = manager.submit(
+        IngestJobRequest(sources=[SourceType.audit], access_token=None)
+    )
+    wait_for(manager, running.job_id, JobStatus.running)
+
+    incremental = manager.submit(
+        IngestJobRequest(
+            sources=[SourceType.users], access_token="a", max_items=5, actor_id="a"
+        )
+    )
+    rebuild = manager.submit(
+        IngestJobRequest(
+            sources=[SourceType.users],
+            access_token="a",
+            max_items=10,
+            full=True,
+            actor_id="a",
+        )
+    )
+    other_actor = manager.submit(
+        IngestJobRequest(
+            sources=[SourceType.users], access_token="b", reconcile=True, actor_id="b"
+        )
+    )
+    release.set()
+    manager.shutdown()
+
+    assert incremental.job_id == rebuild.job_id == other_actor.job_id
+    assert calls[1:] == [(None, True, True, "a")]
+
+
+def test_pending_job_runs_with_the_freshest_token() -> None:
+    release = threading.Event()
+    tokens = []
+
+    def runner(request, progress):
+        tokens.append(request.access_token)
+        release.wait(timeout=5)
+        return build_result()
+
+    clock = FakeClock()
+    manager = IngestJobManager(runner, max_concurrent_jobs=1, clock=clock)
+    running = manager.submit(
+        IngestJobRequest(sources=[SourceType.audit], access_token="run")
+    )
+    wait_for(manager, running.job_id, JobStatus.running)
+    expiry = clock.now + timedelta(hours=1)
+
+    queued = manager.submit(
+        IngestJobRequest(
+            sources=[SourceType.users], access_token="old", token_expires_at=expiry
+        )
+    )
+    fresher = manager.submit(
+        IngestJobRequest(
+            sources=[SourceType.users],
+            access_token="new",
+            token_expires_at=expiry + timedelta(minutes=5),
+        )
+    )
+    staler = manager.submit(
+        IngestJobRequest(
+            sources=[SourceType.users], access_token="stale", token_expires_at=expiry
+        )
+    )
+    release.set()
+    manager.shutdown()
+
+    assert queued.job_id == fresher.job_id == staler.job_id
+    assert tokens == ["run", "new"]
+
+
+def test_job_with_expired_token_fails_without_running() -> None:
+    calls = []
+    clock = FakeClock()
+    manager = IngestJobManager(
+        lambda request, progress: calls.append(request), clock=clock
+    )
+    job = manager.submit(
+        IngestJobRequest(
+            sources=[SourceType.users], access_token="t", token_expires_at=clock.now
+        )
+    )
+    failed = wait_for(manager, job.job_id, JobStatus.failed)
+    manager.shutdown()
+
+    assert "expired" in failed.error
+    assert calls == []
+
+
+def test_limits_concurrent_jobs() -> None:
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def runner(request, progress):
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        threading.Event().wait(0.05)
+        with lock:
+            active.pop()
+        return build_result()
+
+    manager = IngestJobManager(runner, max_concurrent_jobs=2)
+    for source in SourceType:
+        manager.submit(IngestJobRequest(sources=[source], access_token=None))
+    manager.shutdown()
+
+    assert max(peak) <= 2
+    assert len(peak) == 3
+
+
+def test_evicts_oldest_finished_jobs() -> None:
+    manager = IngestJobManager(lambda request, progress: build_result(), max_retained_jobs=2)
+    first = manager.submit(IngestJobRequest(sources=[SourceType.users], access_token=None))
+    wait_for(manager, first.job_id, JobStatus.succeeded)
+    second = manager.submit(IngestJobRequest(sources=[SourceType.users], access_token=None))
+    wait_for(manager, second.job_id, JobStatus.succeeded)
+    third = manager.submit(IngestJobRequest(sources=[SourceType.users], access_token=None))
+    manager.shutdown()
+
+    assert manager.get(first.job_id) is None
+    assert manager.get(second.job_id) is not None
+    assert manager.get(third.job_id) is not None
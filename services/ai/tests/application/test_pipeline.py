@@ -0,0 +1,138 @@
+import threading
+import time
+
+import pytest
+
+from app.application.pipeline import Pipeline, Stage, StageMetrics
+
+
+def test_pipeline_runs_stages_and_commits_in_order() -> None:
+    committed = []
+
+    def slow_first(chunk):
+        if chunk == [0]:
+            time.sleep(0.05)
+        return [value * 10 for value in chunk]
+
+    pipeline = Pipeline(
+        [
+            Stage("render", slow_first, concurrency=3),
+            Stage("upsert", lambda chunk: chunk + [-1]),
+        ],
+        queue_size=2,
+    )
+
+    metrics = pipeline.run(([index] for index in range(5)), committed.append)
+
+    assert committed == [[0, -1], [10, -1], [20, -1], [30, -1], [40, -1]]
+    assert [stage.name for stage in metrics] == ["fetch", "render", "upsert", "commit"]
+    assert [stage.chunks for stage in metrics] == [5, 5, 5, 5]
+    assert metrics[1].items == 5
+    assert metrics[-1].items == 10
+
+
+def test_pipeline_overlaps_stage_work() -> None:
+    barrier = threading.Barrier(2, timeout=5)
+
+    def first(chunk):
+        if chunk == [1]:
+            barrier.wait()
+        return chunk
+
+    def second(chunk):
+        if chunk == [0]:
+            barrier.wait()
+        return chunk
+
+    committed = []
+    Pipeline([Stage("render", first), Stage("embed", second)], queue_size=1).run(
+        [[0], [1]], committed.append
+    )
+
+    assert committed == [[0], [1]]
+
+
+def test_pipeline_applies_backpressure_to_fetch() -> None:
+    fetched = []
+    release = threading.Event()
+
+    def source():
+        for index in range(50):
+            fetched.append(index)
+            yield [index]
+
+    def blocked(chunk):
+        release.wait(timeout=5)
+        return chunk
+
+    pipeline = Pipeline([Stage("embed", blocked)], queue_size=1)
+    thread = threading.Thread(target=pipeline.run, args=(source(), lambda _: None))
+    thread.start()
+    time.sleep(0.2)
+    in_flight = len(fetched)
+    release.set()
+    thread.join(timeout=5)
+
+    assert in_flight <= 5
+    assert len(fetched) == 50
+
+
+def test_pipeline_propagates_stage_errors_and_stops() -> None:
+    committed = []
+
+    def fail_on_two(chunk):
+        if chunk == [2]:
+            raise RuntimeError("embedding failed")
+        return chunk
+
+    pipeline = Pipeline([Stage("embed", fail_on_two)], queue_size=1)
+
+    with pytest.raises(RuntimeError, match="embedding failed"):
+        pipeline.run(([index] for index in range(100)), committed.append)
+
+    assert [2] not in committed
+    assert len(committed) < 100
+
+
+def test_pipeline_commits_finished_chunks_before_raising() -> None:
+    committed = []
+
+    def fail_on_three(chunk):
+        if chunk == [3]:
+            raise RuntimeError("upsert failed")
+        return chunk
+
+    pipeline = Pipeline([Stage("upsert", fail_on_three)], queue_size=4)
+
+    with pytest.raises(RuntimeError, match="upsert failed"):
+        pipeline.run(([index] for index in range(10)), committed.append)
+
+    assert committed == [[0], [1], [2]]
+
+
+def test_pipeline_propagates_fetch_and_sink_errors() -> None:
+    def broken_source():
+        yield [1]
+        raise RuntimeError("audit service error (500): boom")
+
+    with pytest.raises(RuntimeError, match="audit service error"):
+        Pipeline([Stage("render", list)], queue_size=1).run(
+            broken_source(), lambda _: None
+        )
+
+    def broken_sink(chunk):
+        raise ValueError("checkpoint failed")
+
+    with pytest.raises(ValueError, match="checkpoint failed"):
+        Pipeline([Stage("render", list)], queue_size=1).run([[1], [2]], broken_sink)
+
+
+def test_pipeline_handles_empty_source() -> None:
+    metrics = Pipeline([Stage("render", list)], queue_size=1).run([], print)
+
+    assert [stage.chunks for stage in metrics] == [0, 0, 0]
+
+
+def test_stage_metrics_throughput() -> None:
+    assert StageMetrics("embed", 1, 10, 2.0, 1).items_per_second == 5.0
+    assert StageMetrics("embed", 0, 0, 0.0, 0).items_per_second == 0.0
@@ -1,32 +1,47 @@
-from app.application.ports.vector_store import RetrievedDocument
+import asyncio
+
+from app.application.ports.embeddings import ChatChunk, ChatUsage
+from app.application.answer_cache import AnswerCache, KnowledgeGeneration
+from app.application.ports.vector_store import DocumentFilter, RetrievedDocument
+from app.application.query_router import route_question
+from app.application.single_flight import SingleFlight
 from app.application.use_cases.query_agent import QueryAgentUseCase
 
 
 class StubEmbeddings:
-    def __init__(self) -> None:
+    def __init__(self, vector=None) -> None:
         self.calls = []
+        self.vector = vector or [0.1, 0.2, 0.3]
 
-    def embed_texts(self, inputs):
+    async def embed_texts(self, inputs):
         self.calls.append(list(inputs))
-        return [[0.1, 0.2, 0.3]]
+        return [self.vector]
 
 
 class StubChat:
     def __init__(self) -> None:
         self.calls = []
 
-    def generate(self, system_prompt, user_prompt):
+    async def generate(self, system_prompt, user_prompt):
         self.calls.append((system_prompt, user_prompt))
         return "answer"
 
+    async def stream(self, system_prompt, user_prompt):
+        self.calls.append((system_prompt, user_prompt))
+        yield ChatChunk(text="ans")
+        yield ChatChunk(text="wer")
+        yield ChatChunk(
+            usage=ChatUsage(prompt_tokens=4, completion_tokens=2, total_tokens=6)
+        )
+
 
 class StubVectorStore:
     def __init__(self, docs) -> None:
         self.docs = docs
         self.calls = []
 
-    def query(self, embedding, top_k):
-        self.calls.append((embedding, top_k))
+    async def query(self, embedding, top_k, where=None):
+        self.calls.append((embedding, top_k, where))
         return self.docs
 
 
@@ -38,6 +53,10 @@ class StubEventBus:
         self.events.append((name, payload))
 
 
+async def collect(events):
+    return [event async for event in events]
+
+
 def test_query_agent_executes_and_publishes() -> None:
     docs = [
         RetrievedDocument(
@@ -65,17 +84,245 @@ def test_query_agent_executes_and_publishes() -> None:
         event_bus=event_bus,
     )
 
-    result = use_case.execute(
-        question="Who is Ada?",
-        top_k=2,
-        actor_id="actor",
-        actor_role="ops",
+    result = asyncio.run(
+        use_case.execute(
+            question="Who is Ada?",
+            top_k=2,
+            actor_id="actor",
+            actor_role="ops",
+        )
     )
 
     assert result.answer == "answer"
     assert result.sources == docs
     assert embeddings.calls == [["Who is Ada?"]]
-    assert vector_store.calls == [([0.1, 0.2, 0.3], 2)]
+    assert vector_store.calls == [([0.1, 0.2, 0.3], 2, None)]
     assert "[1] User u1: name=Ada" in chat.calls[0][1]
     assert event_bus.events[0][0] == "AiQueried"
     assert event_bus.events[0][1]["sourceCount"] == 2
+    assert event_bus.events[0][1]["cached"] is False
+
+
+def build_cached_use_case(embeddings):
+    return QueryAgentUseCase(
+        embeddings=embeddings,
+        chat=StubChat(),
+        vector_store=StubVectorStore([]),
+        event_bus=StubEventBus(),
+        answers=AnswerCache(similarity_threshold=0.9),
+        generation=KnowledgeGeneration(),
+    )
+
+
+def test_query_agent_serves_repeated_questions_from_answer_cache() -> None:
+    embeddings = StubEmbeddings()
+    use_case = build_cached_use_case(embeddings)
+
+    first = asyncio.run(use_case.execute("Who is Ada?", 2))
+    exact = asyncio.run(use_case.execute("who is  ada?", 2))
+    embeddings.vector = [0.1, 0.2, 0.31]
+    similar = asyncio.run(use_case.execute("Who's Ada?", 2))
+
+    assert first is exact is similar
+    assert len(use_case.chat.calls) == 1
+    assert embeddings.calls == [["Who is Ada?"], ["Who's Ada?"]]
+    assert [event[1]["cached"] for event in use_case.event_bus.events] == [
+        False,
+        True,
+        True,
+    ]
+
+
+def test_query_agent_recomputes_after_generation_bump() -> None:
+    use_case = build_cached_use_case(StubEmbeddings())
+
+    asyncio.run(use_case.execute("Who is Ada?", 2))
+    use_case.generation.bump()
+    asyncio.run(use_case.execute("Who is Ada?", 2))
+
+    assert len(use_case.chat.calls) == 2
+    assert use_case.answers.stats().misses == 2
+
+
+def test_query_agent_streams_sources_tokens_and_summary() -> None:
+    ticks = iter([0.0, 0.01, 0.05, 0.2])
+    docs = [
+        RetrievedDocument(
+            doc_id="doc-1", content="Role Admin", metadata={}, distance=0.1
+        )
+    ]
+    use_case = QueryAgentUseCase(
+        embeddings=StubEmbeddings(),
+        chat=StubChat(),
+        vector_store=StubVectorStore(docs),
+        event_bus=StubEventBus(),
+        answers=AnswerCache(),
+        clock=lambda: next(ticks),
+    )
+
+    events = asyncio.run(
+        collect(use_case.stream("Who is admin?", 1, actor_id="actor"))
+    )
+
+    assert [event.event for event in events] == ["sources", "token", "token", "done"]
+    assert events[0].sources == docs
+    assert "".join(event.text for event in events) == "answer"
+    assert events[-1].usage.total_tokens == 6
+    assert events[-1].timings == {
+        "retrieval_ms": 10.0,
+        "first_token_ms": 50.0,
+        "total_ms": 200.0,
+    }
+    assert use_case.event_bus.events[0][1]["actorId"] == "actor"
+    assert asyncio.run(use_case.execute("Who is admin?", 1)).answer == "answer"
+    assert len(use_case.chat.calls) == 1
+
+
+def test_query_agent_streams_cached_answer_in_one_token() -> None:
+    use_case = build_cached_use_case(StubEmbeddings())
+    asyncio.run(use_case.execute("Who is Ada?", 2))
+
+    events = asyncio.run(collect(use_case.stream("who is ada?", 2)))
+
+    assert [event.event for event in events] == ["sources", "token", "done"]
+    assert events[1].text == "answer"
+    assert events[-1].cached is True
+    assert events[-1].usage is None
+    assert use_case.event_bus.events[-1][1]["cached"] is True
+
+
+def test_query_agent_keeps_many_queries_in_flight_on_one_loop() -> None:
+    class SlowChat(StubChat):
+        def __init__(self) -> None:
+            super().__init__()
+            self.in_flight = 0
+            self.peak = 0
+
+        async def generate(self, system_prompt, user_prompt):
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            return await super().generate(system_prompt, user_prompt)
+
+    use_case = QueryAgentUseCase(
+        embeddings=StubEmbeddings(),
+        chat=SlowChat(),
+        vector_store=StubVectorStore([]),
+        event_bus=StubEventBus(),
+    )
+
+    async def run():
+        return await asyncio.gather(
+            *(use_case.execute(f"Question {index}", 1) for index in range(300))
+        )
+
+    results = asyncio.run(run())
+
+    assert len(results) == 300
+    assert use_case.chat.peak == 300
+
+
+def test_query_agent_coalesces_identical_concurrent_queries() -> None:
+    class SlowChat(StubChat):
+        async def generate(self, system_prompt, user_prompt):
+            await asyncio.sleep(0.01)
+            return await super().generate(system_prompt, user_prompt)
+
+    embeddings = StubEmbeddings()
+    use_case = QueryAgentUseCase(
+        embeddings=embeddings,
+        chat=SlowChat(),
+        vector_store=StubVectorStore([]),
+        event_bus=StubEventBus(),
+        inflight=SingleFlight(),
+    )
+    questions = ["Who is Ada?", "who is  ada?", "Who is Ada?", "List roles"]
+
+    async def run():
+        return await asyncio.gather(
+            *(
+                use_case.execute(question, 2, actor_id=f"actor-{index}")
+                for index, question in enumerate(questions)
+            )
+        )
+
+    results = asyncio.run(run())
+
+    assert results[0] is results[1] is results[2]
+    assert len(use_case.chat.calls) == 2
+    assert embeddings.calls == [["Who is Ada?"], ["List roles"]]
+    payloads = [payload for _, payload in use_case.event_bus.events]
+    assert sorted(payload["actorId"] for payload in payloads) == [
+        "actor-0",
+        "actor-1",
+        "actor-2",
+        "actor-3",
+    ]
+    assert sorted(payload["coalesced"] for payload in payloads) == [
+        False,
+        False,
+        True,
+        True,
+    ]
+    assert use_case.inflight.stats().coalesced_ratio == 0.5
+
+
+def test_query_agent_pushes_explicit_filters_and_routes_by_keyword() -> None:
+    docs = [
+        RetrievedDocument(doc_id="roles:r1", content="Role", metadata={}, distance=0)
+    ]
+    vector_store = StubVectorStore(docs)
+    use_case = QueryAgentUseCase(
+        embeddings=StubEmbeddings(),
+        chat=StubChat(),
+        vector_store=vector_store,
+        event_bus=StubEventBus(),
+        answers=AnswerCache(),
+        router=route_question,
+    )
+    explicit = DocumentFilter(sources=("audit",), fields=(("action", "delete"),))
+
+    asyncio.run(use_case.execute("Which permissions exist?", 3))
+    asyncio.run(use_case.execute("Which permissions exist?", 3, where=explicit))
+    asyncio.run(use_case.execute("Summarize everything", 3))
+
+    assert [call[2] for call in vector_store.calls] == [
+        DocumentFilter(sources=("roles",)),
+        explicit,
+        None,
+    ]
+    assert len(use_case.chat.calls) == 3
+
+
+def test_query_agent_falls_back_to_whole_collection_when_route_is_empty() -> None:
+    class RoutedStore(StubVectorStore):
+        async def query(self, embedding, top_k, where=None):
+            await super().query(embedding, top_k, where)
+            return [] if where else self.docs
+
+    docs = [
+        RetrievedDocument(doc_id="users:u1", content="User", metadata={}, distance=0)
+    ]
+    vector_store = RoutedStore(docs)
+    use_case = QueryAgentUseCase(
+        embeddings=StubEmbeddings(),
+        chat=StubChat(),
+        vector_store=vector_store,
+        event_bus=StubEventBus(),
+        router=route_question,
+    )
+    explicit = DocumentFilter(sources=("audit",))
+
+    routed = asyncio.run(use_case.execute("Show the audit history", 2))
+    filtered = asyncio.run(
+        use_case.execute("Show the audit history", 2, where=explicit)
+    )
+
+    assert routed.sources == docs
+    assert filtered.sources == []
+    assert [call[2] for call in vector_store.calls] == [
+        DocumentFilter(sources=("audit",)),
+        None,
+        explicit,
+    ]
@@ -0,0 +1,51 @@
+import asyncio
+
+from app.application.query_embedding_cache import AsyncQueryEmbeddingCache
+
+
+class StubAsyncEmbeddings:
+    def __init__(self) -> None:
+        self.calls = []
+
+    async def embed_texts(self, inputs):
+        self.calls.append(list(inputs))
+        return [[float(len(text)), 0.5] for text in inputs]
+
+
+def test_query_embedding_cache_skips_provider_for_repeated_questions() -> None:
+    inner = StubAsyncEmbeddings()
+    cache = AsyncQueryEmbeddingCache(inner, model="embed", max_bytes=1024)
+
+    first = asyncio.run(cache.embed_texts(["Who is Ada?"]))
+    second = asyncio.run(cache.embed_texts(["  who is ADA? ", "List roles"]))
+
+    assert second[0] == first[0]
+    assert second[1] == [10.0, 0.5]
+    assert inner.calls == [["Who is Ada?"], ["List roles"]]
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 2, 2)
+    assert stats.bytes_used == len("who is ada?") + len("list roles") + 16
+
+
+def test_query_embedding_cache_evicts_to_stay_within_memory_bound() -> None:
+    inner = StubAsyncEmbeddings()
+    cache = AsyncQueryEmbeddingCache(inner, model="embed", max_bytes=20)
+
+    for text in ["aaaa", "bbbb", "c" * 32, "aaaa"]:
+        asyncio.run(cache.embed_texts([text]))
+
+    assert inner.calls == [["aaaa"], ["bbbb"], ["c" * 32], ["aaaa"]]
+    assert cache.stats().entries == 1
+    assert cache.stats().bytes_used == 12
+
+
+def test_query_embedding_cache_dedupes_questions_within_a_call() -> None:
+    inner = StubAsyncEmbeddings()
+    cache = AsyncQueryEmbeddingCache(inner, model="embed", max_bytes=1024)
+
+    first = asyncio.run(cache.embed_texts(["Who is Ada?"]))
+    second = asyncio.run(cache.embed_texts(["who is ada?", "who is ada?"]))
+
+    assert second == [first[0], first[0]]
+    assert inner.calls == [["Who is Ada?"]]
+    assert (cache.stats().hits, cache.stats().misses) == (1, 1)
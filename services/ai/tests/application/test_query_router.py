@@ -0,0 +1,19 @@
+from app.application.ports.vector_store import DocumentFilter
+from app.application.query_router import route_question
+
+
+def test_route_question_infers_sources_from_keywords() -> None:
+    assert route_question("Which PERMISSIONS does the admin role have?") == (
+        DocumentFilter(sources=("roles",))
+    )
+    assert route_question("Show the audit logs for yesterday") == DocumentFilter(
+        sources=("audit",)
+    )
+    assert route_question("Who deleted the report?") == DocumentFilter(
+        sources=("users", "audit")
+    )
+
+
+def test_route_question_searches_everything_when_unsure() -> None:
+    assert route_question("Summarize the knowledge base") is None
+    assert route_question("Which user changed role permissions?") is None
@@ -0,0 +1,174 @@
+import threading
+
+import pytest
+
+from app.application.ports.sources import RoleRecord
+from app.application.role_cache import RoleAbilitiesCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class StubRoles:
+    def __init__(self, release=None) -> None:
+        self.calls = []
+        self.can_create = True
+        self.release = release
+        self.error = None
+        self.extra = []
+
+    def list_roles(self, access_token, updated_after=None):
+        self.calls.append(access_token)
+        if self.release:
+            self.release.wait(timeout=2)
+        if self.error:
+            raise self.error
+        return [
+            RoleRecord(
+                role_id="11111111-1111-1111-1111-111111111111",
+                name="Admin",
+                can_view=True,
+                can_create=self.can_create,
+                can_update=False,
+                can_delete=False,
+            ),
+            *self.extra,
+        ]
+
+
+def build_cache(roles, clock, spawned=None):
+    return RoleAbilitiesCache(
+        roles,
+        ttl_seconds=60,
+        stale_seconds=300,
+        clock=clock,
+        spawn=spawned.append if spawned is not None else None,
+    )
+
+
+def test_get_role_resolves_by_id_and_name_from_one_fetch() -> None:
+    roles = StubRoles()
+    cache = build_cache(roles, FakeClock())
+
+    by_name = cache.get_role("ADMIN", "token")
+    by_id = cache.get_role("11111111-1111-1111-1111-111111111111", "token")
+
+    assert by_name is by_id
+    assert by_name.abilities.can_create is True
+    assert cache.get_role("missing", "token") is None
+    assert roles.calls == ["token"]
+
+
+def test_stale_entries_are_served_while_refreshing() -> None:
+    roles = StubRoles()
+    clock = FakeClock()
+    spawned = []
+    cache = build_cache(roles, clock, spawned)
+    cache.get_role("admin", "token")
+
+    roles.can_create = False
+    clock.now = 61
+    stale = cache.get_role("admin", "token")
+    cache.get_role("admin", "token")
+
+    assert stale.abilities.can_create is True
+    assert len(spawned) == 1
+    spawned[0]()
+    assert cache.get_role("admin", "token").abilities.can_create is False
+    assert len(roles.calls) == 2
+
+
+def test_expired_entries_reload_synchronously() -> None:
+    roles = StubRoles()
+    clock = FakeClock()
+    cache = build_cache(roles, clock, [])
+    cache.get_role("admin", "token")
+
+    roles.can_create = False
+    clock.now = 360
+
+    assert cache.get_role("admin", "token").abilities.can_create is False
+
+
+def test_concurrent_misses_share_one_fetch() -> None:
+    release = threading.Event()
+    roles = StubRoles(release)
+    cache = build_cache(roles, FakeClock())
+    results = []
+
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_role("admin", "t")))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(timeout=2)
+
+    assert len(results) == 4
+    assert len(roles.calls) == 1
+
+
+def test_failed_refresh_keeps_stale_index(caplog) -> None:
+    roles = StubRoles()
+    clock = FakeClock()
+    spawned = []
+    cache = build_cache(roles, clock, spawned)
+    cache.get_role("admin", "token")
+
+    roles.error = RuntimeError("roles down")
+    clock.now = 61
+    cache.get_role("admin", "token")
+    spawned[0]()
+
+    assert "Role cache refresh failed" in caplog.text
+    assert cache.get_role("admin", "token").name == "Admin"
+    cache.invalidate()
+    with pytest.raises(RuntimeError, match="roles down"):
+        cache.get_role("admin", "token")
+
+
+def test_invalidate_forces_reload() -> None:
+    roles = StubRoles()
+    cache = build_cache(roles, FakeClock())
+    cache.get_role("admin", "token")
+
+    roles.can_create = False
+    cache.invalidate()
+
+    assert cache.get_role("admin", "token").abilities.can_create is False
+    assert len(roles.calls) == 2
+
+
+def test_miss_refetches_once_within_the_rate_limit() -> None:
+    roles = StubRoles()
+    clock = FakeClock()
+    cache = build_cache(roles, clock)
+    cache.get_role("admin", "token")
+
+    roles.extra = [
+        RoleRecord(
+            role_id="22222222-2222-2222-2222-222222222222",
+            name="Auditor",
+            can_view=True,
+            can_create=False,
+            can_update=False,
+            can_delete=False,
+        )
+    ]
+    clock.now = 10
+
+    assert cache.get_role("auditor", "token").name == "Auditor"
+    assert cache.get_role("missing", "token") is None
+    clock.now = 14
+    assert cache.get_role("missing", "token") is None
+    assert len(roles.calls) == 2
+    clock.now = 16
+    assert cache.get_role("missing", "token") is None
+    assert len(roles.calls) == 3
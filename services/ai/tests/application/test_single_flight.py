@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from app.application.single_flight import SingleFlight
+
+
+def test_single_flight_shares_one_call_per_key() -> None:
+    flights = SingleFlight()
+    calls = []
+
+    async def work(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return f"result-{key}"
+
+    async def run():
+        return await asyncio.gather(
+            *(flights.run(key, lambda key=key: work(key)) for key in "aaab")
+        )
+
+    results = asyncio.run(run())
+
+    assert calls == ["a", "b"]
+    assert results == [
+        ("result-a", False),
+        ("result-a", True),
+        ("result-a", True),
+        ("result-b", False),
+    ]
+    stats = flights.stats()
+    assert (stats.leaders, stats.followers, stats.in_flight) == (2, 2, 0)
+    assert stats.coalesced_ratio == 0.5
+
+
+def test_single_flight_shares_failures_and_forgets_the_key() -> None:
+    flights = SingleFlight()
+    attempts = []
+
+    async def failing():
+        attempts.append(1)
+        await asyncio.sleep(0)
+        raise RuntimeError("provider down")
+
+    async def run():
+        first = await asyncio.gather(
+            flights.run("key", failing),
+            flights.run("key", failing),
+            return_exceptions=True,
+        )
+        second = await asyncio.gather(
+            flights.run("key", failing), return_exceptions=True
+        )
+        return first + second
+
+    errors = asyncio.run(run())
+
+    assert [str(error) for error in errors] == ["provider down"] * 3
+    assert attempts == [1, 1]
+
+
+def test_single_flight_followers_survive_a_cancelled_leader() -> None:
+    flights = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        return "done"
+
+    async def run():
+        leader = asyncio.ensure_future(flights.run("key", work))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.run("key", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(run()) == ("done", True)
+    assert flights.stats().coalesced_ratio == 0.5
+    assert SingleFlight().stats().coalesced_ratio == 0.0
@@ -0,0 +1,110 @@
+from datetime import datetime, timezone
+import threading
+
+import pytest
+
+from app.application.ports.sources import RoleRecord
+from app.application.source_snapshot import SourceSnapshot
+
+
+class CountingGateway:
+    def __init__(self, release=None) -> None:
+        self.user_calls = []
+        self.role_calls = []
+        self.release = release
+        self.fail = False
+        self.roles = ["role"]
+
+    def list_users(self, access_token, updated_after=None):
+        self.user_calls.append((access_token, updated_after))
+        return ["user"]
+
+    def list_roles(self, access_token, updated_after=None):
+        self.role_calls.append((access_token, updated_after))
+        if self.release:
+            self.release.wait(timeout=2)
+        if self.fail:
+            raise RuntimeError("roles down")
+        return self.roles
+
+    def get_role(self, role_ref, access_token):
+        return role_ref
+
+
+def role_record(role_id, updated_at):
+    return RoleRecord(
+        role_id=role_id,
+        name=role_id,
+        can_view=True,
+        can_create=False,
+        can_update=False,
+        can_delete=False,
+        updated_at=updated_at,
+    )
+
+
+def test_snapshot_memoizes_per_arguments() -> None:
+    gateway = CountingGateway()
+    snapshot = SourceSnapshot(gateway, gateway)
+
+    assert snapshot.list_roles("token") == ["role"]
+    assert snapshot.list_roles("token") == ["role"]
+    snapshot.list_users("token")
+    snapshot.list_users("token")
+
+    assert gateway.role_calls == [("token", None)]
+    assert gateway.user_calls == [("token", None)]
+    assert snapshot.get_role("admin", "token") == "admin"
+
+
+def test_snapshot_filters_incremental_roles_from_one_full_fetch() -> None:
+    cursor = datetime(2024, 1, 2, tzinfo=timezone.utc)
+    roles = [
+        role_record("old", datetime(2024, 1, 1, tzinfo=timezone.utc)),
+        role_record("boundary", cursor),
+        role_record("new", datetime(2024, 1, 3, tzinfo=timezone.utc)),
+        role_record("undated", None),
+    ]
+    gateway = CountingGateway()
+    gateway.roles = roles
+    snapshot = SourceSnapshot(gateway, gateway)
+
+    changed = snapshot.list_roles("token", cursor)
+    everything = snapshot.list_roles("token")
+
+    assert [role.role_id for role in changed] == ["new", "undated"]
+    assert everything == roles
+    assert gateway.role_calls == [("token", None)]
+
+
+def test_snapshot_shares_in_flight_loads() -> None:
+    release = threading.Event()
+    gateway = CountingGateway(release)
+    snapshot = SourceSnapshot(gateway, gateway)
+    results = []
+
+    threads = [
+        threading.Thread(target=lambda: results.append(snapshot.list_roles("token")))
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(timeout=2)
+
+    assert results == [["role"]] * 3
+    assert len(gateway.role_calls) == 1
+
+
+def test_snapshot_does_not_memoize_failures() -> None:
+    gateway = CountingGateway()
+    gateway.fail = True
+    snapshot = SourceSnapshot(gateway, gateway)
+
+    with pytest.raises(RuntimeError, match="roles down"):
+        snapshot.list_roles("token")
+    gateway.fail = False
+
+    assert snapshot.list_roles("token") == ["role"]
+    assert len(gateway.role_calls) == 2
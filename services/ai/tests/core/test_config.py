@@ -18,6 +18,54 @@ def test_from_env_defaults(monkeypatch) -> None:
         "RABBITMQ_EXCHANGE",
         "REQUEST_TIMEOUT_SECONDS",
         "EMBEDDING_BATCH_SIZE",
+        "EMBEDDING_CACHE_PATH",
+        "EMBEDDING_CACHE_MAX_ENTRIES",
+        "INGEST_CONCURRENCY",
+        "EMBEDDING_MAX_CONCURRENCY",
+        "EMBEDDING_RPM",
+        "EMBEDDING_TPM",
+        "EMBEDDING_MAX_RETRIES",
+        "EMBEDDING_MAX_REQUEST_TOKENS",
+        "EMBEDDING_MAX_INPUT_TOKENS",
+        "AUDIT_PAGE_SIZE",
+        "INGEST_CHUNK_SIZE",
+        "INGEST_QUEUE_SIZE",
+        "INGEST_RENDER_CONCURRENCY",
+        "INGEST_EMBED_CONCURRENCY",
+        "INGEST_UPSERT_CONCURRENCY",
+        "INGEST_MAX_CONCURRENT_JOBS",
+        "INGEST_JOB_RETENTION",
+        "INTERNAL_SERVICE_TOKEN",
+        "USER_SERVICE_INTERNAL_URL",
+        "ROLE_SERVICE_INTERNAL_URL",
+        "RABBITMQ_INDEX_QUEUE",
+        "INDEX_BATCH_SIZE",
+        "INDEX_BATCH_WINDOW_SECONDS",
+        "INDEX_MAX_ATTEMPTS",
+        "SOURCE_RESPONSE_CACHE_ENTRIES",
+        "HTTP_MAX_CONNECTIONS",
+        "HTTP_MAX_KEEPALIVE_CONNECTIONS",
+        "HTTP_KEEPALIVE_EXPIRY_SECONDS",
+        "HTTP2_ENABLED",
+        "EVENT_QUEUE_SIZE",
+        "EVENT_MAX_PUBLISH_ATTEMPTS",
+        "EVENT_QUEUE_FULL_POLICY",
+        "EVENT_PUBLISH_BLOCK_SECONDS",
+        "AUTH_TOKEN_CACHE_SIZE",
+        "AUTH_JWKS_REFRESH_SECONDS",
+        "AUTH_JWKS_MIN_REFETCH_SECONDS",
+        "ROLE_CACHE_TTL_SECONDS",
+        "ROLE_CACHE_STALE_SECONDS",
+        "ROLE_CACHE_EVENTS_ENABLED",
+        "ROLE_CACHE_MISS_REFETCH_SECONDS",
+        "CURSOR_STORE_BACKEND",
+        "CURSOR_STORE_PATH",
+        "ANSWER_CACHE_ENTRIES",
+        "ANSWER_CACHE_TTL_SECONDS",
+        "ANSWER_CACHE_SIMILARITY",
+        "QUERY_EMBEDDING_CACHE_BYTES",
+        "QUERY_COALESCING_ENABLED",
+        "QUERY_ROUTER_ENABLED",
     ]
     for key in keys:
         monkeypatch.delenv(key, raising=False)
@@ -39,6 +87,54 @@ def test_from_env_defaults(monkeypatch) -> None:
     assert settings.rabbitmq_exchange == "toka.events"
     assert settings.request_timeout_seconds == 10.0
     assert settings.max_batch_size == 128
+    assert settings.embedding_cache_path == "/tmp/toka-ai/embeddings.sqlite3"
+    assert settings.embedding_cache_max_entries == 100000
+    assert settings.ingest_concurrency == 3
+    assert settings.embedding_max_concurrency == 8
+    assert settings.embedding_requests_per_minute == 3000
+    assert settings.embedding_tokens_per_minute == 1000000
+    assert settings.embedding_max_retries == 5
+    assert settings.embedding_max_request_tokens == 300000
+    assert settings.embedding_max_input_tokens is None
+    assert settings.audit_page_size == 500
+    assert settings.ingest_chunk_size == 256
+    assert settings.ingest_queue_size == 4
+    assert settings.ingest_render_concurrency == 1
+    assert settings.ingest_embed_concurrency == 2
+    assert settings.ingest_upsert_concurrency == 1
+    assert settings.ingest_max_concurrent_jobs == 1
+    assert settings.ingest_job_retention == 100
+    assert settings.internal_service_token is None
+    assert settings.user_internal_url == "http://user:3002/internal/users"
+    assert settings.role_internal_url == "http://role:3003/internal/roles"
+    assert settings.index_queue == "ai.index"
+    assert settings.index_batch_size == 100
+    assert settings.index_batch_window_seconds == 2.0
+    assert settings.index_max_attempts == 10
+    assert settings.source_response_cache_entries == 32
+    assert settings.http_max_connections == 100
+    assert settings.http_max_keepalive_connections == 20
+    assert settings.http_keepalive_expiry_seconds == 30.0
+    assert settings.http2_enabled is True
+    assert settings.event_queue_size == 1000
+    assert settings.event_max_publish_attempts == 5
+    assert settings.event_queue_full_policy == "drop"
+    assert settings.event_publish_block_seconds == 1.0
+    assert settings.auth_token_cache_size == 1024
+    assert settings.auth_jwks_refresh_seconds == 300.0
+    assert settings.auth_jwks_min_refetch_seconds == 30.0
+    assert settings.role_cache_ttl_seconds == 60.0
+    assert settings.role_cache_stale_seconds == 300.0
+    assert settings.role_cache_events_enabled is True
+    assert settings.role_cache_miss_refetch_seconds == 5.0
+    assert settings.cursor_store_backend == "chroma"
+    assert settings.cursor_store_path == "/tmp/toka-ai/cursors.sqlite3"
+    assert settings.answer_cache_entries == 256
+    assert settings.answer_cache_ttl_seconds == 300.0
+    assert settings.answer_cache_similarity == 0.95
+    assert settings.query_embedding_cache_bytes == 16 * 1024 * 1024
+    assert settings.query_coalescing_enabled is True
+    assert settings.query_router_enabled is True
 
 
 def test_from_env_overrides(monkeypatch) -> None:
@@ -57,6 +153,54 @@ def test_from_env_overrides(monkeypatch) -> None:
     monkeypatch.setenv("RABBITMQ_EXCHANGE", "events")
     monkeypatch.setenv("REQUEST_TIMEOUT_SECONDS", "3.5")
     monkeypatch.setenv("EMBEDDING_BATCH_SIZE", "64")
+    monkeypatch.setenv("EMBEDDING_CACHE_PATH", "")
+    monkeypatch.setenv("EMBEDDING_CACHE_MAX_ENTRIES", "50")
+    monkeypatch.setenv("INGEST_CONCURRENCY", "1")
+    monkeypatch.setenv("EMBEDDING_MAX_CONCURRENCY", "16")
+    monkeypatch.setenv("EMBEDDING_RPM", "500")
+    monkeypatch.setenv("EMBEDDING_TPM", "150000")
+    monkeypatch.setenv("EMBEDDING_MAX_RETRIES", "2")
+    monkeypatch.setenv("EMBEDDING_MAX_REQUEST_TOKENS", "8000")
+    monkeypatch.setenv("EMBEDDING_MAX_INPUT_TOKENS", "512")
+    monkeypatch.setenv("AUDIT_PAGE_SIZE", "200")
+    monkeypatch.setenv("INGEST_CHUNK_SIZE", "64")
+    monkeypatch.setenv("INGEST_QUEUE_SIZE", "8")
+    monkeypatch.setenv("INGEST_RENDER_CONCURRENCY", "2")
+    monkeypatch.setenv("INGEST_EMBED_CONCURRENCY", "4")
+    monkeypatch.setenv("INGEST_UPSERT_CONCURRENCY", "3")
+    monkeypatch.setenv("INGEST_MAX_CONCURRENT_JOBS", "2")
+    monkeypatch.setenv("INGEST_JOB_RETENTION", "10")
+    monkeypatch.setenv("INTERNAL_SERVICE_TOKEN", "secret")
+    monkeypatch.setenv("USER_SERVICE_INTERNAL_URL", "http://users/internal")
+    monkeypatch.setenv("ROLE_SERVICE_INTERNAL_URL", "http://roles/internal")
+    monkeypatch.setenv("RABBITMQ_INDEX_QUEUE", "index")
+    monkeypatch.setenv("INDEX_BATCH_SIZE", "20")
+    monkeypatch.setenv("INDEX_BATCH_WINDOW_SECONDS", "0.5")
+    monkeypatch.setenv("INDEX_MAX_ATTEMPTS", "3")
+    monkeypatch.setenv("SOURCE_RESPONSE_CACHE_ENTRIES", "0")
+    monkeypatch.setenv("HTTP_MAX_CONNECTIONS", "10")
+    monkeypatch.setenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "5")
+    monkeypatch.setenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "12.5")
+    monkeypatch.setenv("HTTP2_ENABLED", "false")
+    monkeypatch.setenv("EVENT_QUEUE_SIZE", "10")
+    monkeypatch.setenv("EVENT_MAX_PUBLISH_ATTEMPTS", "3")
+    monkeypatch.setenv("EVENT_QUEUE_FULL_POLICY", "block")
+    monkeypatch.setenv("EVENT_PUBLISH_BLOCK_SECONDS", "0.25")
+    monkeypatch.setenv("AUTH_TOKEN_CACHE_SIZE", "0")
+    monkeypatch.setenv("AUTH_JWKS_REFRESH_SECONDS", "60")
+    monkeypatch.setenv("AUTH_JWKS_MIN_REFETCH_SECONDS", "5")
+    monkeypatch.setenv("ROLE_CACHE_TTL_SECONDS", "10")
+    monkeypatch.setenv("ROLE_CACHE_STALE_SECONDS", "20")
+    monkeypatch.setenv("ROLE_CACHE_EVENTS_ENABLED", "0")
+    monkeypatch.setenv("ROLE_CACHE_MISS_REFETCH_SECONDS", "2")
+    monkeypatch.setenv("CURSOR_STORE_BACKEND", "SQLite")
+    monkeypatch.setenv("CURSOR_STORE_PATH", "/data/cursors.sqlite3")
+    monkeypatch.setenv("ANSWER_CACHE_ENTRIES", "0")
+    monkeypatch.setenv("ANSWER_CACHE_TTL_SECONDS", "30")
+    monkeypatch.setenv("ANSWER_CACHE_SIMILARITY", "0.9")
+    monkeypatch.setenv("QUERY_EMBEDDING_CACHE_BYTES", "0")
+    monkeypatch.setenv("QUERY_COALESCING_ENABLED", "false")
+    monkeypatch.setenv("QUERY_ROUTER_ENABLED", "no")
 
     settings = Settings.from_env()
 
@@ -75,3 +219,51 @@ def test_from_env_overrides(monkeypatch) -> None:
     assert settings.rabbitmq_exchange == "events"
     assert settings.request_timeout_seconds == 3.5
     assert settings.max_batch_size == 64
+    assert settings.embedding_cache_path is None
+    assert settings.embedding_cache_max_entries == 50
+    assert settings.ingest_concurrency == 1
+    assert settings.embedding_max_concurrency == 16
+    assert settings.embedding_requests_per_minute == 500
+    assert settings.embedding_tokens_per_minute == 150000
+    assert settings.embedding_max_retries == 2
+    assert settings.embedding_max_request_tokens == 8000
+    assert settings.embedding_max_input_tokens == 512
+    assert settings.audit_page_size == 200
+    assert settings.ingest_chunk_size == 64
+    assert settings.ingest_queue_size == 8
+    assert settings.ingest_render_concurrency == 2
+    assert settings.ingest_embed_concurrency == 4
+    assert settings.ingest_upsert_concurrency == 3
+    assert settings.ingest_max_concurrent_jobs == 2
+    assert settings.ingest_job_retention == 10
+    assert settings.internal_service_token == "secret"
+    assert settings.user_internal_url == "http://users/internal"
+    assert settings.role_internal_url == "http://roles/internal"
+    assert settings.index_queue == "index"
+    assert settings.index_batch_size == 20
+    assert settings.index_batch_window_seconds == 0.5
+    assert settings.index_max_attempts == 3
+    assert settings.source_response_cache_entries == 0
+    assert settings.http_max_connections == 10
+    assert settings.http_max_keepalive_connections == 5
+    assert settings.http_keepalive_expiry_seconds == 12.5
+    assert settings.http2_enabled is False
+    assert settings.event_queue_size == 10
+    assert settings.event_max_publish_attempts == 3
+    assert settings.event_queue_full_policy == "block"
+    assert settings.event_publish_block_seconds == 0.25
+    assert settings.auth_token_cache_size == 0
+    assert settings.auth_jwks_refresh_seconds == 60.0
+    assert settings.auth_jwks_min_refetch_seconds == 5.0
+    assert settings.role_cache_ttl_seconds == 10.0
+    assert settings.role_cache_stale_seconds == 20.0
+    assert settings.role_cache_events_enabled is False
+    assert settings.role_cache_miss_refetch_seconds == 2.0
+    assert settings.cursor_store_backend == "sqlite"
+    assert settings.cursor_store_path == "/data/cursors.sqlite3"
+    assert settings.answer_cache_entries == 0
+    assert settings.answer_cache_ttl_seconds == 30.0
+    assert settings.answer_cache_similarity == 0.9
+    assert settings.query_embedding_cache_bytes == 0
+    assert settings.query_coalescing_enabled is False
+    assert settings.query_router_enabled is False
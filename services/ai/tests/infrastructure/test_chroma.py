@@ -1,7 +1,9 @@
+import asyncio
 from datetime import datetime, timezone
 
+from app.application.ports.vector_store import DocumentFilter
 from app.core.config import Settings
-from app.domain.source import SourceType
+from app.domain.source import SourceCursor, SourceType
 from app.infrastructure.chroma import client as chroma_client
 from app.infrastructure.chroma import cursor_store, vector_store
 from app.domain.document import EmbeddingDocument
@@ -10,18 +12,29 @@ from app.domain.document import EmbeddingDocument
 class StubCollection:
     def __init__(self) -> None:
         self.upsert_calls = []
+        self.query_calls = []
         self.query_result = {}
         self.get_result = {}
+        self.get_results = []
+        self.get_calls = []
+        self.delete_calls = []
 
     def upsert(self, **kwargs) -> None:
         self.upsert_calls.append(kwargs)
 
     def query(self, **kwargs):
+        self.query_calls.append(kwargs)
         return self.query_result
 
     def get(self, **kwargs):
+        self.get_calls.append(kwargs)
+        if self.get_results:
+            return self.get_results.pop(0)
         return self.get_result
 
+    def delete(self, **kwargs) -> None:
+        self.delete_calls.append(kwargs)
+
 
 class StubClient:
     def __init__(self, collection) -> None:
@@ -94,19 +107,292 @@ def test_chroma_vector_store_upsert_and_query(monkeypatch) -> None:
     assert results[0].metadata["source"] == "users"
 
 
+def test_build_async_chroma_client_parses_url(monkeypatch) -> None:
+    called = {}
+
+    async def fake_async_http_client(host, port):
+        called["host"] = host
+        called["port"] = port
+        return "client"
+
+    monkeypatch.setattr(
+        chroma_client.chromadb, "AsyncHttpClient", fake_async_http_client
+    )
+
+    result = asyncio.run(
+        chroma_client.build_async_chroma_client(build_settings("https://db"))
+    )
+
+    assert result == "client"
+    assert called == {"host": "db", "port": 8000}
+
+
+def test_async_chroma_vector_store_connects_once_and_queries() -> None:
+    class StubAsyncCollection:
+        def __init__(self) -> None:
+            self.calls = []
+
+        async def query(self, **kwargs):
+            self.calls.append(kwargs)
+            await asyncio.sleep(0)
+            return {
+                "documents": [["doc1"]],
+                "metadatas": [[None]],
+                "distances": [[0.3]],
+                "ids": [["doc-1"]],
+            }
+
+    class StubServer:
+        def __init__(self) -> None:
+            self.closed = False
+
+        async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+            self.closed = True
+
+    class StubAsyncClient:
+        def __init__(self) -> None:
+            self.collection = StubAsyncCollection()
+            self.collections = []
+            self._server = StubServer()
+
+        async def get_or_create_collection(self, name, metadata):
+            self.collections.append((name, metadata))
+            await asyncio.sleep(0)
+            return self.collection
+
+    client = StubAsyncClient()
+    connects = []
+
+    async def connect():
+        connects.append(1)
+        return client
+
+    store = vector_store.AsyncChromaVectorStore(build_settings(), connect)
+
+    async def run_queries():
+        return await asyncio.gather(*(store.query([0.1], 2) for _ in range(5)))
+
+    results = asyncio.run(run_queries())
+
+    assert connects == [1]
+    assert client.collections == [("collection", {"hnsw:space": "cosine"})]
+    assert len(client.collection.calls) == 5
+    assert client.collection.calls[0]["n_results"] == 2
+    assert results[0][0].doc_id == "doc-1"
+    assert results[0][0].metadata == {}
+    assert results[0][0].distance == 0.3
+
+    asyncio.run(store.aclose())
+
+    assert client._server.closed is True
+    assert store.collection is None
+
+
+def test_chroma_vector_store_pushes_filters_down_as_where_clauses(
+    monkeypatch,
+) -> None:
+    collection = StubCollection()
+    collection.query_result = {"documents": [[]], "ids": [[]]}
+    client = StubClient(collection)
+    monkeypatch.setattr(vector_store, "build_chroma_client", lambda settings: client)
+    store = vector_store.ChromaVectorStore(build_settings())
+
+    store.query([0.1], 3)
+    store.query([0.1], 3, DocumentFilter(sources=("roles",)))
+    store.query([0.1], 3, DocumentFilter(fields=(("role_id", "r1"),)))
+    store.query(
+        [0.1],
+        3,
+        DocumentFilter(sources=("users", "audit"), fields=(("action", "delete"),)),
+    )
+    store.query([0.1], 3, DocumentFilter())
+
+    assert [call["where"] for call in collection.query_calls] == [
+        None,
+        {"source": "roles"},
+        {"role_id": "r1"},
+        {
+            "$and": [
+                {"source": {"$in": ["users", "audit"]}},
+                {"action": "delete"},
+            ]
+        },
+        None,
+    ]
+
+
+def test_chroma_vector_store_get_fingerprints(monkeypatch) -> None:
+    collection = StubCollection()
+    collection.get_result = {
+        "ids": ["users:u1", "users:u2"],
+        "metadatas": [{"content_hash": "abc"}, {"source": "users"}],
+    }
+    client = StubClient(collection)
+    monkeypatch.setattr(vector_store, "build_chroma_client", lambda settings: client)
+
+    store = vector_store.ChromaVectorStore(build_settings())
+    fingerprints = store.get_fingerprints(["users:u1", "users:u2"])
+
+    assert fingerprints == {"users:u1": "abc"}
+    assert collection.get_calls[0]["ids"] == ["users:u1", "users:u2"]
+    assert store.get_fingerprints([]) == {}
+
+
+def test_chroma_vector_store_delete_in_batches(monkeypatch) -> None:
+    collection = StubCollection()
+    client = StubClient(collection)
+    monkeypatch.setattr(vector_store, "build_chroma_client", lambda settings: client)
+    monkeypatch.setattr(vector_store, "_GET_BATCH_SIZE", 2)
+
+    store = vector_store.ChromaVectorStore(build_settings())
+    store.delete(["users:u1", "users:u2", "roles:r1"])
+    store.delete([])
+
+    assert collection.delete_calls == [
+        {"ids": ["users:u1", "users:u2"]},
+        {"ids": ["roles:r1"]},
+    ]
+
+
+def test_chroma_vector_store_iter_doc_ids_pages_by_source(monkeypatch) -> None:
+    collection = StubCollection()
+    collection.get_results = [
+        {"ids": ["users:u1", "users:u2"]},
+        {"ids": ["users:u3"]},
+    ]
+    client = StubClient(collection)
+    monkeypatch.setattr(vector_store, "build_chroma_client", lambda settings: client)
+    monkeypatch.setattr(vector_store, "_GET_BATCH_SIZE", 2)
+
+    store = vector_store.ChromaVectorStore(build_settings())
+    pages = list(store.iter_doc_ids("users"))
+
+    assert pages == [["users:u1", "users:u2"], ["users:u3"]]
+    assert collection.get_calls == [
+        {"where": {"source": "users"}, "include": [], "limit": 2, "offset": 0},
+        {"where": {"source": "users"}, "include": [], "limit": 2, "offset": 2},
+    ]
+
+
+def test_chroma_vector_store_iter_doc_ids_filters_by_fields(monkeypatch) -> None:
+    collection = StubCollection()
+    collection.get_results = [{"ids": ["users:u1"]}]
+    client = StubClient(collection)
+    monkeypatch.setattr(vector_store, "build_chroma_client", lambda settings: client)
+
+    store = vector_store.ChromaVectorStore(build_settings())
+    pages = list(store.iter_doc_ids("users", (("role_id", "role-1"),)))
+
+    assert pages == [["users:u1"]]
+    assert collection.get_calls[0]["where"] == {
+        "$and": [{"source": "users"}, {"role_id": "role-1"}]
+    }
+
+
 def test_chroma_cursor_store_get_and_set(monkeypatch) -> None:
     collection = StubCollection()
-    collection.get_result = {"metadatas": [{"cursor": "2024-01-01T00:00:00Z"}]}
+    collection.get_result = {
+        "ids": ["users"],
+        "metadatas": [{"cursor": "2024-01-01T00:00:00Z"}],
+    }
     client = StubClient(collection)
     monkeypatch.setattr(cursor_store, "build_chroma_client", lambda settings: client)
 
     store = cursor_store.ChromaCursorStore(build_settings())
     cursor = store.get_cursor(SourceType.users)
-    store.set_cursor(SourceType.users, datetime(2024, 1, 2, tzinfo=timezone.utc))
+    store.set_cursor(
+        SourceType.audit, SourceCursor(datetime(2024, 1, 2, tzinfo=timezone.utc), "a9")
+    )
 
-    assert cursor.isoformat() == "2024-01-01T00:00:00+00:00"
-    assert collection.upsert_calls[0]["ids"] == ["users"]
+    assert cursor.timestamp.isoformat() == "2024-01-01T00:00:00+00:00"
+    assert cursor.key == ""
+    assert collection.upsert_calls[0]["ids"] == ["audit"]
     assert collection.upsert_calls[0]["documents"] == ["cursor"]
+    assert collection.upsert_calls[0]["metadatas"] == [
+        {"cursor": "2024-01-02T00:00:00+00:00", "key": "a9"}
+    ]
+
+
+class CursorCollection(StubCollection):
+    def __init__(self, metadatas) -> None:
+        super().__init__()
+        self.metadatas = dict(metadatas)
+        self.after_upsert = None
+
+    def get(self, **kwargs):
+        self.get_calls.append(kwargs)
+        ids = [doc_id for doc_id in kwargs["ids"] if doc_id in self.metadatas]
+        return {"ids": ids, "metadatas": [self.metadatas[doc_id] for doc_id in ids]}
+
+    def upsert(self, **kwargs) -> None:
+        self.upsert_calls.append(kwargs)
+        self.metadatas.update(zip(kwargs["ids"], kwargs["metadatas"]))
+        if self.after_upsert:
+            self.after_upsert(self)
+
+
+def test_chroma_cursor_store_batches_reads_and_advances_forwards() -> None:
+    collection = CursorCollection(
+        {
+            "audit": {"cursor": "2024-01-05T00:00:00+00:00", "key": "a2"},
+            "users": {"cursor": "2024-01-01T00:00:00+00:00"},
+        }
+    )
+    store = cursor_store.ChromaCursorStore(build_settings(), StubClient(collection))
+    newer = SourceCursor(datetime(2024, 1, 2, tzinfo=timezone.utc))
+    boundary = SourceCursor(datetime(2024, 1, 5, tzinfo=timezone.utc), "a2")
+
+    stored = store.advance_cursors(
+        {
+            SourceType.users: newer,
+            SourceType.audit: SourceCursor(boundary.timestamp, "a1"),
+            SourceType.roles: newer,
+        }
+    )
+
+    assert collection.get_calls == [
+        {"ids": ["users", "audit", "roles"], "include": ["metadatas"]}
+    ] * 2
+    assert [call["ids"] for call in collection.upsert_calls] == [["users", "roles"]]
+    assert stored == {
+        SourceType.users: newer,
+        SourceType.roles: newer,
+        SourceType.audit: boundary,
+    }
+    assert store.get_cursors([]) == {}
+
+
+def test_chroma_cursor_store_rewrites_a_cursor_moved_backwards() -> None:
+    collection = CursorCollection({})
+    newer = SourceCursor(datetime(2024, 1, 2, tzinfo=timezone.utc), "u2")
+
+    def stale_writer(target) -> None:
+        target.after_upsert = None
+        target.metadatas["users"] = {"cursor": "2024-01-01T00:00:00+00:00"}
+
+    collection.after_upsert = stale_writer
+    store = cursor_store.ChromaCursorStore(build_settings(), StubClient(collection))
+
+    stored = store.advance_cursors({SourceType.users: newer})
+
+    assert stored == {SourceType.users: newer}
+    assert len(collection.upsert_calls) == 2
+
+
+def test_chroma_cursor_store_gives_up_after_bounded_retries() -> None:
+    collection = CursorCollection({})
+    newer = SourceCursor(datetime(2024, 1, 2, tzinfo=timezone.utc))
+
+    def stale_writer(target) -> None:
+        target.metadatas["users"] = {"cursor": "2024-01-01T00:00:00+00:00"}
+
+    collection.after_upsert = stale_writer
+    store = cursor_store.ChromaCursorStore(build_settings(), StubClient(collection))
+
+    stored = store.advance_cursors({SourceType.users: newer})
+
+    assert stored == {SourceType.users: newer}
+    assert len(collection.upsert_calls) == cursor_store._ADVANCE_ATTEMPTS
 
 
 def test_parse_datetime_invalid() -> None:
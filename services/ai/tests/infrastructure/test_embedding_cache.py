@@ -0,0 +1,122 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.infrastructure.sqlite.embedding_cache import SqliteEmbeddingCache
+
+
+class StubEmbeddings:
+    def __init__(self) -> None:
+        self.calls = []
+
+    def embed_texts(self, inputs):
+        self.calls.append(list(inputs))
+        return [[float(len(text)), 0.5] for text in inputs]
+
+
+class FailingEmbeddings:
+    def embed_texts(self, inputs):
+        raise RuntimeError("provider down")
+
+
+@pytest.fixture
+def build_cache(tmp_path):
+    caches = []
+
+    def factory(inner=None, model="embed", max_entries=100, path=None):
+        cache = SqliteEmbeddingCache(
+            inner or StubEmbeddings(),
+            model=model,
+            path=path or str(tmp_path / "cache" / "embeddings.sqlite3"),
+            max_entries=max_entries,
+        )
+        caches.append(cache)
+        return cache
+
+    yield factory
+    for cache in caches:
+        cache.close()
+
+
+def test_cache_dedupes_and_preserves_order(build_cache) -> None:
+    cache = build_cache()
+
+    result = cache.embed_texts(["aa", "b", "aa"])
+
+    assert result == [[2.0, 0.5], [1.0, 0.5], [2.0, 0.5]]
+    assert cache.inner.calls == [["aa", "b"]]
+    assert cache.stats().misses == 2
+    assert cache.stats().hits == 0
+
+
+def test_cache_only_sends_misses_to_provider(build_cache) -> None:
+    cache = build_cache()
+    cache.embed_texts(["aa", "b"])
+
+    result = cache.embed_texts(["ccc", "aa", "b"])
+
+    assert result == [[3.0, 0.5], [2.0, 0.5], [1.0, 0.5]]
+    assert cache.inner.calls[-1] == ["ccc"]
+    stats = cache.stats()
+    assert stats.hits == 2
+    assert stats.misses == 3
+    assert stats.entries == 3
+
+
+def test_cache_counts_hits_and_misses_from_concurrent_workers(build_cache) -> None:
+    cache = build_cache()
+    cache.embed_texts(["warm"])
+    texts = [["warm", f"text-{index}"] for index in range(64)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(cache.embed_texts, texts))
+
+    stats = cache.stats()
+    assert stats.hits == 64
+    assert stats.misses == 65
+
+
+def test_cache_is_shared_across_instances(build_cache) -> None:
+    build_cache().embed_texts(["aa"])
+    second = build_cache()
+
+    assert second.embed_texts(["aa"]) == [[2.0, 0.5]]
+    assert second.inner.calls == []
+
+
+def test_cache_is_keyed_by_model(build_cache) -> None:
+    build_cache(model="small").embed_texts(["aa"])
+    other = build_cache(model="large")
+
+    other.embed_texts(["aa"])
+
+    assert other.inner.calls == [["aa"]]
+    assert other.stats().entries == 2
+
+
+def test_cache_evicts_least_recently_used(build_cache) -> None:
+    cache = build_cache(max_entries=2)
+    cache.embed_texts(["a"])
+    cache.embed_texts(["bb"])
+    cache.embed_texts(["a"])
+    cache.embed_texts(["ccc"])
+
+    cache.embed_texts(["a", "bb"])
+
+    assert cache.stats().entries == 2
+    assert cache.inner.calls[-1] == ["bb"]
+
+
+def test_cache_does_not_store_failed_batches(build_cache) -> None:
+    cache = build_cache(inner=FailingEmbeddings())
+
+    with pytest.raises(RuntimeError):
+        cache.embed_texts(["aa"])
+
+    assert cache.stats().entries == 0
+
+
+def test_cache_supports_in_memory_database(build_cache) -> None:
+    cache = build_cache(path=":memory:")
+
+    assert cache.embed_texts(["aa"]) == [[2.0, 0.5]]
@@ -0,0 +1,163 @@
+import threading
+
+import httpx
+import pytest
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    BadRequestError,
+    InternalServerError,
+    RateLimitError,
+)
+
+from app.infrastructure.openai import dispatcher
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def build_rate_limit_error(headers=None) -> RateLimitError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+    response = httpx.Response(429, headers=headers or {}, request=request)
+    return RateLimitError("rate limited", response=response, body=None)
+
+
+def build_dispatcher(clock, rpm=6000, tpm=1_000_000, concurrency=1, retries=3):
+    limiter = dispatcher.RateLimiter(rpm, tpm, clock=clock, sleep=clock.sleep)
+    return dispatcher.BatchDispatcher(
+        limiter=limiter,
+        max_concurrency=concurrency,
+        max_retries=retries,
+        sleep=clock.sleep,
+    )
+
+
+def test_token_bucket_reserves_and_refills() -> None:
+    clock = FakeClock()
+    bucket = dispatcher.TokenBucket(60, clock)
+
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(2) == pytest.approx(2.0)
+
+    clock.now += 10
+    assert bucket.reserve(1) == 0.0
+
+
+def test_rate_limiter_waits_for_token_budget() -> None:
+    clock = FakeClock()
+    limiter = dispatcher.RateLimiter(600, 120, clock=clock, sleep=clock.sleep)
+
+    limiter.acquire(120)
+    limiter.acquire(60)
+
+    assert clock.sleeps == [pytest.approx(30.0)]
+
+
+def test_dispatcher_runs_batches_in_parallel_and_keeps_order() -> None:
+    clock = FakeClock()
+    barrier = threading.Barrier(3, timeout=5)
+
+    def call(batch):
+        barrier.wait()
+        return [text.upper() for text in batch]
+
+    runner = build_dispatcher(clock, concurrency=3)
+    result = runner.run([["a"], ["b", "c"], ["d"]], call, len)
+
+    assert result == [["A"], ["B", "C"], ["D"]]
+
+
+def test_dispatcher_honors_retry_after() -> None:
+    clock = FakeClock()
+    attempts = []
+
+    def call(batch):
+        attempts.append(batch)
+        if len(attempts) == 1:
+            raise build_rate_limit_error({"retry-after": "2"})
+        if len(attempts) == 2:
+            raise build_rate_limit_error({"retry-after-ms": "250"})
+        return batch
+
+    result = build_dispatcher(clock).run([["a"]], call, len)
+
+    assert result == [["a"]]
+    assert clock.sleeps == [2.0, 0.25]
+
+
+def test_dispatcher_backs_off_without_retry_after(monkeypatch) -> None:
+    clock = FakeClock()
+    monkeypatch.setattr(dispatcher.random, "random", lambda: 1.0)
+    attempts = []
+
+    def call(batch):
+        attempts.append(batch)
+        if len(attempts) < 3:
+            raise build_rate_limit_error({"retry-after": "soon"})
+        return batch
+
+    build_dispatcher(clock).run([["a"]], call, len)
+
+    assert clock.sleeps == [0.5, 1.0]
+
+
+def test_dispatcher_gives_up_after_max_retries() -> None:
+    clock = FakeClock()
+
+    def call(batch):
+        raise build_rate_limit_error()
+
+    with pytest.raises(RateLimitError):
+        build_dispatcher(clock, retries=2).run([["a"]], call, len)
+
+    assert len(clock.sleeps) == 2
+
+
+def test_dispatcher_retries_transient_provider_failures(monkeypatch) -> None:
+    clock = FakeClock()
+    monkeypatch.setattr(dispatcher.random, "random", lambda: 1.0)
+    request = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+    failures = [
+        APITimeoutError(request=request),
+        APIConnectionError(request=request),
+        InternalServerError(
+            "bad gateway",
+            response=httpx.Response(502, request=request),
+            body=None,
+        ),
+    ]
+
+    def call(batch):
+        if failures:
+            raise failures.pop(0)
+        return batch
+
+    result = build_dispatcher(clock).run([["a"]], call, len)
+
+    assert result == [["a"]]
+    assert clock.sleeps == [0.5, 1.0, 2.0]
+
+
+def test_dispatcher_does_not_retry_client_errors() -> None:
+    clock = FakeClock()
+    request = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+
+    def call(batch):
+        raise BadRequestError(
+            "too long", response=httpx.Response(400, request=request), body=None
+        )
+
+    with pytest.raises(BadRequestError):
+        build_dispatcher(clock).run([["a"]], call, len)
+
+    assert clock.sleeps == []
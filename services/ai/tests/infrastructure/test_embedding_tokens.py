@@ -0,0 +1,93 @@
+import builtins
+import sys
+import types
+
+import pytest
+
+from app.infrastructure.openai import tokens
+
+
+@pytest.fixture(autouse=True)
+def clear_encoder_cache():
+    tokens.get_token_encoder.cache_clear()
+    yield
+    tokens.get_token_encoder.cache_clear()
+
+
+class StubEncoder:
+    def encode(self, text):
+        return text.split()
+
+    def decode(self, values):
+        return " ".join(values)
+
+
+def test_pack_batches_respects_token_and_item_limits() -> None:
+    items = [("a", 4), ("b", 4), ("c", 3), ("d", 1), ("e", 1)]
+
+    batches = tokens.pack_batches(items, max_tokens=8, max_items=2)
+
+    assert [batch.texts for batch in batches] == [["a", "b"], ["c", "d"], ["e"]]
+    assert [batch.tokens for batch in batches] == [8, 4, 1]
+
+
+def test_pack_batches_keeps_oversized_item_alone() -> None:
+    batches = tokens.pack_batches([("a", 1), ("b", 20), ("c", 1)], 10, 100)
+
+    assert [batch.texts for batch in batches] == [["a"], ["b"], ["c"]]
+    assert tokens.pack_batches([], 10, 100) == []
+
+
+def test_token_counter_falls_back_to_characters(monkeypatch) -> None:
+    monkeypatch.setattr(tokens, "get_token_encoder", lambda model: None)
+    counter = tokens.TokenCounter("embed")
+
+    assert counter.count("abcdefg") == 3
+    assert counter.count("") == 1
+    assert counter.truncate("abcdefg", 2) == "abcdef"
+
+
+def test_token_counter_uses_encoder(monkeypatch) -> None:
+    monkeypatch.setattr(tokens, "get_token_encoder", lambda model: StubEncoder())
+    counter = tokens.TokenCounter("embed")
+
+    assert counter.count("one two three") == 3
+    assert counter.truncate("one two three", 2) == "one two"
+
+
+def test_get_token_encoder_without_tiktoken(monkeypatch, caplog) -> None:
+    real_import = builtins.__import__
+
+    def fake_import(name, *args, **kwargs):
+        if name == "tiktoken":
+            raise ModuleNotFoundError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", fake_import)
+
+    assert tokens.get_token_encoder("embed") is None
+    assert tokens.get_token_encoder("embed") is None
+    assert caplog.text.count("tiktoken is not installed") == 1
+
+
+def test_get_token_encoder_with_tiktoken(monkeypatch) -> None:
+    def encoding_for_model(model):
+        if model == "unknown":
+            raise KeyError(model)
+        return f"model:{model}"
+
+    fake = types.SimpleNamespace(
+        encoding_for_model=encoding_for_model,
+        get_encoding=lambda name: f"encoding:{name}",
+    )
+    monkeypatch.setitem(sys.modules, "tiktoken", fake)
+
+    assert tokens.get_token_encoder("text-embedding-3-small") == (
+        "model:text-embedding-3-small"
+    )
+    assert tokens.get_token_encoder("unknown") == "encoding:cl100k_base"
+
+
+def test_max_input_tokens_for_model() -> None:
+    assert tokens.max_input_tokens_for("text-embedding-3-large") == 8191
+    assert tokens.max_input_tokens_for("custom") == 8191
@@ -1,40 +1,57 @@
+from dataclasses import replace
 import json
+import threading
+import time
+
+from pika.exceptions import AMQPConnectionError, NackError
 
 from app.core.config import Settings
 from app.infrastructure.rabbitmq import event_bus
 
 
 class StubChannel:
-    def __init__(self) -> None:
+    def __init__(self, fail_after=None) -> None:
         self.exchange_calls = []
         self.publish_calls = []
-        self.closed = False
+        self.confirms = False
+        self.is_open = True
+        self.fail_after = fail_after
 
     def exchange_declare(self, **kwargs) -> None:
         self.exchange_calls.append(kwargs)
 
+    def confirm_delivery(self) -> None:
+        self.confirms = True
+
     def basic_publish(self, **kwargs) -> None:
+        if self.fail_after is not None and len(self.publish_calls) >= self.fail_after:
+            self.is_open = False
+            raise NackError([])
         self.publish_calls.append(kwargs)
 
-    def close(self) -> None:
-        self.closed = True
-
 
 class StubConnection:
-    def __init__(self, params) -> None:
-        self.params = params
-        self.channel_obj = StubChannel()
-        self.closed = False
+    def __init__(self, channel) -> None:
+        self.channel_obj = channel
+        self.is_open = True
+        self.processed = 0
+        self.error = None
 
     def channel(self):
         return self.channel_obj
 
+    def process_data_events(self, time_limit=None) -> None:
+        self.processed += 1
+        if self.error:
+            self.is_open = False
+            raise self.error
+
     def close(self) -> None:
-        self.closed = True
+        self.is_open = False
 
 
-def build_settings() -> Settings:
-    return Settings(
+def build_settings(**changes) -> Settings:
+    settings = Settings(
         openai_api_key=None,
         openai_chat_model="gpt",
         openai_embedding_model="embed",
@@ -51,22 +68,162 @@ def build_settings() -> Settings:
         request_timeout_seconds=1.0,
         max_batch_size=10,
     )
+    return replace(settings, **changes)
 
 
-def test_publish_sends_envelope(monkeypatch) -> None:
-    connection = StubConnection("params")
-    monkeypatch.setattr(event_bus.pika, "BlockingConnection", lambda params: connection)
+def test_publish_enqueues_and_drains_over_one_connection() -> None:
+    connections = []
 
-    bus = event_bus.RabbitMqEventBus(build_settings())
-    bus.publish("AiIngested", {"k": "v"})
+    def connect():
+        connections.append(StubConnection(StubChannel()))
+        return connections[-1]
 
-    assert connection.channel_obj.exchange_calls[0]["exchange"] == "events"
-    assert connection.channel_obj.publish_calls
-    payload = json.loads(connection.channel_obj.publish_calls[0]["body"])
+    bus = event_bus.RabbitMqEventBus(build_settings(), connect=connect)
+    bus.publish("AiIngested", {"k": "v"})
+    bus.publish("AiQueried", {"q": 1})
+    bus.close()
+
+    assert len(connections) == 1
+    channel = connections[0].channel_obj
+    assert channel.exchange_calls == [
+        {"exchange": "events", "exchange_type": "topic", "durable": True}
+    ]
+    assert channel.confirms is True
+    assert [call["routing_key"] for call in channel.publish_calls] == [
+        "ai.ingested",
+        "ai.queried",
+    ]
+    payload = json.loads(channel.publish_calls[0]["body"])
     assert payload["name"] == "AiIngested"
     assert payload["payload"] == {"k": "v"}
     assert payload["occurredAt"]
-    assert connection.closed is True
+    assert connections[0].is_open is False
+
+
+def test_publisher_reconnects_and_retries_unconfirmed_events() -> None:
+    channels = [StubChannel(fail_after=1), StubChannel()]
+    delays = []
+    attempts = []
+
+    def connect():
+        attempts.append(len(attempts))
+        if len(attempts) == 2:
+            raise AMQPConnectionError("broker down")
+        return StubConnection(channels.pop(0))
+
+    first, second = channels
+    bus = event_bus.RabbitMqEventBus(
+        build_settings(), connect=connect, wait=delays.append
+    )
+    for index in range(3):
+        bus.queue.put_nowait(
+            event_bus._OutgoingEvent(f"E{index}", f"e.{index}", str(index))
+        )
+    bus.start()
+    deadline = time.monotonic() + 2
+    while len(second.publish_calls) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    bus.close()
+
+    assert [call["body"] for call in first.publish_calls] == ["0"]
+    assert [call["body"] for call in second.publish_calls] == ["1", "2"]
+    assert delays == [2.0, 4.0]
+
+
+def test_publisher_drops_event_the_broker_keeps_rejecting(caplog) -> None:
+    class RejectingChannel(StubChannel):
+        def basic_publish(self, **kwargs) -> None:
+            if kwargs["body"] == "bad":
+                raise NackError([])
+            self.publish_calls.append(kwargs)
+
+    channel = RejectingChannel()
+    delays = []
+    bus = event_bus.RabbitMqEventBus(
+        build_settings(event_max_publish_attempts=2),
+        connect=lambda: StubConnection(channel),
+        wait=delays.append,
+    )
+    bus.queue.put_nowait(event_bus._OutgoingEvent("Bad", "bad", "bad"))
+    bus.queue.put_nowait(event_bus._OutgoingEvent("Good", "good", "good"))
+    bus.start()
+    deadline = time.monotonic() + 2
+    while not channel.publish_calls and time.monotonic() < deadline:
+        time.sleep(0.01)
+    bus.close()
+
+    assert [call["body"] for call in channel.publish_calls] == ["good"]
+    assert delays == [2.0]
+    assert bus.dropped == 1
+    assert "Dropping Bad event: broker rejected it 2 times" in caplog.text
+
+
+def test_idle_publisher_services_heartbeats_and_reconnects_after_drop(
+    monkeypatch,
+) -> None:
+    monkeypatch.setattr(event_bus, "_POLL_SECONDS", 0.01)
+    connections = []
+
+    def connect():
+        connections.append(StubConnection(StubChannel()))
+        return connections[-1]
+
+    bus = event_bus.RabbitMqEventBus(build_settings(), connect=connect)
+    bus.publish("AiIngested", {"k": "v"})
+    for _ in range(200):
+        if connections and connections[0].processed >= 2:
+            break
+        time.sleep(0.01)
+    connections[0].error = AMQPConnectionError("heartbeat timeout")
+    for _ in range(200):
+        if bus._connection is None:
+            break
+        time.sleep(0.01)
+    bus.publish("AiQueried", {"q": 1})
+    bus.close()
+
+    assert connections[0].processed >= 2
+    assert len(connections) == 2
+    assert len(connections[1].channel_obj.publish_calls) == 1
+
+
+def test_publish_drops_when_queue_is_full() -> None:
+    release = threading.Event()
+
+    def connect():
+        release.wait(timeout=2)
+        return StubConnection(StubChannel())
+
+    bus = event_bus.RabbitMqEventBus(
+        build_settings(event_queue_size=1), connect=connect
+    )
+    for index in range(4):
+        bus.publish("AiQueried", {"index": index})
+
+    assert bus.dropped >= 2
+    release.set()
+    bus.close()
+    bus.publish("AiQueried", {})
+    assert bus.dropped >= 3
+
+
+def test_publish_blocks_then_drops_with_block_policy() -> None:
+    bus = event_bus.RabbitMqEventBus(
+        build_settings(
+            event_queue_size=1,
+            event_queue_full_policy="block",
+            event_publish_block_seconds=0.01,
+        ),
+        connect=lambda: StubConnection(StubChannel()),
+    )
+    bus._thread = threading.Thread(target=lambda: None)
+    bus._thread.is_alive = lambda: True
+
+    bus.publish("AiQueried", {})
+    bus.publish("AiQueried", {})
+
+    assert bus.queue.qsize() == 1
+    assert bus.dropped == 1
 
 
 def test_to_routing_key() -> None:
@@ -1,25 +1,59 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import datetime, timezone
+import json
+import time
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+import jwt
+from jwt import PyJWKSet
+from jwt.algorithms import RSAAlgorithm
+from jwt.exceptions import PyJWKClientError
 import pytest
-from jwt import InvalidTokenError
 
 from app.core.config import Settings
 from app.infrastructure.auth import jwt_verifier
 
+_PRIVATE_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
 
-class StubSigningKey:
-    def __init__(self, key) -> None:
-        self.key = key
+
+def public_jwk(kid: str) -> dict:
+    jwk = json.loads(RSAAlgorithm.to_jwk(_PRIVATE_KEY.public_key()))
+    return {**jwk, "kid": kid, "use": "sig", "alg": "RS256"}
 
 
 class StubJwksClient:
-    def __init__(self, url) -> None:
+    def __init__(self, url, **kwargs) -> None:
         self.url = url
+        self.kids = ["k1"]
+        self.fetches = 0
+        self.error = None
+
+    def get_jwk_set(self, refresh=False):
+        self.fetches += 1
+        if self.error:
+            raise self.error
+        return PyJWKSet([public_jwk(kid) for kid in self.kids])
+
+
+class FakeClock:
+    def __init__(self, now=1_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class SlowClock(FakeClock):
+    delay = 0.0
 
-    def get_signing_key_from_jwt(self, token):
-        return StubSigningKey("secret")
+    def __call__(self) -> float:
+        time.sleep(self.delay)
+        return self.now
 
 
-def build_settings() -> Settings:
-    return Settings(
+def build_settings(**changes) -> Settings:
+    settings = Settings(
         openai_api_key=None,
         openai_chat_model="gpt",
         openai_embedding_model="embed",
@@ -36,50 +70,176 @@ def build_settings() -> Settings:
         request_timeout_seconds=1.0,
         max_batch_size=10,
     )
+    return replace(settings, **changes)
 
 
-def test_verify_returns_claims(monkeypatch) -> None:
+def build_token(kid="k1", exp=2_000, **claims) -> str:
     payload = {
         "sub": "user",
         "email": "user@example.com",
         "name": "User",
         "role": "admin",
-        "roleAbilities": {"canView": True, "canCreate": False},
+        "iss": "https://issuer",
+        "exp": exp,
+        **claims,
     }
+    return jwt.encode(payload, _PRIVATE_KEY, algorithm="RS256", headers={"kid": kid})
+
+
+def build_verifier(monkeypatch, clock=None, **changes):
     monkeypatch.setattr(jwt_verifier, "PyJWKClient", StubJwksClient)
-    monkeypatch.setattr(jwt_verifier, "decode", lambda *args, **kwargs: payload)
+    clock = clock or FakeClock()
+    verifier = jwt_verifier.JwtAccessTokenVerifier(
+        build_settings(**changes), clock=clock
+    )
+    monkeypatch.setattr(
+        jwt_verifier,
+        "decode",
+        lambda token, key, **kwargs: decode_at(clock(), token, key, **kwargs),
+    )
+    return verifier
+
+
+def decode_at(now, token, key, **kwargs):
+    options = {**kwargs.pop("options", {}), "verify_exp": False}
+    payload = jwt.decode(token, key, options=options, **kwargs)
+    if payload["exp"] <= now:
+        raise jwt.ExpiredSignatureError("Signature has expired")
+    return payload
 
-    verifier = jwt_verifier.JwtAccessTokenVerifier(build_settings())
-    claims = verifier.verify("token")
+
+def test_verify_returns_claims(monkeypatch) -> None:
+    verifier = build_verifier(monkeypatch)
+    token = build_token(roleAbilities={"canView": True, "canCreate": False})
+
+    claims = verifier.verify(token)
 
     assert claims.sub == "user"
     assert claims.role == "admin"
     assert claims.role_abilities.can_view is True
     assert claims.role_abilities.can_create is False
+    assert claims.expires_at == datetime.fromtimestamp(2_000, timezone.utc)
 
 
 def test_verify_rejects_missing_claims(monkeypatch) -> None:
-    payload = {"sub": "user", "email": "user@example.com", "name": "User"}
-    monkeypatch.setattr(jwt_verifier, "PyJWKClient", StubJwksClient)
-    monkeypatch.setattr(jwt_verifier, "decode", lambda *args, **kwargs: payload)
+    verifier = build_verifier(monkeypatch)
 
-    verifier = jwt_verifier.JwtAccessTokenVerifier(build_settings())
+    with pytest.raises(ValueError, match="missing required claims"):
+        verifier.verify(build_token(role=None))
 
-    with pytest.raises(ValueError):
+
+def test_verify_rejects_invalid_token(monkeypatch) -> None:
+    verifier = build_verifier(monkeypatch)
+
+    with pytest.raises(ValueError, match="Invalid access token"):
         verifier.verify("token")
+    with pytest.raises(ValueError, match="Invalid access token"):
+        verifier.verify(build_token(exp=500))
+
+
+def test_verify_caches_claims_until_token_expiry(monkeypatch) -> None:
+    clock = FakeClock()
+    verifier = build_verifier(monkeypatch, clock=clock)
+    decodes = []
+    original = jwt_verifier.decode
+    monkeypatch.setattr(
+        jwt_verifier,
+        "decode",
+        lambda *args, **kwargs: decodes.append(args[0]) or original(*args, **kwargs),
+    )
+    token = build_token(exp=1_100)
 
+    first = verifier.verify(token)
+    second = verifier.verify(token)
+    clock.now = 1_100
 
-def test_verify_rejects_invalid_token(monkeypatch) -> None:
-    def raise_invalid(*args, **kwargs):
-        raise InvalidTokenError("bad")
+    assert first is second
+    assert len(decodes) == 1
+    with pytest.raises(ValueError):
+        verifier.verify(token)
+    assert len(decodes) == 2
 
-    monkeypatch.setattr(jwt_verifier, "PyJWKClient", StubJwksClient)
-    monkeypatch.setattr(jwt_verifier, "decode", raise_invalid)
 
-    verifier = jwt_verifier.JwtAccessTokenVerifier(build_settings())
+def test_verify_cache_is_bounded(monkeypatch) -> None:
+    verifier = build_verifier(monkeypatch, auth_token_cache_size=2)
+
+    for index in range(3):
+        verifier.verify(build_token(jti=str(index)))
 
+    assert len(verifier._claims) == 2
+
+
+def test_start_prefetches_jwks(monkeypatch) -> None:
+    verifier = build_verifier(monkeypatch, auth_jwks_refresh_seconds=0)
+
+    verifier.start()
+    verifier.verify(build_token())
+    verifier.close()
+
+    assert verifier.jwks_client.fetches == 1
+
+
+def test_start_tolerates_unreachable_jwks(monkeypatch, caplog) -> None:
+    verifier = build_verifier(monkeypatch, auth_jwks_refresh_seconds=0)
+    verifier.jwks_client.error = PyJWKClientError("down")
+
+    verifier.start()
+
+    assert "JWKS prefetch failed" in caplog.text
     with pytest.raises(ValueError):
-        verifier.verify("token")
+        verifier.verify(build_token())
+
+
+def test_unknown_kid_refetches_at_most_once_per_interval(monkeypatch) -> None:
+    clock = FakeClock()
+    verifier = build_verifier(
+        monkeypatch, clock=clock, auth_jwks_min_refetch_seconds=30
+    )
+    verifier.refresh_keys()
+
+    with pytest.raises(ValueError):
+        verifier.verify(build_token(kid="k2"))
+    assert verifier.jwks_client.fetches == 1
+
+    verifier.jwks_client.kids = ["k1", "k2"]
+    clock.now += 30
+    claims = verifier.verify(build_token(kid="k2", jti="rotated"))
+
+    assert claims.sub == "user"
+    assert verifier.jwks_client.fetches == 2
+
+
+def test_concurrent_unknown_kids_share_one_refetch(monkeypatch) -> None:
+    clock = SlowClock()
+    verifier = build_verifier(
+        monkeypatch, clock=clock, auth_jwks_min_refetch_seconds=30
+    )
+    verifier.refresh_keys()
+    clock.now += 30
+    clock.delay = 0.02
+    tokens = [build_token(kid="k2", jti=str(index)) for index in range(8)]
+
+    def verify(token):
+        with pytest.raises(ValueError):
+            verifier.verify(token)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(verify, tokens))
+
+    assert verifier.jwks_client.fetches == 2
+
+
+def test_background_refresh_reloads_keys(monkeypatch) -> None:
+    verifier = build_verifier(monkeypatch, auth_jwks_refresh_seconds=0.01)
+    verifier.start()
+    verifier.jwks_client.kids = ["k3"]
+    for _ in range(200):
+        if "k3" in verifier._keys:
+            break
+        verifier._stop.wait(0.01)
+    verifier.close()
+
+    assert "k3" in verifier._keys
 
 
 def test_to_role_abilities_handles_invalid_payload() -> None:
@@ -1,3 +1,6 @@
+import asyncio
+from dataclasses import replace
+
 import pytest
 
 from app.core.config import Settings
@@ -39,13 +42,45 @@ class StubChatResponse:
         self.choices = [StubChoice(content)]
 
 
+class StubDelta:
+    def __init__(self, content) -> None:
+        self.delta = StubMessage(content)
+
+
+class StubStreamChunk:
+    def __init__(self, content=None, usage=None) -> None:
+        self.choices = [StubDelta(content)] if content is not None else []
+        self.usage = usage
+
+
+class StubUsage:
+    prompt_tokens = 7
+    completion_tokens = 2
+    total_tokens = 9
+
+
+class StubStream:
+    def __init__(self, content) -> None:
+        self.closed = False
+        self.chunks = [StubStreamChunk(part) for part in (content or "")]
+        self.chunks.append(StubStreamChunk(usage=StubUsage()))
+
+    def __iter__(self):
+        return iter(self.chunks)
+
+    def close(self) -> None:
+        self.closed = True
+
+
 class StubChatCompletions:
     def __init__(self, content) -> None:
         self.content = content
         self.calls = []
 
-    def create(self, model, messages, temperature):
+    def create(self, model, messages, temperature, stream=False, stream_options=None):
         self.calls.append((model, messages, temperature))
+        if stream:
+            return StubStream(self.content)
         return StubChatResponse(self.content)
 
 
@@ -55,16 +90,17 @@ class StubChat:
 
 
 class StubOpenAI:
-    def __init__(self, api_key) -> None:
+    def __init__(self, api_key, max_retries=2) -> None:
         self.api_key = api_key
+        self.max_retries = max_retries
         self.embeddings = StubEmbeddings()
         self.chat = StubChat("ok")
 
-
-class StubOpenAIEmpty(StubOpenAI):
-    def __init__(self, api_key) -> None:
-        super().__init__(api_key)
-        self.chat = StubChat(None)
+    def with_options(self, max_retries):
+        copy = StubOpenAI(self.api_key, max_retries)
+        copy.embeddings = self.embeddings
+        copy.chat = self.chat
+        return copy
 
 
 def build_settings(api_key="key") -> Settings:
@@ -96,24 +132,112 @@ def test_embedding_client_batches(monkeypatch) -> None:
     assert len(embeddings) == 3
     assert client.client.embeddings.calls[0][1] == ["a", "b"]
     assert client.client.embeddings.calls[1][1] == ["c"]
+    assert client.client.max_retries == 0
 
 
-def test_chat_client_returns_message(monkeypatch) -> None:
+def test_embedding_client_keeps_order_with_parallel_batches(monkeypatch) -> None:
     monkeypatch.setattr(openai_client, "OpenAI", StubOpenAI)
+    settings = replace(build_settings(), embedding_max_concurrency=4)
+
+    client = openai_client.OpenAIEmbeddingClient(settings)
+    embeddings = client.embed_texts(["a", "b", "c", "d", "e"])
+
+    assert embeddings == [[0.0], [1.0], [0.0], [1.0], [0.0]]
+    assert sorted(call[1] for call in client.client.embeddings.calls) == [
+        ["a", "b"],
+        ["c", "d"],
+        ["e"],
+    ]
+
+
+def test_embedding_client_packs_by_tokens_and_truncates(monkeypatch, caplog) -> None:
+    monkeypatch.setattr(openai_client, "OpenAI", StubOpenAI)
+    settings = replace(
+        build_settings(),
+        max_batch_size=100,
+        embedding_max_request_tokens=4,
+        embedding_max_input_tokens=3,
+    )
+
+    client = openai_client.OpenAIEmbeddingClient(settings)
+    client.tokens.encoder = None
+    embeddings = client.embed_texts(["aaa", "bbb", "ccccccccccccccc", "d"])
+
+    calls = [call[1] for call in client.client.embeddings.calls]
+    assert len(embeddings) == 4
+    assert calls == [["aaa", "bbb"], ["ccccccccc", "d"]]
+    assert "truncated from 5 to 3 tokens" in caplog.text
 
-    client = openai_client.OpenAIChatClient(build_settings())
-    result = client.generate("system", "user")
 
-    assert result == "ok"
+class StubAsyncStream:
+    def __init__(self, stream) -> None:
+        self.stream = stream
+        self.closed = False
 
+    def __aiter__(self):
+        return self._chunks()
 
-def test_chat_client_returns_empty_when_missing_content(monkeypatch) -> None:
-    monkeypatch.setattr(openai_client, "OpenAI", StubOpenAIEmpty)
+    async def _chunks(self):
+        for chunk in self.stream.chunks:
+            yield chunk
 
-    client = openai_client.OpenAIChatClient(build_settings())
-    result = client.generate("system", "user")
+    async def close(self) -> None:
+        self.closed = True
 
-    assert result == ""
+
+class StubAsyncOpenAI:
+    def __init__(self, content="ok") -> None:
+        self.sync = StubOpenAI("key")
+        self.sync.chat = StubChat(content)
+        self.embeddings = self
+        self.chat = self
+        self.completions = self
+        self.streams = []
+
+    async def create(self, **kwargs):
+        await asyncio.sleep(0)
+        if "input" in kwargs:
+            return self.sync.embeddings.create(kwargs["model"], kwargs["input"])
+        response = self.sync.chat.completions.create(**kwargs)
+        if kwargs.get("stream"):
+            self.streams.append(StubAsyncStream(response))
+            return self.streams[-1]
+        return response
+
+
+def test_async_embedding_client_gathers_batches_in_order() -> None:
+    shared = StubAsyncOpenAI()
+    client = openai_client.AsyncOpenAIEmbeddingClient(build_settings(), shared)
+
+    embeddings = asyncio.run(client.embed_texts(["a", "b", "c"]))
+
+    assert embeddings == [[0.0], [1.0], [0.0]]
+    assert [call[1] for call in shared.sync.embeddings.calls] == [["a", "b"], ["c"]]
+
+
+def test_async_chat_client_generates_and_streams() -> None:
+    shared = StubAsyncOpenAI()
+    client = openai_client.AsyncOpenAIChatClient(build_settings(), shared)
+
+    async def run():
+        answer = await client.generate("system", "user")
+        chunks = [chunk async for chunk in client.stream("system", "user")]
+        return answer, chunks
+
+    answer, chunks = asyncio.run(run())
+
+    assert answer == "ok"
+    assert "".join(chunk.text for chunk in chunks) == "ok"
+    assert chunks[-1].usage.total_tokens == 9
+    assert shared.streams[0].closed is True
+
+
+def test_async_chat_client_returns_empty_when_missing_content() -> None:
+    client = openai_client.AsyncOpenAIChatClient(
+        build_settings(), StubAsyncOpenAI(content=None)
+    )
+
+    assert asyncio.run(client.generate("system", "user")) == ""
 
 
 def test_openai_clients_require_api_key() -> None:
@@ -121,4 +245,18 @@ def test_openai_clients_require_api_key() -> None:
         openai_client.OpenAIEmbeddingClient(build_settings(api_key=None))
 
     with pytest.raises(ValueError):
-        openai_client.OpenAIChatClient(build_settings(api_key=None))
+        openai_client.AsyncOpenAIEmbeddingClient(build_settings(api_key=None))
+
+    with pytest.raises(ValueError):
+        openai_client.AsyncOpenAIChatClient(build_settings(api_key=None))
+
+
+def test_openai_clients_share_an_injected_client() -> None:
+    shared = StubOpenAI("key")
+
+    embeddings = openai_client.OpenAIEmbeddingClient(build_settings(), shared)
+    embeddings.embed_texts(["a"])
+
+    assert shared.max_retries == 2
+    assert embeddings.client.max_retries == 0
+    assert shared.embeddings.calls[0][1] == ["a"]
@@ -1,17 +1,22 @@
+from dataclasses import replace
 from datetime import datetime, timezone
 from urllib.parse import parse_qs, urlparse
 
 import pytest
 
 from app.core.config import Settings
+from app.domain.source import SourceCursor
 from app.infrastructure.http import service_clients
+from app.infrastructure.http.pool import build_http_client
+from app.infrastructure.http.response_cache import ConditionalResponseCache
 
 
 class StubResponse:
-    def __init__(self, status_code, payload=None, text="") -> None:
+    def __init__(self, status_code, payload=None, text="", headers=None) -> None:
         self.status_code = status_code
         self._payload = payload
         self.text = text
+        self.headers = headers or {}
 
     def json(self):
         if isinstance(self._payload, Exception):
@@ -52,6 +57,7 @@ def build_settings() -> Settings:
         rabbitmq_exchange="events",
         request_timeout_seconds=1.0,
         max_batch_size=10,
+        audit_page_size=2,
     )
 
 
@@ -141,19 +147,152 @@ def test_role_service_client_get_role_by_name(monkeypatch) -> None:
     assert role.name == "Admin"
 
 
-def test_audit_service_client_includes_from_param(monkeypatch) -> None:
+def audit_item(audit_id, occurred_at):
+    return {
+        "id": audit_id,
+        "action": "user.created",
+        "resource": "user",
+        "actorId": "u1",
+        "actorRole": "admin",
+        "metadata": {"field": "name"},
+        "occurredAt": occurred_at,
+    }
+
+
+def test_audit_service_client_sends_compound_cursor(monkeypatch) -> None:
     response = StubResponse(200, [])
     client = StubClient([response])
     monkeypatch.setattr(service_clients.httpx, "Client", lambda timeout: client)
 
-    occurred_after = datetime(2024, 1, 1, tzinfo=timezone.utc)
-    service_clients.AuditServiceClient(build_settings()).list_logs(
-        "token", occurred_after
+    after = SourceCursor(datetime(2024, 1, 1, tzinfo=timezone.utc), "a7")
+    pages = list(
+        service_clients.AuditServiceClient(build_settings()).iter_log_pages(
+            "token", after
+        )
     )
 
     url = client.calls[0][0]
     params = parse_qs(urlparse(url).query)
+    assert pages == []
     assert params["from"][0] == "2024-01-01T00:00:00+00:00"
+    assert params["afterId"][0] == "a7"
+    assert params["order"][0] == "asc"
+    assert params["limit"][0] == "2"
+
+
+def test_audit_service_client_pages_after_last_record(monkeypatch) -> None:
+    client = StubClient(
+        [
+            StubResponse(
+                200,
+                [
+                    audit_item("a1", "2024-01-01T00:00:00Z"),
+                    audit_item("a2", "2024-01-02T00:00:00Z"),
+                ],
+            ),
+            StubResponse(
+                200,
+                [
+                    audit_item("a3", "2024-01-02T00:00:00Z"),
+                    audit_item("a4", "2024-01-03T00:00:00Z"),
+                ],
+            ),
+            StubResponse(200, []),
+        ]
+    )
+    monkeypatch.setattr(service_clients.httpx, "Client", lambda timeout: client)
+
+    pages = list(
+        service_clients.AuditServiceClient(build_settings()).iter_log_pages("token", None)
+    )
+
+    assert [[log.audit_id for log in page] for page in pages] == [
+        ["a1", "a2"],
+        ["a3", "a4"],
+    ]
+    assert pages[0][0].metadata == {"field": "name"}
+    first = parse_qs(urlparse(client.calls[0][0]).query)
+    second = parse_qs(urlparse(client.calls[1][0]).query)
+    assert "from" not in first
+    assert second["from"][0] == "2024-01-02T00:00:00+00:00"
+    assert second["afterId"][0] == "a2"
+    assert len(client.calls) == 3
+
+
+def test_audit_service_client_raises_when_server_ignores_after_id(
+    monkeypatch,
+) -> None:
+    client = StubClient(
+        [
+            StubResponse(
+                200,
+                [
+                    audit_item("a2", "2024-01-02T00:00:00Z"),
+                    audit_item("a3", "2024-01-02T00:00:00Z"),
+                ],
+            ),
+            StubResponse(
+                200,
+                [
+                    audit_item("a2", "2024-01-02T00:00:00Z"),
+                    audit_item("a3", "2024-01-02T00:00:00Z"),
+                ],
+            ),
+        ]
+    )
+    monkeypatch.setattr(service_clients.httpx, "Client", lambda timeout: client)
+    after = SourceCursor(datetime(2024, 1, 2, tzinfo=timezone.utc), "a2")
+
+    pages = service_clients.AuditServiceClient(build_settings()).iter_log_pages(
+        "token", after
+    )
+
+    assert [log.audit_id for log in next(pages)] == ["a3"]
+    with pytest.raises(RuntimeError) as exc:
+        next(pages)
+
+    assert "cannot advance" in str(exc.value)
+    assert len(client.calls) == 2
+
+
+def test_audit_service_client_pushes_down_max_items(monkeypatch) -> None:
+    client = StubClient(
+        [
+            StubResponse(
+                200,
+                [
+                    audit_item("a1", "2024-01-01T00:00:00Z"),
+                    audit_item("a2", "2024-01-02T00:00:00Z"),
+                ],
+            ),
+            StubResponse(200, [audit_item("a3", "2024-01-03T00:00:00Z")]),
+        ]
+    )
+    monkeypatch.setattr(service_clients.httpx, "Client", lambda timeout: client)
+
+    pages = list(
+        service_clients.AuditServiceClient(build_settings()).iter_log_pages(
+            "token", None, max_items=3
+        )
+    )
+
+    assert [[log.audit_id for log in page] for page in pages] == [["a1", "a2"], ["a3"]]
+    assert parse_qs(urlparse(client.calls[1][0]).query)["limit"][0] == "1"
+    assert len(client.calls) == 2
+
+
+def test_audit_service_client_raises_for_error_status(monkeypatch) -> None:
+    client = StubClient([StubResponse(503, {"message": "down"})])
+    monkeypatch.setattr(service_clients.httpx, "Client", lambda timeout: client)
+
+    with pytest.raises(RuntimeError) as exc:
+        list(
+            service_clients.AuditServiceClient(build_settings()).iter_log_pages(
+                "token", None
+            )
+        )
+
+    assert "audit service error (503)" in str(exc.value)
 
 
 def test_parse_datetime_variants() -> None:
@@ -193,3 +332,135 @@ def test_service_client_raises_for_error_status(monkeypatch) -> None:
         service_clients.UserServiceClient(build_settings()).list_users("token")
 
     assert "users service error" in str(exc.value)
+
+
+def test_list_users_and_roles_send_updated_after(monkeypatch) -> None:
+    client = StubClient([StubResponse(200, []), StubResponse(200, [])])
+    monkeypatch.setattr(service_clients.httpx, "Client", lambda timeout: client)
+    updated_after = datetime(2024, 1, 2, 0, 0, 0, 123456, tzinfo=timezone.utc)
+
+    service_clients.UserServiceClient(build_settings()).list_users(
+        "token", updated_after
+    )
+    service_clients.RoleServiceClient(build_settings()).list_roles(
+        "token", updated_after
+    )
+
+    for url, _ in client.calls:
+        assert parse_qs(urlparse(url).query) == {
+            "updatedAfter": ["2024-01-02T00:00:00.123+00:00"]
+        }
+    assert client.calls[0][0].startswith("https://users?")
+    assert client.calls[1][0].startswith("https://roles?")
+
+
+def test_internal_clients_use_service_token(monkeypatch) -> None:
+    user_payload = {"id": "u1", "name": "Ada", "email": "ada@example.com", "roleId": "r1"}
+    role_payload = {"id": "r1", "name": "Admin", "abilities": {"canView": True}}
+    client = StubClient(
+        [
+            StubResponse(200, user_payload),
+            StubResponse(200, role_payload),
+            StubResponse(404, {"message": "missing"}),
+        ]
+    )
+    monkeypatch.setattr(service_clients.httpx, "Client", lambda timeout: client)
+    settings = replace(build_settings(), internal_service_token="secret")
+
+    user = service_clients.InternalUserClient(settings).find_user("u1")
+    role = service_clients.InternalRoleClient(settings).find_role("r1")
+    missing = service_clients.InternalUserClient(settings).find_user("gone")
+
+    assert user.user_id == "u1"
+    assert user.role_id == "r1"
+    assert role.name == "Admin"
+    assert role.can_view is True
+    assert missing is None
+    assert client.calls[0] == (
+        "http://user:3002/internal/users/u1",
+        {"x-service-token": "secret"},
+    )
+    assert client.calls[1][0] == "http://role:3003/internal/roles/r1"
+
+
+def test_internal_clients_raise_on_errors(monkeypatch) -> None:
+    client = StubClient([StubResponse(401, {"message": "Invalid service token"})])
+    monkeypatch.setattr(service_clients.httpx, "Client", lambda timeout: client)
+
+    with pytest.raises(RuntimeError, match="roles service error \\(401\\)"):
+        service_clients.InternalRoleClient(build_settings()).find_role("r1")
+    assert client.calls[0][1] == {}
+
+
+def test_list_clients_revalidate_with_stored_validators(monkeypatch) -> None:
+    payload = [{"id": "r1", "name": "Admin", "abilities": {"canView": True}}]
+    client = StubClient(
+        [
+            StubResponse(
+                200,
+                payload,
+                headers={"etag": 'W/"abc"', "last-modified": "Mon, 01 Jan 2024"},
+            ),
+            StubResponse(304),
+            StubResponse(200, [], headers={}),
+            StubResponse(200, []),
+        ]
+    )
+    monkeypatch.setattr(service_clients.httpx, "Client", lambda timeout: client)
+    cache = ConditionalResponseCache()
+    roles = service_clients.RoleServiceClient(build_settings(), cache)
+
+    first = roles.list_roles("token")
+    second = roles.list_roles("token")
+    third = roles.list_roles("token")
+    fourth = roles.list_roles("token")
+
+    assert first == second
+    assert second[0].role_id == "r1"
+    assert third == fourth == []
+    assert client.calls[0][1]["Accept-Encoding"] == "br, gzip"
+    assert "If-None-Match" not in client.calls[0][1]
+    assert client.calls[1][1]["If-None-Match"] == 'W/"abc"'
+    assert client.calls[1][1]["If-Modified-Since"] == "Mon, 01 Jan 2024"
+    assert "If-None-Match" in client.calls[2][1]
+    assert "If-None-Match" not in client.calls[3][1]
+
+
+def test_response_cache_evicts_least_recently_used() -> None:
+    cache = ConditionalResponseCache(max_entries=2)
+    cache.store("a", (1,), "etag-a", None)
+    cache.store("b", (2,), None, "yesterday")
+    cache.get("a")
+    cache.store("c", (3,), "etag-c", None)
+
+    assert cache.get("b") is None
+    assert cache.get("a").conditional_headers() == {"If-None-Match": "etag-a"}
+    assert cache.get("c").value == (3,)
+
+
+def test_clients_reuse_injected_http_client(monkeypatch) -> None:
+    def fail(timeout):
+        raise AssertionError("should reuse the pooled client")
+
+    monkeypatch.setattr(service_clients.httpx, "Client", fail)
+    http = StubClient([StubResponse(200, []), StubResponse(404)])
+
+    users = service_clients.UserServiceClient(build_settings(), http=http)
+    internal = service_clients.InternalRoleClient(build_settings(), http)
+
+    assert users.list_users("token") == []
+    assert internal.find_role("r1") is None
+    assert [call[0] for call in http.calls] == [
+        "https://users",
+        "http://role:3003/internal/roles/r1",
+    ]
+
+
+def test_build_http_client_negotiates_http2_when_enabled() -> None:
+    enabled = build_http_client(build_settings())
+    disabled = build_http_client(replace(build_settings(), http2_enabled=False))
+
+    assert enabled._transport._pool._http2 is True
+    assert disabled._transport._pool._http2 is False
+    enabled.close()
+    disabled.close()
@@ -0,0 +1,99 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import sqlite3
+
+from app.domain.source import SourceCursor, SourceType
+from app.infrastructure.sqlite.cursor_store import SqliteCursorStore
+
+
+def test_sqlite_cursor_store_reads_and_writes_all_cursors(tmp_path) -> None:
+    path = str(tmp_path / "state" / "cursors.sqlite3")
+    store = SqliteCursorStore(path)
+    users = SourceCursor(datetime(2024, 1, 2, tzinfo=timezone.utc))
+    audit = SourceCursor(
+        datetime(2024, 1, 3, 12, tzinfo=timezone(timedelta(hours=2))), "a7"
+    )
+
+    store.set_cursor(SourceType.users, users)
+    store.set_cursor(SourceType.audit, audit)
+    store.close()
+    reopened = SqliteCursorStore(path)
+
+    assert reopened.get_cursors(list(SourceType)) == {
+        SourceType.users: users,
+        SourceType.audit: audit,
+    }
+    assert reopened.get_cursor(SourceType.roles) is None
+    assert reopened.get_cursors([]) == {}
+    reopened.close()
+
+
+def test_sqlite_cursor_store_advances_only_forwards(tmp_path) -> None:
+    store = SqliteCursorStore(str(tmp_path / "cursors.sqlite3"))
+    stored_at = datetime(2024, 1, 5, tzinfo=timezone.utc)
+    newer = SourceCursor(stored_at, "a5")
+    older = SourceCursor(
+        datetime(2024, 1, 5, 1, tzinfo=timezone(timedelta(hours=2))), "a9"
+    )
+    store.set_cursor(SourceType.audit, newer)
+
+    stored = store.advance_cursors(
+        {
+            SourceType.audit: older,
+            SourceType.roles: SourceCursor(datetime(2024, 1, 1)),
+        }
+    )
+
+    assert stored == {
+        SourceType.audit: newer,
+        SourceType.roles: SourceCursor(datetime(2024, 1, 1, tzinfo=timezone.utc)),
+    }
+    assert store.advance_cursors({}) == {}
+    assert store.advance_cursors({SourceType.audit: SourceCursor(stored_at, "a4")}) == {
+        SourceType.audit: newer
+    }
+    tie_break = SourceCursor(stored_at, "a6")
+    assert store.advance_cursors({SourceType.audit: tie_break}) == {
+        SourceType.audit: tie_break
+    }
+    store.close()
+
+
+def test_sqlite_cursor_store_keeps_latest_under_concurrent_writers(tmp_path) -> None:
+    path = str(tmp_path / "cursors.sqlite3")
+    stores = [SqliteCursorStore(path) for _ in range(4)]
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    cursors = [SourceCursor(start + timedelta(minutes=index)) for index in range(40)]
+
+    def advance(index: int) -> None:
+        stores[index % len(stores)].advance_cursors(
+            {SourceType.audit: cursors[index]}
+        )
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(advance, reversed(range(len(cursors)))))
+
+    assert stores[0].get_cursor(SourceType.audit) == cursors[-1]
+    for store in stores:
+        store.close()
+
+
+def test_sqlite_cursor_store_adds_key_column_to_existing_table(tmp_path) -> None:
+    path = str(tmp_path / "cursors.sqlite3")
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE cursors (source TEXT PRIMARY KEY, cursor TEXT NOT NULL, "
+        "cursor_us INTEGER NOT NULL, updated_at REAL NOT NULL)"
+    )
+    connection.execute(
+        "INSERT INTO cursors VALUES ('audit', '2024-01-01T00:00:00+00:00', 0, 0)"
+    )
+    connection.commit()
+    connection.close()
+
+    store = SqliteCursorStore(path)
+
+    assert store.get_cursor(SourceType.audit) == SourceCursor(
+        datetime(2024, 1, 1, tzinfo=timezone.utc)
+    )
+    store.close()
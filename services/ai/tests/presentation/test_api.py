@@ -1,9 +1,23 @@
+from dataclasses import replace
+from datetime import datetime, timezone
+import json
+
 from fastapi.testclient import TestClient
 
+from app.application.answer_cache import AnswerCacheStats
+from app.application.ingest_jobs import IngestJob, JobStatus, SourceProgress
+from app.application.pipeline import StageMetrics
 from app.application.ports.auth import AccessTokenClaims, RoleAbilitiesClaims
-from app.application.ports.vector_store import RetrievedDocument
+from app.application.ports.vector_store import DocumentFilter, RetrievedDocument
 from app.application.use_cases.ingest_embeddings import IngestResult
-from app.application.use_cases.query_agent import QueryResult
+from app.application.ports.embeddings import ChatUsage
+from app.application.single_flight import SingleFlightStats
+from app.application.use_cases.query_agent import (
+    QueryMetrics,
+    QueryResult,
+    QueryStreamEvent,
+)
+from app.domain.source import SourceType
 from app.presentation.api import create_app
 from app.presentation.dependencies import AuthContext
 from app.presentation import dependencies
@@ -31,22 +45,79 @@ def test_health_endpoint() -> None:
 
 def test_ingest_success() -> None:
     class StubIngest:
+        def __init__(self) -> None:
+            self.full = None
+            self.reconcile = None
+
         def execute(
-            self, sources, access_token, max_items=None, actor_id=None, actor_role=None
+            self,
+            sources,
+            access_token,
+            max_items=None,
+            full=False,
+            actor_id=None,
+            actor_role=None,
+            reconcile=False,
         ):
-            return IngestResult(ingested={"users": 1}, cursors={"users": "cursor"})
+            self.full = full
+            self.reconcile = reconcile
+            return IngestResult(
+                ingested={"users": 1},
+                cursors={"users": "cursor"},
+                embedded={"users": 1},
+                unchanged={"users": 0},
+                skipped={"users": 0},
+                deleted={"users": 2},
+                pipeline={
+                    "users": [
+                        StageMetrics(
+                            name="embed",
+                            chunks=1,
+                            items=1,
+                            busy_seconds=0.5,
+                            max_queue_depth=1,
+                        )
+                    ]
+                },
+            )
 
+    stub = StubIngest()
     app = create_app()
-    app.dependency_overrides[dependencies.get_ingest_use_case] = lambda: StubIngest()
+    app.dependency_overrides[dependencies.get_ingest_use_case] = lambda: stub
     app.dependency_overrides[dependencies.require_create_permission] = lambda: (
         build_auth()
     )
 
     client = TestClient(app)
-    response = client.post("/ingest", json={"sources": ["users"], "max_items": 1})
+    response = client.post(
+        "/ingest",
+        json={"sources": ["users"], "max_items": 1, "full": True, "reconcile": True},
+    )
 
     assert response.status_code == 200
-    assert response.json() == {"ingested": {"users": 1}, "cursors": {"users": "cursor"}}
+    assert stub.full is True
+    assert stub.reconcile is True
+    assert response.json() == {
+        "ingested": {"users": 1},
+        "embedded": {"users": 1},
+        "unchanged": {"users": 0},
+        "skipped": {"users": 0},
+        "cursors": {"users": "cursor"},
+        "errors": {},
+        "deleted": {"users": 2},
+        "pipeline": {
+            "users": [
+                {
+                    "name": "embed",
+                    "chunks": 1,
+                    "items": 1,
+                    "busy_seconds": 0.5,
+                    "items_per_second": 2.0,
+                    "max_queue_depth": 1,
+                }
+            ]
+        },
+    }
 
 
 def test_ingest_runtime_error_returns_502() -> None:
@@ -68,8 +139,13 @@ def test_ingest_runtime_error_returns_502() -> None:
 
 
 def test_query_success() -> None:
+    calls = []
+
     class StubQuery:
-        def execute(self, question, top_k, actor_id=None, actor_role=None):
+        async def execute(
+            self, question, top_k, actor_id=None, actor_role=None, where=None
+        ):
+            calls.append(where)
             docs = [
                 RetrievedDocument(
                     doc_id="doc-1",
@@ -91,10 +167,32 @@ def test_query_success() -> None:
     assert response.json()["answer"] == "ok"
     assert response.json()["sources"][0]["doc_id"] == "doc-1"
 
+    filtered = client.post(
+        "/query",
+        json={
+            "question": "Who?",
+            "sources": ["users", "audit", "users"],
+            "filters": {"resource": "report", "action": "delete"},
+        },
+    )
+    rejected = client.post(
+        "/query", json={"question": "Who?", "filters": {"email": "a@b.c"}}
+    )
+
+    assert filtered.status_code == 200
+    assert rejected.status_code == 422
+    assert calls == [
+        None,
+        DocumentFilter(
+            sources=("users", "audit"),
+            fields=(("action", "delete"), ("resource", "report")),
+        ),
+    ]
+
 
 def test_query_value_error_returns_400() -> None:
     class StubQuery:
-        def execute(self, *args, **kwargs):
+        async def execute(self, *args, **kwargs):
             raise ValueError("bad input")
 
     app = create_app()
@@ -106,3 +204,197 @@ def test_query_value_error_returns_400() -> None:
 
     assert response.status_code == 400
     assert response.json()["detail"] == "bad input"
+
+
+def parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        name, data = block.split("\n")
+        payload = json.loads(data.removeprefix("data: "))
+        events.append((name.removeprefix("event: "), payload))
+    return events
+
+
+def test_query_stream_sends_sources_tokens_and_summary() -> None:
+    class StubQuery:
+        async def stream(
+            self, question, top_k, actor_id=None, actor_role=None, where=None
+        ):
+            docs = [
+                RetrievedDocument(
+                    doc_id="doc-1",
+                    content="User u1",
+                    metadata={"source": "users"},
+                    distance=0.1,
+                )
+            ]
+            yield QueryStreamEvent(event="sources", sources=docs)
+            yield QueryStreamEvent(event="token", text="o")
+            yield QueryStreamEvent(event="token", text="k")
+            yield QueryStreamEvent(
+                event="done",
+                usage=ChatUsage(prompt_tokens=3, completion_tokens=2, total_tokens=5),
+                timings={"total_ms": 1.5},
+            )
+
+    app = create_app()
+    app.dependency_overrides[dependencies.get_query_use_case] = lambda: StubQuery()
+    app.dependency_overrides[dependencies.get_auth_context] = lambda: build_auth()
+
+    client = TestClient(app)
+    response = client.post("/query/stream", json={"question": "Who?", "top_k": 1})
+    events = parse_sse(response.text)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert [name for name, _ in events] == ["sources", "token", "token", "done"]
+    assert events[0][1]["sources"][0]["doc_id"] == "doc-1"
+    assert "".join(data["text"] for name, data in events if name == "token") == "ok"
+    assert events[-1][1]["usage"]["total_tokens"] == 5
+    assert events[-1][1]["timings"] == {"total_ms": 1.5}
+
+
+def test_query_stream_maps_errors() -> None:
+    class StubQuery:
+        def __init__(self, fail_at_start) -> None:
+            self.fail_at_start = fail_at_start
+
+        async def stream(self, *args, **kwargs):
+            if self.fail_at_start:
+                raise RuntimeError("retrieval down")
+            yield QueryStreamEvent(event="sources")
+            raise RuntimeError("provider down")
+
+    app = create_app()
+    app.dependency_overrides[dependencies.get_auth_context] = lambda: build_auth()
+    client = TestClient(app)
+
+    app.dependency_overrides[dependencies.get_query_use_case] = lambda: StubQuery(True)
+    failed = client.post("/query/stream", json={"question": "Who?", "top_k": 1})
+    app.dependency_overrides[dependencies.get_query_use_case] = lambda: StubQuery(False)
+    interrupted = client.post("/query/stream", json={"question": "Who?", "top_k": 1})
+
+    assert failed.status_code == 502
+    assert failed.json()["detail"] == "retrieval down"
+    assert interrupted.status_code == 200
+    assert parse_sse(interrupted.text)[-1] == ("error", {"detail": "provider down"})
+
+
+def test_query_metrics_reports_coalescing_and_caches() -> None:
+    metrics = QueryMetrics(
+        coalescing=SingleFlightStats(leaders=3, followers=1, in_flight=0),
+        answer_cache=AnswerCacheStats(hits=2, semantic_hits=1, misses=4, entries=3),
+        embedding_cache=None,
+    )
+    app = create_app()
+    app.dependency_overrides[dependencies.get_query_metrics] = lambda: metrics
+    app.dependency_overrides[dependencies.get_auth_context] = lambda: build_auth()
+
+    response = TestClient(app).get("/query/metrics")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "coalescing": {
+            "leaders": 3,
+            "followers": 1,
+            "in_flight": 0,
+            "coalesced_ratio": 0.25,
+        },
+        "answer_cache": {"hits": 2, "semantic_hits": 1, "misses": 4, "entries": 3},
+        "embedding_cache": None,
+    }
+
+
+class StubJobManager:
+    def __init__(self, job=None) -> None:
+        self.job = job
+        self.submitted = []
+
+    def submit(self, request):
+        self.submitted.append(request)
+        return self.job
+
+    def get(self, job_id):
+        if self.job and self.job.job_id == job_id:
+            return self.job
+        return None
+
+
+def build_job(**changes) -> IngestJob:
+    created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    job = IngestJob(
+        job_id="job-1",
+        sources=[SourceType.users],
+        status=JobStatus.queued,
+        created_at=created,
+    )
+    return replace(job, **changes)
+
+
+def build_job_app(manager) -> TestClient:
+    app = create_app()
+    app.dependency_overrides[dependencies.get_ingest_job_manager] = lambda: manager
+    app.dependency_overrides[dependencies.require_create_permission] = lambda: (
+        build_auth()
+    )
+    return TestClient(app)
+
+
+def test_enqueue_ingest_job_returns_202() -> None:
+    manager = StubJobManager(build_job())
+    client = build_job_app(manager)
+
+    response = client.post(
+        "/ingest/jobs",
+        json={"sources": ["users"], "full": True, "reconcile": True},
+    )
+
+    assert response.status_code == 202
+    assert response.json()["job_id"] == "job-1"
+    assert response.json()["status"] == "queued"
+    request = manager.submitted[0]
+    assert request.sources == [SourceType.users]
+    assert request.access_token == "Bearer token"
+    assert request.full is True
+    assert request.reconcile is True
+    assert request.actor_id == "user"
+
+
+def test_get_ingest_job_reports_progress_and_result() -> None:
+    started = datetime(2024, 1, 1, 0, 0, 1, tzinfo=timezone.utc)
+    finished = datetime(2024, 1, 1, 0, 0, 4, tzinfo=timezone.utc)
+    job = build_job(
+        status=JobStatus.succeeded,
+        started_at=started,
+        finished_at=finished,
+        progress={
+            "users": SourceProgress(
+                fetched=2,
+                embedded=1,
+                upserted=1,
+                started_at=started,
+                updated_at=finished,
+            )
+        },
+        result=IngestResult(ingested={"users": 2}, cursors={"users": None}),
+    )
+    client = build_job_app(StubJobManager(job))
+
+    response = client.get("/ingest/jobs/job-1")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "succeeded"
+    assert body["duration_seconds"] == 3.0
+    assert body["progress"]["users"]["fetched"] == 2
+    assert body["progress"]["users"]["upserted"] == 1
+    assert body["result"]["ingested"] == {"users": 2}
+    assert body["error"] is None
+
+
+def test_get_unknown_ingest_job_returns_404() -> None:
+    client = build_job_app(StubJobManager())
+
+    response = client.get("/ingest/jobs/missing")
+
+    assert response.status_code == 404
@@ -92,6 +92,16 @@ def test_get_auth_context_verifies_token(monkeypatch) -> None:
     assert verifier.last_token == "token"
 
 
+def test_get_auth_context_prefers_container_verifier() -> None:
+    class StubContainer:
+        token_verifier = StubVerifier(build_claims(True))
+
+    result = dependencies.get_auth_context("Bearer token", StubContainer())
+
+    assert result.claims.sub == "user"
+    assert StubContainer.token_verifier.last_token == "token"
+
+
 def test_get_auth_context_rejects_invalid_token(monkeypatch) -> None:
     class StubInvalidVerifier:
         def verify(self, token):
@@ -208,3 +218,34 @@ def test_require_create_permission_handles_role_service_errors(monkeypatch) -> N
     with pytest.raises(HTTPException) as exc:
         dependencies.require_create_permission(auth, settings)
     assert exc.value.status_code == 502
+
+
+def test_require_create_permission_uses_container_role_cache() -> None:
+    class StubRoleCache:
+        def __init__(self) -> None:
+            self.refs = []
+
+        def get_role(self, role_ref, access_token):
+            self.refs.append(role_ref)
+            return RoleInfo(
+                role_id="role-1",
+                name="Admin",
+                abilities=RoleAbilities(
+                    can_view=True,
+                    can_create=True,
+                    can_update=False,
+                    can_delete=False,
+                ),
+            )
+
+    class StubContainer:
+        role_abilities = StubRoleCache()
+
+    auth = AuthContext(token="Bearer token", claims=build_claims(None))
+
+    result = dependencies.require_create_permission(
+        auth, build_settings(), StubContainer()
+    )
+
+    assert result == auth
+    assert StubContainer.role_abilities.refs == ["admin"]
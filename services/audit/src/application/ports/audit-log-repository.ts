@@ -8,7 +8,10 @@ export interface AuditLogFilters {
   resource?: AuditResource;
   actorId?: string;
   from?: Date;
+  afterId?: string;
   to?: Date;
+  limit?: number;
+  order?: 'asc' | 'desc';
 }
 
 export interface AuditLogRepository {
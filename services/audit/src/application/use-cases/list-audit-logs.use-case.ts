@@ -7,7 +7,10 @@ export interface ListAuditLogsInput {
   resource?: string;
   actorId?: string;
   from?: Date;
+  afterId?: string;
   to?: Date;
+  limit?: number;
+  order?: 'asc' | 'desc';
 }
 
 export class ListAuditLogsUseCase {
@@ -19,7 +22,10 @@ export class ListAuditLogsUseCase {
       resource: input.resource ? AuditResource.create(input.resource) : undefined,
       actorId: input.actorId,
       from: input.from,
+      afterId: input.afterId,
       to: input.to,
+      limit: input.limit,
+      order: input.order,
     });
   }
 }
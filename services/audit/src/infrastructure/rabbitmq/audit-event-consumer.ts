@@ -1,8 +1,13 @@
 import { Injectable, Logger, OnModuleDestroy, OnModuleInit } from '@nestjs/common';
 import * as amqp from 'amqplib';
 import { CreateAuditLogUseCase } from '../../application/use-cases/create-audit-log.use-case';
+import { AuditLog } from '../../domain/entities/audit-log';
 import { AuditConfig } from '../config/audit.config';
 
+const AUDIT_LOG_RECORDED = 'AuditLogRecorded';
+const AUDIT_LOG_RECORDED_ROUTING_KEY = 'audit.log.recorded';
+const UNAUDITED_EVENTS = new Set([AUDIT_LOG_RECORDED, 'AiIndexUpdated']);
+
 interface EventEnvelope {
   name: string;
   occurredAt: string;
@@ -43,10 +48,13 @@ export class AuditEventConsumer implements OnModuleInit, OnModuleDestroy {
     try {
       const raw = message.content.toString('utf-8');
       const event = JSON.parse(raw) as EventEnvelope;
+      if (UNAUDITED_EVENTS.has(event.name)) {
+        return;
+      }
       const occurredAt = this.parseDate(event.occurredAt);
       const payload = event.payload ?? {};
 
-      await this.createAuditLog.execute({
+      const log = await this.createAuditLog.execute({
         action: event.name,
         resource: this.inferResource(event.name),
         actorId: this.readActorId(payload),
@@ -54,6 +62,7 @@ export class AuditEventConsumer implements OnModuleInit, OnModuleDestroy {
         metadata: payload,
         occurredAt,
       });
+      this.publishRecorded(log);
     } catch {
       this.logger.warn('Failed to process audit event');
     } finally {
@@ -61,6 +70,31 @@ export class AuditEventConsumer implements OnModuleInit, OnModuleDestroy {
     }
   }
 
+  private publishRecorded(log: AuditLog): void {
+    if (!this.channel || !log.id) {
+      return;
+    }
+
+    const payload = {
+      name: AUDIT_LOG_RECORDED,
+      occurredAt: new Date().toISOString(),
+      payload: {
+        auditId: log.id.value,
+        action: log.action.value,
+        resource: log.resource.value,
+        actorId: log.actorId,
+        actorRole: log.actorRole,
+        occurredAt: log.occurredAt.toISOString(),
+      },
+    };
+    this.channel.publish(
+      this.config.rabbitmqExchange,
+      AUDIT_LOG_RECORDED_ROUTING_KEY,
+      Buffer.from(JSON.stringify(payload)),
+      { contentType: 'application/json' },
+    );
+  }
+
   private async connectWithRetry(): Promise<void> {
     let attempt = 0;
 
@@ -68,6 +68,44 @@ describe('TypeOrmAuditLogRepository', () => {
     expect(logs).toHaveLength(1);
   });
 
+  it('pages logs in ascending order', async () => {
+    const entity = {
+      _id: new ObjectId('507f1f77bcf86cd799439011'),
+      action: 'user.created',
+      resource: 'user',
+      occurredAt: new Date('2024-01-01T00:00:00Z'),
+    } as AuditLogEntity;
+    const { sut, repository } = buildRepo(entity);
+
+    await sut.list({ from: new Date('2024-01-01T00:00:00Z'), limit: 50, order: 'asc' });
+
+    expect(repository.find).toHaveBeenCalledWith(
+      expect.objectContaining({
+        order: { occurredAt: 'ASC', _id: 'ASC' },
+        take: 50,
+      }),
+    );
+  });
+
+  it('pages strictly after a compound occurredAt and id cursor', async () => {
+    const { sut, repository } = buildRepo();
+    const from = new Date('2024-01-01T00:00:00Z');
+    const afterId = '507f1f77bcf86cd799439011';
+
+    await sut.list({ from, afterId, limit: 50, order: 'asc' });
+
+    expect(repository.find).toHaveBeenCalledWith(
+      expect.objectContaining({
+        where: {
+          $or: [
+            { occurredAt: { $gt: from } },
+            { occurredAt: from, _id: { $gt: new ObjectId(afterId) } },
+          ],
+        },
+      }),
+    );
+  });
+
   it('saves audit log and returns domain', async () => {
     const { sut, repository } = buildRepo();
     const log = AuditLog.create({
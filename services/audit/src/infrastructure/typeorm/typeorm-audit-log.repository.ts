@@ -37,16 +37,25 @@ export class TypeOrmAuditLogRepository implements AuditLogRepository {
     if (filters.actorId) {
       where.actorId = filters.actorId;
     }
-    if (filters.from || filters.to) {
+    const afterId = filters.from && filters.afterId ? this.toObjectId(filters.afterId) : null;
+    if ((filters.from && !afterId) || filters.to) {
       where.occurredAt = {
-        ...(filters.from ? { $gte: filters.from } : {}),
+        ...(filters.from && !afterId ? { $gte: filters.from } : {}),
         ...(filters.to ? { $lte: filters.to } : {}),
       };
     }
+    if (afterId) {
+      where.$or = [
+        { occurredAt: { $gt: filters.from } },
+        { occurredAt: filters.from, _id: { $gt: afterId } },
+      ];
+    }
 
+    const direction = filters.order === 'asc' ? 'ASC' : 'DESC';
     const entities = await this.repository.find({
       where,
-      order: { occurredAt: 'DESC' },
+      order: { occurredAt: direction, _id: direction },
+      ...(filters.limit ? { take: filters.limit } : {}),
     });
 
     return entities.map((entity) => this.toDomain(entity));
@@ -28,6 +28,27 @@ describe('AuditLogController', () => {
     expect(logs[0].action).toBe('user.created');
   });
 
+  it('passes the afterId cursor through', async () => {
+    const execute = jest.fn(async () => [log]);
+    const controller = new AuditLogController(
+      { execute: async () => log } as any,
+      { execute } as any,
+    );
+
+    await controller.list({
+      from: '2024-01-01T00:00:00Z',
+      afterId: '507f1f77bcf86cd799439011',
+      order: 'asc',
+    });
+
+    expect(execute).toHaveBeenCalledWith(
+      expect.objectContaining({
+        from: new Date('2024-01-01T00:00:00Z'),
+        afterId: '507f1f77bcf86cd799439011',
+      }),
+    );
+  });
+
   it('throws on invalid date filter', async () => {
     const controller = new AuditLogController(
       { execute: async () => log } as any,
@@ -23,7 +23,10 @@ export class AuditLogController {
       resource: query.resource,
       actorId: query.actorId,
       from: this.parseDate(query.from),
+      afterId: query.afterId,
       to: this.parseDate(query.to),
+      limit: query.limit,
+      order: query.order,
     });
 
     return logs.map((log) => this.toResponse(log));
@@ -1,4 +1,14 @@
-import { IsISO8601, IsOptional, IsString } from 'class-validator';
+import { Type } from 'class-transformer';
+import {
+  IsIn,
+  IsInt,
+  IsISO8601,
+  IsMongoId,
+  IsOptional,
+  IsString,
+  Max,
+  Min,
+} from 'class-validator';
 
 export class ListAuditLogsDto {
   @IsOptional()
@@ -17,7 +27,22 @@ export class ListAuditLogsDto {
   @IsISO8601()
   from?: string;
 
+  @IsOptional()
+  @IsMongoId()
+  afterId?: string;
+
   @IsOptional()
   @IsISO8601()
   to?: string;
+
+  @IsOptional()
+  @Type(() => Number)
+  @IsInt()
+  @Min(1)
+  @Max(1000)
+  limit?: number;
+
+  @IsOptional()
+  @IsIn(['asc', 'desc'])
+  order?: 'asc' | 'desc';
 }
@@ -2,10 +2,14 @@ import { Role } from '../../domain/entities/role';
 import { RoleId } from '../../domain/value-objects/role-id';
 import { RoleName } from '../../domain/value-objects/role-name';
 
+export interface RoleListFilters {
+  updatedAfter?: Date;
+}
+
 export interface RoleRepository {
   findById(id: RoleId): Promise<Role | null>;
   findByName(name: RoleName): Promise<Role | null>;
-  list(): Promise<Role[]>;
+  list(filters?: RoleListFilters): Promise<Role[]>;
   save(role: Role): Promise<void>;
   delete(role: Role): Promise<void>;
 }
@@ -1,9 +1,9 @@
-import { RoleRepository } from '../ports/role-repository';
+import { RoleListFilters, RoleRepository } from '../ports/role-repository';
 
 export class ListRolesUseCase {
   constructor(private readonly repository: RoleRepository) {}
 
-  async execute() {
-    return this.repository.list();
+  async execute(filters: RoleListFilters = {}) {
+    return this.repository.list(filters);
   }
 }
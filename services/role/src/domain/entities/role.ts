@@ -10,6 +10,8 @@ export interface RoleProps {
   id: RoleId;
   name: RoleName;
   abilities: RoleAbilities;
+  createdAt?: Date;
+  updatedAt?: Date;
 }
 
 export class Role {
@@ -46,6 +48,14 @@ export class Role {
     return this.props.abilities;
   }
 
+  get createdAt(): Date | undefined {
+    return this.props.createdAt;
+  }
+
+  get updatedAt(): Date | undefined {
+    return this.props.updatedAt;
+  }
+
   rename(name: RoleName): void {
     this.props.name = name;
   }
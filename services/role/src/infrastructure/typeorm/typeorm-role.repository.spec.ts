@@ -1,4 +1,4 @@
-import { Repository } from 'typeorm';
+import { MoreThanOrEqual, Repository } from 'typeorm';
 import { TypeOrmRoleRepository } from './typeorm-role.repository';
 import { RoleEntity } from './role.entity';
 import { Role } from '../../domain/entities/role';
@@ -55,6 +55,32 @@ describe('TypeOrmRoleRepository', () => {
     expect(roles).toHaveLength(1);
   });
 
+  it('lists roles updated after a timestamp', async () => {
+    const updatedAt = new Date('2024-01-02T00:00:00.000Z');
+    const entities = [
+      {
+        id: 'role-1',
+        name: 'Admin',
+        canView: true,
+        canCreate: true,
+        canUpdate: true,
+        canDelete: true,
+        createdAt: new Date('2024-01-01T00:00:00.000Z'),
+        updatedAt,
+      } as RoleEntity,
+    ];
+    const { sut, repository } = buildRepo(undefined, entities);
+    const updatedAfter = new Date('2024-01-01T12:00:00.000Z');
+
+    const roles = await sut.list({ updatedAfter });
+
+    expect(repository.find).toHaveBeenCalledWith({
+      where: { updatedAt: MoreThanOrEqual(new Date('2024-01-01T12:00:00.001Z')) },
+      order: { updatedAt: 'ASC', id: 'ASC' },
+    });
+    expect(roles[0].updatedAt).toEqual(updatedAt);
+  });
+
   it('saves and deletes role', async () => {
     const { sut, repository } = buildRepo();
     const role = Role.rehydrate({
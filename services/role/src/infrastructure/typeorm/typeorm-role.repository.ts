@@ -1,7 +1,7 @@
 import { Injectable } from '@nestjs/common';
 import { InjectRepository } from '@nestjs/typeorm';
-import { Repository } from 'typeorm';
-import { RoleRepository } from '../../application/ports/role-repository';
+import { MoreThanOrEqual, Repository } from 'typeorm';
+import { RoleListFilters, RoleRepository } from '../../application/ports/role-repository';
 import { Role } from '../../domain/entities/role';
 import { RoleAbilities } from '../../domain/value-objects/role-abilities';
 import { RoleId } from '../../domain/value-objects/role-id';
@@ -25,8 +25,13 @@ export class TypeOrmRoleRepository implements RoleRepository {
     return entity ? this.toDomain(entity) : null;
   }
 
-  async list(): Promise<Role[]> {
-    const entities = await this.repository.find({ order: { name: 'ASC' } });
+  async list(filters: RoleListFilters = {}): Promise<Role[]> {
+    const entities = await this.repository.find({
+      where: filters.updatedAfter
+        ? { updatedAt: MoreThanOrEqual(this.nextMillisecond(filters.updatedAfter)) }
+        : {},
+      order: filters.updatedAfter ? { updatedAt: 'ASC', id: 'ASC' } : { name: 'ASC' },
+    });
     return entities.map((entity) => this.toDomain(entity));
   }
 
@@ -46,6 +51,10 @@ export class TypeOrmRoleRepository implements RoleRepository {
     await this.repository.delete({ id: role.id.value });
   }
 
+  private nextMillisecond(date: Date): Date {
+    return new Date(date.getTime() + 1);
+  }
+
   private toDomain(entity: RoleEntity): Role {
     return Role.rehydrate({
       id: RoleId.create(entity.id),
@@ -56,6 +65,8 @@ export class TypeOrmRoleRepository implements RoleRepository {
         canUpdate: entity.canUpdate,
         canDelete: entity.canDelete,
       }),
+      createdAt: entity.createdAt,
+      updatedAt: entity.updatedAt,
     });
   }
 }
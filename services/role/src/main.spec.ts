@@ -1,6 +1,7 @@
 describe('main bootstrap', () => {
   it('creates nest app and listens', async () => {
     const useLogger = jest.fn();
+    const use = jest.fn();
     const useGlobalPipes = jest.fn();
     const useGlobalFilters = jest.fn();
     const listen = jest.fn().mockResolvedValue(undefined);
@@ -9,6 +10,7 @@ describe('main bootstrap', () => {
     const core = require('@nestjs/core');
     jest.spyOn(core.NestFactory, 'create').mockResolvedValue({
       useLogger,
+      use,
       useGlobalPipes,
       useGlobalFilters,
       listen,
@@ -18,6 +20,7 @@ describe('main bootstrap', () => {
     await new Promise((resolve) => setImmediate(resolve));
 
     expect(core.NestFactory.create).toHaveBeenCalled();
+    expect(use).toHaveBeenCalled();
     expect(useGlobalPipes).toHaveBeenCalled();
     expect(useGlobalFilters).toHaveBeenCalled();
     expect(listen).toHaveBeenCalled();
@@ -3,12 +3,14 @@ import { NestFactory } from '@nestjs/core';
 import { AppModule } from './app.module';
 import { JsonLogger } from './infrastructure/logging/json-logger';
 import { ApplicationErrorFilter } from './presentation/http/filters/application-error.filter';
+import { compressResponses } from './presentation/http/middleware/compression.middleware';
 
 async function bootstrap() {
   const logger = new JsonLogger();
   Logger.overrideLogger(logger);
   const app = await NestFactory.create(AppModule, { logger });
   app.useLogger(logger);
+  app.use(compressResponses());
   app.useGlobalPipes(
     new ValidationPipe({
       whitelist: true,
@@ -7,4 +7,6 @@ export interface RoleResponseDto {
     canUpdate: boolean;
     canDelete: boolean;
   };
+  createdAt?: string;
+  updatedAt?: string;
 }
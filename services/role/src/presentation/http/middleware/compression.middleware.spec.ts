@@ -0,0 +1,69 @@
+import { brotliDecompressSync, gunzipSync } from 'node:zlib';
+import {
+  compressResponses,
+  negotiateEncoding,
+} from './compression.middleware';
+
+async function run(acceptEncoding: string | undefined, body: unknown) {
+  const headers: Record<string, string> = {
+    'Content-Type': 'application/json',
+  };
+  let sent = () => {};
+  const done = new Promise<void>((resolve) => {
+    sent = resolve;
+  });
+  const send = jest.fn(() => sent());
+  const vary = jest.fn();
+  const response = {
+    send,
+    vary,
+    getHeader: (name: string) => headers[name],
+    setHeader: (name: string, value: string) => {
+      headers[name] = value;
+    },
+  };
+  const next = jest.fn();
+  compressResponses(16)(
+    { headers: { 'accept-encoding': acceptEncoding } } as never,
+    response as never,
+    next,
+  );
+  const returned = (response.send as (body: unknown) => unknown)(body);
+  await done;
+  return { headers, send, vary, next, returned, response };
+}
+
+describe('compressResponses', () => {
+  const body = JSON.stringify([{ id: '1', name: 'a'.repeat(64) }]);
+
+  it('prefers brotli when accepted', async () => {
+    const { headers, send, vary, next, returned, response } = await run(
+      'gzip, br',
+      body,
+    );
+    expect(returned).toBe(response);
+    expect(next).toHaveBeenCalled();
+    expect(vary).toHaveBeenCalledWith('Accept-Encoding');
+    expect(headers['Content-Encoding']).toBe('br');
+    expect(brotliDecompressSync(send.mock.calls[0][0]).toString()).toBe(body);
+  });
+
+  it('falls back to gzip', async () => {
+    const { headers, send } = await run('gzip, br;q=0', body);
+    expect(headers['Content-Encoding']).toBe('gzip');
+    expect(gunzipSync(send.mock.calls[0][0]).toString()).toBe(body);
+  });
+
+  it('leaves small or unaccepted bodies untouched', async () => {
+    expect((await run('gzip', '[]')).send).toHaveBeenCalledWith('[]');
+    const { headers, send } = await run(undefined, body);
+    expect(headers['Content-Encoding']).toBeUndefined();
+    expect(send).toHaveBeenCalledWith(body);
+  });
+
+  it('negotiates accepted encodings', () => {
+    expect(negotiateEncoding('identity')).toBeNull();
+    expect(negotiateEncoding('*')).toBe('gzip');
+    expect(negotiateEncoding('BR;q=0.5')).toBe('br');
+  });
+});
@@ -30,6 +30,26 @@ describe('RoleController', () => {
     expect(result).toHaveLength(1);
   });
 
+  it('filters roles by updatedAfter', async () => {
+    const listRoles = { execute: jest.fn(async () => [role]) };
+    const controller = new RoleController(
+      { execute: async () => role } as any,
+      { execute: async () => role } as any,
+      { execute: async () => undefined } as any,
+      { execute: async () => role } as any,
+      listRoles as any,
+      { execute: async () => true } as any,
+    );
+
+    await controller.list({ updatedAfter: '2024-01-01T00:00:00.000Z' });
+    expect(listRoles.execute).toHaveBeenCalledWith({
+      updatedAfter: new Date('2024-01-01T00:00:00.000Z'),
+    });
+    await expect(controller.list({ updatedAfter: 'not-a-date' })).rejects.toThrow(
+      'Invalid date format',
+    );
+  });
+
   it('gets role by id', async () => {
     const controller = new RoleController(
       { execute: async () => role } as any,
@@ -11,6 +11,7 @@ import {
   UseGuards,
 } from '@nestjs/common';
 import type { Request } from 'express';
+import { ApplicationError } from '../../application/errors/application-error';
 import { CheckRoleExistsUseCase } from '../../application/use-cases/check-role-exists.use-case';
 import { CreateRoleUseCase } from '../../application/use-cases/create-role.use-case';
 import { DeleteRoleUseCase } from '../../application/use-cases/delete-role.use-case';
@@ -19,6 +20,7 @@ import { ListRolesUseCase } from '../../application/use-cases/list-roles.use-cas
 import { UpdateRoleUseCase } from '../../application/use-cases/update-role.use-case';
 import { Role } from '../../domain/entities/role';
 import { CreateRoleDto } from './dto/create-role.dto';
+import { ListRolesDto } from './dto/list-roles.dto';
 import { RoleResponseDto } from './dto/role-response.dto';
 import { UpdateRoleDto } from './dto/update-role.dto';
 import { AuthGuard } from './guards/auth.guard';
@@ -37,8 +39,10 @@ export class RoleController {
   ) {}
 
   @Get()
-  async list(): Promise<RoleResponseDto[]> {
-    const roles = await this.listRoles.execute();
+  async list(@Query() query: ListRolesDto = {}): Promise<RoleResponseDto[]> {
+    const roles = await this.listRoles.execute({
+      updatedAfter: this.parseDate(query.updatedAfter),
+    });
     return roles.map((role) => this.toResponse(role));
   }
 
@@ -103,6 +107,21 @@ export class RoleController {
         canUpdate: role.abilities.canUpdate,
         canDelete: role.abilities.canDelete,
       },
+      createdAt: role.createdAt?.toISOString(),
+      updatedAt: role.updatedAt?.toISOString(),
     };
   }
+
+  private parseDate(value?: string): Date | undefined {
+    if (!value) {
+      return undefined;
+    }
+
+    const date = new Date(value);
+    if (Number.isNaN(date.getTime())) {
+      throw new ApplicationError('Invalid date format', 400);
+    }
+
+    return date;
+  }
 }
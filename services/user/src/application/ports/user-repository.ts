@@ -2,10 +2,14 @@ import { User } from '../../domain/entities/user';
 import { Email } from '../../domain/value-objects/email';
 import { UserId } from '../../domain/value-objects/user-id';
 
+export interface UserListFilters {
+  updatedAfter?: Date;
+}
+
 export interface UserRepository {
   findById(id: UserId): Promise<User | null>;
   findByEmail(email: Email): Promise<User | null>;
-  list(): Promise<User[]>;
+  list(filters?: UserListFilters): Promise<User[]>;
   save(user: User): Promise<void>;
   delete(user: User): Promise<void>;
 }
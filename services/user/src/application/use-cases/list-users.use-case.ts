@@ -1,9 +1,9 @@
-import { UserRepository } from '../ports/user-repository';
+import { UserListFilters, UserRepository } from '../ports/user-repository';
 
 export class ListUsersUseCase {
   constructor(private readonly repository: UserRepository) {}
 
-  async execute() {
-    return this.repository.list();
+  async execute(filters: UserListFilters = {}) {
+    return this.repository.list(filters);
   }
 }
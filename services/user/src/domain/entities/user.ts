@@ -14,6 +14,8 @@ export interface UserProps {
   email: Email;
   passwordHash: PasswordHash;
   roleId: RoleId;
+  createdAt?: Date;
+  updatedAt?: Date;
 }
 
 export class User {
@@ -54,6 +56,14 @@ export class User {
     return this.props.roleId;
   }
 
+  get createdAt(): Date | undefined {
+    return this.props.createdAt;
+  }
+
+  get updatedAt(): Date | undefined {
+    return this.props.updatedAt;
+  }
+
   rename(name: UserName): void {
     this.props.name = name;
   }
@@ -1,4 +1,4 @@
-import { Repository } from 'typeorm';
+import { MoreThanOrEqual, Repository } from 'typeorm';
 import { TypeOrmUserRepository } from './typeorm-user.repository';
 import { UserEntity } from './user.entity';
 import { Email } from '../../domain/value-objects/email';
@@ -50,6 +50,31 @@ describe('TypeOrmUserRepository', () => {
     expect(users).toHaveLength(1);
   });
 
+  it('lists users updated after a timestamp', async () => {
+    const updatedAt = new Date('2024-01-02T00:00:00.000Z');
+    const entities = [
+      {
+        id: 'user-1',
+        name: 'Toka User',
+        email: 'user@toka.local',
+        passwordHash: 'hash',
+        roleId: 'role-1',
+        createdAt: new Date('2024-01-01T00:00:00.000Z'),
+        updatedAt,
+      } as UserEntity,
+    ];
+    const { sut, repository } = buildRepo(entities);
+    const updatedAfter = new Date('2024-01-01T12:00:00.000Z');
+
+    const users = await sut.list({ updatedAfter });
+
+    expect(repository.find).toHaveBeenCalledWith({
+      where: { updatedAt: MoreThanOrEqual(new Date('2024-01-01T12:00:00.001Z')) },
+      order: { updatedAt: 'ASC', id: 'ASC' },
+    });
+    expect(users[0].updatedAt).toEqual(updatedAt);
+  });
+
   it('saves and deletes users', async () => {
     const { sut, repository } = buildRepo();
     const user = User.create({
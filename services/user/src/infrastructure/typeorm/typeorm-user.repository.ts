@@ -1,7 +1,7 @@
 import { Injectable } from '@nestjs/common';
 import { InjectRepository } from '@nestjs/typeorm';
-import { Repository } from 'typeorm';
-import { UserRepository } from '../../application/ports/user-repository';
+import { MoreThanOrEqual, Repository } from 'typeorm';
+import { UserListFilters, UserRepository } from '../../application/ports/user-repository';
 import { User } from '../../domain/entities/user';
 import { Email } from '../../domain/value-objects/email';
 import { PasswordHash } from '../../domain/value-objects/password-hash';
@@ -27,8 +27,13 @@ export class TypeOrmUserRepository implements UserRepository {
     return entity ? this.toDomain(entity) : null;
   }
 
-  async list(): Promise<User[]> {
-    const entities = await this.repository.find({ order: { email: 'ASC' } });
+  async list(filters: UserListFilters = {}): Promise<User[]> {
+    const entities = await this.repository.find({
+      where: filters.updatedAfter
+        ? { updatedAt: MoreThanOrEqual(this.nextMillisecond(filters.updatedAfter)) }
+        : {},
+      order: filters.updatedAfter ? { updatedAt: 'ASC', id: 'ASC' } : { email: 'ASC' },
+    });
     return entities.map((entity) => this.toDomain(entity));
   }
 
@@ -47,6 +52,10 @@ export class TypeOrmUserRepository implements UserRepository {
     await this.repository.delete({ id: user.id.value });
   }
 
+  private nextMillisecond(date: Date): Date {
+    return new Date(date.getTime() + 1);
+  }
+
   private toDomain(entity: UserEntity): User {
     return User.rehydrate({
       id: UserId.create(entity.id),
@@ -54,6 +63,8 @@ export class TypeOrmUserRepository implements UserRepository {
       email: Email.create(entity.email),
       passwordHash: PasswordHash.create(entity.passwordHash),
       roleId: RoleId.create(entity.roleId),
+      createdAt: entity.createdAt,
+      updatedAt: entity.updatedAt,
     });
   }
 }
@@ -0,0 +1,7 @@
+import { IsISO8601, IsOptional } from 'class-validator';
+
+export class ListUsersDto {
+  @IsOptional()
+  @IsISO8601()
+  updatedAfter?: string;
+}
@@ -3,4 +3,6 @@ export interface UserResponseDto {
   name: string;
   email: string;
   roleId: string;
+  createdAt?: string;
+  updatedAt?: string;
 }
@@ -0,0 +1,68 @@
+import type { NextFunction, Request, RequestHandler, Response } from 'express';
+import { promisify } from 'node:util';
+import { brotliCompress, constants, gzip } from 'node:zlib';
+
+const MIN_COMPRESSIBLE_BYTES = 1024;
+const brotliCompressAsync = promisify(brotliCompress);
+const gzipAsync = promisify(gzip);
+
+type Encoding = 'br' | 'gzip';
+
+export function negotiateEncoding(header?: string): Encoding | null {
+  const accepted = new Set(
+    (header ?? '')
+      .split(',')
+      .map((part) => part.trim().toLowerCase())
+      .filter((part) => part && !/;\s*q=0(\.0*)?$/.test(part))
+      .map((part) => part.split(';')[0].trim()),
+  );
+  if (accepted.has('br')) {
+    return 'br';
+  }
+  if (accepted.has('gzip') || accepted.has('*')) {
+    return 'gzip';
+  }
+  return null;
+}
+
+function compress(body: string, encoding: Encoding): Promise<Buffer> {
+  return encoding === 'br'
+    ? brotliCompressAsync(body, {
+        params: { [constants.BROTLI_PARAM_QUALITY]: 4 },
+      })
+    : gzipAsync(body);
+}
+
+export function compressResponses(
+  minBytes = MIN_COMPRESSIBLE_BYTES,
+): RequestHandler {
+  return (request: Request, response: Response, next: NextFunction) => {
+    const send = response.send.bind(response) as Response['send'];
+    response.send = (body?: unknown) => {
+      if (
+        typeof body !== 'string' ||
+        !response.getHeader('Content-Type') ||
+        response.getHeader('Content-Encoding') ||
+        Buffer.byteLength(body) < minBytes
+      ) {
+        return send(body);
+      }
+
+      response.vary('Accept-Encoding');
+      const encoding = negotiateEncoding(request.headers['accept-encoding']);
+      if (!encoding) {
+        return send(body);
+      }
+
+      compress(body, encoding).then(
+        (compressed) => {
+          response.setHeader('Content-Encoding', encoding);
+          send(compressed);
+        },
+        () => send(body),
+      );
+      return response;
+    };
+    next();
+  };
+}
@@ -28,6 +28,25 @@ describe('UserController', () => {
     expect(result).toHaveLength(1);
   });
 
+  it('filters users by updatedAfter', async () => {
+    const listUsers = { execute: jest.fn(async () => [user]) };
+    const controller = new UserController(
+      { execute: async () => user } as any,
+      { execute: async () => user } as any,
+      { execute: async () => undefined } as any,
+      { execute: async () => user } as any,
+      listUsers as any,
+    );
+
+    await controller.list({ updatedAfter: '2024-01-01T00:00:00.000Z' });
+    expect(listUsers.execute).toHaveBeenCalledWith({
+      updatedAfter: new Date('2024-01-01T00:00:00.000Z'),
+    });
+    await expect(controller.list({ updatedAfter: 'not-a-date' })).rejects.toThrow(
+      'Invalid date format',
+    );
+  });
+
   it('creates and updates user', async () => {
     const controller = new UserController(
       { execute: async () => user } as any,
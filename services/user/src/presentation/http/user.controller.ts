@@ -7,10 +7,12 @@ import {
   Param,
   Patch,
   Post,
+  Query,
   Req,
   UseGuards,
 } from '@nestjs/common';
 import type { Request } from 'express';
+import { ApplicationError } from '../../application/errors/application-error';
 import { CreateUserUseCase } from '../../application/use-cases/create-user.use-case';
 import { DeleteUserUseCase } from '../../application/use-cases/delete-user.use-case';
 import { GetUserUseCase } from '../../application/use-cases/get-user.use-case';
@@ -18,6 +20,7 @@ import { ListUsersUseCase } from '../../application/use-cases/list-users.use-cas
 import { UpdateUserUseCase } from '../../application/use-cases/update-user.use-case';
 import { User } from '../../domain/entities/user';
 import { CreateUserDto } from './dto/create-user.dto';
+import { ListUsersDto } from './dto/list-users.dto';
 import { UpdateUserDto } from './dto/update-user.dto';
 import { UserResponseDto } from './dto/user-response.dto';
 import { AuthGuard } from './guards/auth.guard';
@@ -35,8 +38,10 @@ export class UserController {
   ) {}
 
   @Get()
-  async list(): Promise<UserResponseDto[]> {
-    const users = await this.listUsers.execute();
+  async list(@Query() query: ListUsersDto = {}): Promise<UserResponseDto[]> {
+    const users = await this.listUsers.execute({
+      updatedAfter: this.parseDate(query.updatedAfter),
+    });
     return users.map((user) => this.toResponse(user));
   }
 
@@ -92,6 +97,21 @@ export class UserController {
       name: user.name.value,
       email: user.email.value,
       roleId: user.roleId.value,
+      createdAt: user.createdAt?.toISOString(),
+      updatedAt: user.updatedAt?.toISOString(),
     };
   }
+
+  private parseDate(value?: string): Date | undefined {
+    if (!value) {
+      return undefined;
+    }
+
+    const date = new Date(value);
+    if (Number.isNaN(date.getTime())) {
+      throw new ApplicationError('Invalid date format', 400);
+    }
+
+    return date;
+  }
 }